@@ -60,8 +60,17 @@ hidden_imports_list = [
     'gui',
     'file_io',
     'config',
+    'engine_config',
     'ai_opponent',
     'game_state',
+    'search_position',
+    'transposition_table',
+    'move_ordering',
+    'evaluation',
+    'parallel_search',
+    'opening_book',
+    'endgame_tablebase',
+    'ai_search',
     'animations',
     'chess_utils',
     'event_handler',
@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
 """
 Modul für die Schach-KI (Gegner).
-Enthält Bewertungsfunktionen, Suchalgorithmen (Minimax mit Alpha-Beta)
+Enthält Bewertungsfunktionen, Suchalgorithmen (Negamax mit Alpha-Beta und PVS)
 und die Logik zur Nutzung von Eröffnungsbüchern und Endspieldatenbanken.
 """
 
 import logger, logging
 import sys # Für kritische Fehler
-from game_state import GameState
+from transposition_table import TranspositionTable, TT_EXACT, TT_LOWER, TT_UPPER
+from move_ordering import MoveOrderer, mvv_lva_score
+from search_position import SearchPosition
+import opening_book
+import endgame_tablebase
 import random, chess, chess.polyglot, chess.syzygy
-import config
-from typing import Optional, List, Union
+import time # Für das Zeitbudget der iterativen Vertiefung
+import threading # Für das Pondering
+import engine_config
+from typing import Optional, List, Tuple, Dict, Any
 import queue # Für die Kommunikation mit dem Hauptthread
 
 # --- Logger Konfiguration ---
@@ -26,29 +32,250 @@ log = logger.setup_logger(
 )
 log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
 
-# --- Bewertungsfunktionen (unverändert) ---
+# --- Zeitsteuerung der Suche ---
+# Zeitpunkt (time.monotonic), ab dem die laufende Suche abgebrochen wird. None = kein Limit.
+_search_deadline: Optional[float] = None
+# Anzahl der seit Suchbeginn besuchten Knoten
+_nodes_searched: int = 0
+# Die Uhr wird nur alle N Knoten abgefragt, um den Overhead gering zu halten (Zweierpotenz - 1)
+_TIME_CHECK_MASK = 1023
+# Abbruchsignal der aktiven Suche (threading.Event oder multiprocessing.Event); gesetzt = Suche abbrechen
+_stop_event = None
+
+class SearchTimeout(Exception):
+    """Wird ausgelöst, wenn das Zeitbudget der laufenden Suche aufgebraucht ist oder die Suche abgebrochen wurde."""
+    pass
+
+def set_stop_event(event):
+    """Setzt das Abbruchsignal, das die Suche regelmäßig abfragt (None = kein externer Abbruch)."""
+    global _stop_event
+    _stop_event = event
+
+class SearchControl:
+    """
+    Steuersignale genau einer Suche. Gehört dem Aufrufer (z.B. ai_search.AISearch) und wird an
+    find_best_move() übergeben; Signale an eine alte, noch auslaufende Suche erreichen so nie die neue.
+
+    Attributes:
+        stop_event (threading.Event): Gesetzt = Suche beenden und den besten bisher gefundenen Zug liefern.
+        pondering (bool): Suche während der Bedenkzeit des Gegners; ohne Zeitlimit bis ponder_hit().
+        pending_result (Tuple | None): (Stellung, Hauptvariante, Bewertung) der Ponder-Suche. Erst
+            ponder_hit() veröffentlicht es, damit die GUI während der Bedenkzeit des Spielers nicht die
+            hypothetische Variante anzeigt; eine abgebrochene Ponder-Suche verwirft es mit ihrem Objekt.
+    """
+    def __init__(self, ponder: bool = False):
+        self.stop_event = threading.Event()
+        self.pondering = ponder
+        self.pending_result: Optional[Tuple[chess.Board, List[chess.Move], Optional[int]]] = None
+
+    def stop(self):
+        """Fordert das Ende der Suche an ("Sofort ziehen" oder Abbruch)."""
+        self.stop_event.set()
+
+    def is_stopped(self) -> bool:
+        """Gibt zurück, ob das Ende der Suche angefordert wurde."""
+        return self.stop_event.is_set()
+
+    def ponder_hit(self):
+        """
+        Der Gegner hat den vorhergesagten Zug gespielt: Die Ponder-Suche wird zur normalen Suche.
+        TT und History sind bereits "warm"; ist das Budget durch die Ponder-Zeit schon aufgebraucht,
+        endet die Suche sofort mit dem Zug der letzten abgeschlossenen Tiefe. Wartet die Suche noch auf
+        das Ende ihrer Vorgängerin, startet sie anschließend direkt als normale Suche.
+        """
+        global _search_deadline
+        with _ponder_lock:
+            # Auch nach bereits beendeter Ponder-Suche: Deren Variante gilt jetzt für die echte Stellung
+            if self.pending_result is not None:
+                _store_search_result(*self.pending_result)
+                self.pending_result = None
+            if not self.pondering:
+                return
+            self.pondering = False
+            active = self is _active_control
+            if active and _search_depth > 1:
+                _search_deadline = _budget_start + _budget_s
+        if active:
+            log.info("Ponder hit after %.0f ms (Budget: %.0f ms, Depth in progress: %d).",
+                     (time.monotonic() - _budget_start) * 1000, _budget_s * 1000, _search_depth)
+        else:
+            log.info("Ponder hit before the ponder search started; it will run as a normal search.")
+
+# Steuersignale der gerade laufenden Suche (None = keine Suche aktiv)
+_active_control: Optional[SearchControl] = None
+
+# --- Eine Suche pro Prozess ---
+# TT, Zugsortierung, Knotenzähler, Zeitsteuerung und Fortschritt sind modulweit. Eine neue Suche wartet
+# daher, bis die vorherige ihren Thread wirklich verlassen hat. Bis dahin bleibt deren Abbruchsignal
+# aktiv (sie bleibt abbrechbar); die wartende Suche prüft derweil ihr eigenes Signal.
+_search_lock = threading.Lock()
+_SEARCH_LOCK_POLL_S = 0.05
+_SEARCH_LOCK_WARN_S = 1.0
+
+def _acquire_search_lock(control: SearchControl) -> bool:
+    """Wartet, bis keine andere Suche mehr läuft. False, wenn die eigene Suche währenddessen beendet wurde."""
+    wait_start = time.monotonic()
+    warned = False
+    while not _search_lock.acquire(timeout=_SEARCH_LOCK_POLL_S):
+        if control.is_stopped():
+            log.info("Search stopped while waiting for the previous search to finish.")
+            return False
+        if not warned and time.monotonic() - wait_start >= _SEARCH_LOCK_WARN_S:
+            log.warning("Waiting for the previous AI search to finish (%.1f s).", time.monotonic() - wait_start)
+            warned = True
+    return True
+
+# --- Pondering (Suche während der Bedenkzeit des Gegners) ---
+# Solange die aktive Suche pondert (SearchControl.pondering), läuft die iterative Vertiefung ohne
+# Zeitlimit. SearchControl.ponder_hit() wandelt sie in eine normale Suche um; die bereits verbrauchte
+# Ponder-Zeit zählt zum Budget.
+_budget_start: float = 0.0   # Zeitpunkt, ab dem das Zeitbudget der laufenden Suche zählt
+_budget_s: float = 0.0       # Zeitbudget der laufenden Suche in Sekunden
+_search_depth: int = 0       # Aktuell durchsuchte Tiefe der iterativen Vertiefung
+_ponder_lock = threading.Lock()
+
+def _is_pondering() -> bool:
+    """Gibt zurück, ob die aktive Suche (noch) auf die Antwort des Gegners wartet."""
+    control = _active_control
+    return control is not None and control.pondering
+
+def is_stop_requested() -> bool:
+    """Gibt zurück, ob für die laufende Suche ein Abbruch (oder "Sofort ziehen") angefordert wurde."""
+    return _stop_event is not None and _stop_event.is_set()
+
+# --- Fortschrittsmeldungen der laufenden Suche (für AISearch / Statuszeile) ---
+_progress_queue: Optional[queue.Queue] = None
+_progress_info: Dict[str, Any] = {}  # Laufende Tiefe sowie Bewertung/Variante der letzten abgeschlossenen Tiefe
+_search_start_time: float = 0.0
+_last_progress_time: float = 0.0
+
+def _post_progress(force: bool = False):
+    """Legt eine Fortschrittsmeldung in die Queue (höchstens alle engine_config.AI_PROGRESS_INTERVAL_MS, außer force)."""
+    global _last_progress_time
+    if _progress_queue is None:
+        return
+    now = time.monotonic()
+    if not force and (now - _last_progress_time) * 1000 < engine_config.AI_PROGRESS_INTERVAL_MS:
+        return
+    _last_progress_time = now
+    elapsed = now - _search_start_time
+    progress = dict(_progress_info)
+    progress.setdefault('nodes', _nodes_searched)
+    progress['elapsed_ms'] = int(elapsed * 1000)
+    progress['nps'] = int(progress['nodes'] / elapsed) if elapsed > 0 else 0
+    _progress_queue.put(progress)
+
+def start_progress_tracking():
+    """Setzt Startzeit und Fortschrittsinformation für eine neue Suche zurück."""
+    global _search_start_time
+    _search_start_time = time.monotonic()
+    _progress_info.clear()
+
+def report_progress(**fields):
+    """
+    Aktualisiert die Fortschrittsinformation (z.B. depth, score, pv, nodes) und meldet sie sofort.
+    Wird nach jeder abgeschlossenen Tiefe aufgerufen (auch von der parallelen Suche), dann mit
+    completed_depth und der Hauptvariante als UCI-Züge (pv_moves).
+    """
+    _progress_info.update(fields)
+    _post_progress(force=True)
+
+def _count_node():
+    """Zählt einen Suchknoten und bricht die Suche ab, wenn das Zeitbudget überschritten oder ein Abbruch angefordert ist."""
+    global _nodes_searched
+    _nodes_searched += 1
+    if (_nodes_searched & _TIME_CHECK_MASK) == 0:
+        if _search_deadline is not None and time.monotonic() >= _search_deadline:
+            raise SearchTimeout()
+        if _stop_event is not None and _stop_event.is_set():
+            raise SearchTimeout()
+        if _progress_queue is not None:
+            _post_progress()
+
+# --- Transpositionstabelle ---
+# Wird beim ersten Gebrauch angelegt und bleibt zwischen den Zügen einer Partie erhalten
+_transposition_table: Optional[TranspositionTable] = None
+
+def get_transposition_table() -> Optional[TranspositionTable]:
+    """Gibt die Transpositionstabelle der KI zurück (legt sie bei Bedarf an) oder None, wenn deaktiviert."""
+    global _transposition_table
+    if not engine_config.TT_ENABLED:
+        return None
+    if _transposition_table is None:
+        _transposition_table = TranspositionTable(engine_config.TT_SIZE_MB, engine_config.TT_REPLACEMENT_POLICY)
+    return _transposition_table
+
+def reset_transposition_table():
+    """Leert die Transpositionstabelle, z.B. beim Start einer neuen Partie (auch in den Arbeitsprozessen)."""
+    if _transposition_table is not None:
+        _transposition_table.clear()
+    _move_orderer.clear()
+    import parallel_search # Lokal importiert: parallel_search importiert seinerseits ai_opponent
+    parallel_search.clear_worker_tables()
+
+def resize_transposition_table(size_mb: float):
+    """Ändert die Größe der Transpositionstabelle; sie wird beim nächsten Zugriff leer neu angelegt."""
+    global _transposition_table
+    engine_config.TT_SIZE_MB = size_mb
+    _transposition_table = None
+
+def swap_search_state(state: Optional[Tuple[Optional[TranspositionTable], MoveOrderer]] = None
+                      ) -> Tuple[Optional[TranspositionTable], MoveOrderer]:
+    """
+    Tauscht Transpositionstabelle und Zugsortierung gegen einen anderen Satz aus, damit mehrere Engines
+    in einem Prozess abwechselnd suchen können (siehe tournament.py).
 
-def score_material(board: chess.Board) -> int:
-    """Bewertet das Brett basierend auf dem Materialwert der Figuren."""
-    score = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            score += config.PIECE_VALUES.get(piece.piece_type, 0) * (1 if piece.color == chess.WHITE else -1)
-    return score
+    Args:
+        state: Zuvor zurückgegebener Zustand; None = leere Tabellen (TT wird mit engine_config.TT_SIZE_MB angelegt).
 
-def evaluate_board(board: chess.Board) -> int:
-    """Bewertet die aktuelle Brettstellung umfassender."""
-    try:
-        if board.is_checkmate():
-            return -config.CHECKMATE if board.turn == chess.WHITE else config.CHECKMATE
-        elif board.is_stalemate() or \
-             board.is_insufficient_material() or \
-             board.is_seventyfive_moves():
-            return config.STALEMATE
-    except Exception as e:
-        log.warning("Exception during game over check in evaluate_board: %s (FEN: %s)", e, board.fen(), exc_info=True)
-    return score_material(board)
+    Returns:
+        Der bisherige Zustand (Transpositionstabelle, Zugsortierung).
+    """
+    global _transposition_table, _move_orderer
+    previous = (_transposition_table, _move_orderer)
+    _transposition_table, _move_orderer = state if state is not None else (None, MoveOrderer())
+    return previous
+
+def start_new_search():
+    """Bereitet TT (neue Generation) und Zugsortierung auf eine neue Suche vor."""
+    tt = get_transposition_table()
+    if tt is not None: tt.new_search()
+    _move_orderer.new_search()
+    if engine_config.SYZYGY_PROBE_IN_SEARCH:
+        endgame_tablebase.open_tablebase() # Nur beim ersten Aufruf teuer; setzt endgame_tablebase.probe_limit
+
+def get_nodes_searched() -> int:
+    """Gibt die Anzahl der seit Beginn der (iterativen) Suche besuchten Knoten zurück."""
+    return _nodes_searched
+
+# --- Zugsortierung (Killerzüge und History bleiben wie die TT zwischen den Zügen erhalten) ---
+_move_orderer = MoveOrderer()
+
+# --- Spielende-Erkennung (Matt, Patt, Remis) für die Suche ---
+
+def has_legal_move(board: chess.Board) -> bool:
+    """
+    Prüft, ob die Seite am Zug mindestens einen legalen Zug hat.
+    Die Zuggenerierung bricht beim ersten gefundenen Zug ab (statt alle Züge zu erzeugen).
+    """
+    return any(board.generate_legal_moves())
+
+def is_draw_by_rule(board: chess.Board) -> bool:
+    """
+    Remis ohne Claim (ungenügendes Material, 75-Züge-Regel, fünffache Wiederholung).
+    Die teuren Prüfungen von python-chess laufen nur, wenn billige Zähler sie überhaupt zulassen:
+    - Ungenügendes Material ist nur ohne Bauern, Türme und Damen möglich (Bitboard-Test).
+    - Die 75-Züge-Regel hängt allein an board.halfmove_clock (Matt hat Vorrang).
+    - Eine fünffache Wiederholung braucht mindestens 16 umkehrbare Halbzüge seit dem letzten Schlag-/Bauernzug.
+    """
+    halfmove_clock = board.halfmove_clock
+    if halfmove_clock >= 150 and not board.is_checkmate():
+        return True
+    if not (board.pawns | board.rooks | board.queens) and board.is_insufficient_material():
+        return True
+    if halfmove_clock >= 16 and board.is_fivefold_repetition():
+        return True
+    return False
 
 # --- Zugfindungsalgorithmen (unverändert) ---
 
@@ -67,259 +294,628 @@ def find_random_move(valid_moves: List[chess.Move]) -> Optional[chess.Move]:
         return None
 
 
-def minimax(gs: 'GameState', depth: int, alpha: float, beta: float, maximizing_player: bool) -> Union[int, float]:
-    """Implementiert den Minimax-Algorithmus mit Alpha-Beta-Pruning."""
-    if depth == 0 or gs.is_game_over_for_ai():
-        return evaluate_board(gs.board)
+# --- Mattwerte ---
+# Mattbewertungen werden um den Abstand zur Wurzel (ply) verringert, damit kürzere Matts
+# bevorzugt werden. Werte jenseits dieser Schwelle gelten als "Matt in N".
+MAX_SEARCH_PLY = 128
+MATE_THRESHOLD = engine_config.CHECKMATE - MAX_SEARCH_PLY
+INFINITY_SCORE = engine_config.CHECKMATE + 1
+# Gewinne laut Endspieldatenbank liegen knapp unterhalb der Mattwerte (Matt in N ist noch besser)
+TB_WIN_SCORE = MATE_THRESHOLD - MAX_SEARCH_PLY
 
-    try:
-        valid_moves = list(gs.get_valid_moves())
-        if not valid_moves: return evaluate_board(gs.board)
-    except Exception as e:
-        log.error("Exception getting valid moves in minimax: %s (Depth: %d, FEN: %s)", e, depth, gs.board.fen(), exc_info=True)
-        return config.STALEMATE
+# --- Ergebnis der letzten Suche (für GUI/TTS) ---
+_last_principal_variation: List[chess.Move] = []
+_last_search_board: Optional[chess.Board] = None # Stellung, von der die Hauptvariante ausgeht
+_last_search_score: Optional[int] = None          # Aus Sicht der Seite am Zug in _last_search_board
 
-    random.shuffle(valid_moves)
 
-    if maximizing_player: # Weiß
-        max_eval = -config.CHECKMATE - 1
-        for move in valid_moves:
-            move_made = False
-            eval_score = -config.CHECKMATE -1
-            try:
-                if gs.make_move(move): # Wichtig: make_move modifiziert gs!
-                    move_made = True
-                    eval_score = minimax(gs, depth - 1, alpha, beta, False)
-                else:
-                    log.warning("Minimax (max): make_move(%s) returned False. FEN: %s", move.uci(), gs.board.fen())
-                    eval_score = -config.CHECKMATE - 1
-            except Exception as e:
-                log.error("Exception during make_move in minimax (max): %s (Move: %s, FEN: %s)", e, move.uci(), gs.board.fen(), exc_info=True)
-                eval_score = -config.CHECKMATE - 1
-            finally:
-                if move_made:
-                    try:
-                        gs.undo_move() # Macht die Änderung an gs rückgängig
-                    except Exception as e:
-                        log.critical("CRITICAL Exception during undo_move in minimax (max): %s. Aborting branch.", e, exc_info=True)
-                        return config.STALEMATE
-            max_eval = max(max_eval, eval_score)
-            alpha = max(alpha, eval_score)
-            if beta <= alpha: break
-        return max_eval
-    else: # Schwarz
-        min_eval = config.CHECKMATE + 1
-        for move in valid_moves:
-            move_made = False
-            eval_score = config.CHECKMATE + 1
-            try:
-                if gs.make_move(move): # Wichtig: make_move modifiziert gs!
-                    move_made = True
-                    eval_score = minimax(gs, depth - 1, alpha, beta, True)
-                else:
-                    log.warning("Minimax (min): make_move(%s) returned False. FEN: %s", move.uci(), gs.board.fen())
-                    eval_score = config.CHECKMATE + 1
-            except Exception as e:
-                log.error("Exception during make_move in minimax (min): %s (Move: %s, FEN: %s)", e, move.uci(), gs.board.fen(), exc_info=True)
-                eval_score = config.CHECKMATE + 1
-            finally:
-                if move_made:
-                    try:
-                        gs.undo_move() # Macht die Änderung an gs rückgängig
-                    except Exception as e:
-                        log.critical("CRITICAL Exception during undo_move in minimax (min): %s. Aborting branch.", e, exc_info=True)
-                        return config.STALEMATE
-            min_eval = min(min_eval, eval_score)
-            beta = min(beta, eval_score)
-            if beta <= alpha: break
-        return min_eval
-
-
-def find_best_move_minimax(gs: GameState, valid_moves: List[chess.Move], depth: int) -> Optional[chess.Move]:
-    """
-    Findet den besten Zug mithilfe des Minimax-Algorithmus.
-    Startet die rekursive Suche auf der obersten Ebene.
-    WICHTIG: Diese Funktion modifiziert das übergebene `gs`-Objekt während der Suche!
+def _score_to_tt(score: int, ply: int) -> int:
+    """Rechnet eine Mattbewertung von 'Abstand zur Wurzel' auf 'Abstand zum Knoten' um."""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+def _score_from_tt(score: int, ply: int) -> int:
+    """Gegenstück zu _score_to_tt: Mattbewertung aus der TT auf die aktuelle Ebene beziehen."""
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+def _evaluate_relative(pos: SearchPosition, ply: int, has_moves: Optional[bool] = None) -> int:
     """
-    if not valid_moves:
-        log.info("find_best_move_minimax: No valid moves to evaluate.")
-        return None
+    Statische Bewertung aus Sicht der Seite am Zug (für Negamax).
+    Material und Figur-Feld-Tabellen kommen aus der inkrementell mitgeführten Bewertung der Stellung.
+
+    Args:
+        has_moves (bool, optional): Ob die Stellung legale Züge hat, falls der Aufrufer das aus
+            seiner eigenen Zugliste bereits weiß. None = bei Bedarf (abbrechend) prüfen.
+    """
+    board = pos.board
+    if has_moves is None:
+        has_moves = has_legal_move(board)
+    if not has_moves:
+        return -engine_config.CHECKMATE + ply if board.is_check() else engine_config.STALEMATE
+    if is_draw_by_rule(board):
+        return engine_config.STALEMATE
+    return pos.evaluator.evaluate_relative(board.turn)
+
+
+# Knoten der laufenden Ruhesuche (wird an jedem Horizontknoten zurückgesetzt)
+_quiescence_nodes: int = 0
+
+def _quiescence_moves(board: chess.Board, captures: List[chess.Move], include_checks: bool) -> List[chess.Move]:
+    """
+    Liefert die "unruhigen" Züge für die Ruhesuche, sortiert nach MVV-LVA:
+    die bereits erzeugten Schlagzüge, ruhige Umwandlungen in eine Dame und optional ruhige Schachgebote.
+    """
+    moves = sorted(captures, key=lambda m: mvv_lva_score(board, m), reverse=True)
+    empty = ~board.occupied
+    # Nur Bauern auf der vorletzten Reihe können ohne Schlag umwandeln
+    promotion_rank = chess.BB_RANK_7 if board.turn == chess.WHITE else chess.BB_RANK_2
+    promoting_pawns = board.pawns & board.occupied_co[board.turn] & promotion_rank
+    if promoting_pawns:
+        for move in board.generate_legal_moves(from_mask=promoting_pawns, to_mask=empty):
+            if move.promotion == chess.QUEEN:
+                moves.append(move)
+    if include_checks:
+        for move in board.generate_legal_moves(to_mask=empty):
+            if not move.promotion and board.gives_check(move) and not board.is_en_passant(move):
+                moves.append(move)
+    return moves
+
+def quiescence(pos: SearchPosition, alpha: int, beta: int, ply: int, qply: int = 0) -> int:
+    """
+    Ruhesuche am Suchhorizont: untersucht nur Schlagzüge (und optional Schachgebote),
+    bis die Stellung "ruhig" ist, und vermeidet so den Horizonteffekt.
 
-    log.info("Starting Minimax search with depth %d for %s.", depth, "White" if gs.board.turn == chess.WHITE else "Black")
-    best_move = None
-    current_player_color = gs.board.turn
-    alpha = -config.CHECKMATE - 1
-    beta = config.CHECKMATE + 1
-    best_value = -config.CHECKMATE - 1 if current_player_color == chess.WHITE else config.CHECKMATE + 1
+    Args:
+        pos (SearchPosition): Die Stellung (wird per push/pop verändert und wiederhergestellt).
+        alpha, beta (int): Suchfenster aus Sicht der Seite am Zug.
+        ply (int): Abstand zur Wurzel (für Mattbewertungen).
+        qply (int): Tiefe innerhalb der Ruhesuche (Schachgebote nur auf Ebene 0).
 
-    moves_to_evaluate = list(valid_moves)
-    random.shuffle(moves_to_evaluate)
-    log.debug("Evaluating %d moves: %s", len(moves_to_evaluate), [m.uci() for m in moves_to_evaluate])
+    Returns:
+        int: Bewertung aus Sicht der Seite am Zug.
+    """
+    global _quiescence_nodes
+    _count_node()
+    _quiescence_nodes += 1
+    board, evaluator = pos.board, pos.evaluator
+    in_check = board.is_check()
+
+    if in_check:
+        # Im Schach gibt es kein "Stand Pat": alle Fluchtzüge müssen geprüft werden
+        moves = list(board.generate_legal_moves())
+        if not moves:
+            return -engine_config.CHECKMATE + ply
+        if is_draw_by_rule(board):
+            return engine_config.STALEMATE
+        moves = _move_orderer.order_moves(board, moves, None, ply)
+        best_score = -INFINITY_SCORE
+    else:
+        # Die Schlagzüge werden ohnehin gebraucht; gibt es einen, ist die Stellung sicher kein Patt
+        captures = list(board.generate_legal_captures())
+        # Stand Pat: die Seite am Zug muss nicht schlagen, die statische Bewertung ist eine untere Schranke
+        stand_pat = _evaluate_relative(pos, ply, True if captures else None)
+        if stand_pat >= beta:
+            return stand_pat
+        # Delta Pruning (global): selbst der Gewinn einer Dame reicht nicht an alpha heran
+        if stand_pat + engine_config.PIECE_VALUES[chess.QUEEN] + engine_config.QUIESCENCE_DELTA_MARGIN < alpha:
+            return stand_pat
+        # Knotenlimit erreicht -> die aktuelle Bewertung muss genügen
+        if _quiescence_nodes >= engine_config.QUIESCENCE_MAX_NODES:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        best_score = stand_pat
+        moves = _quiescence_moves(board, captures, engine_config.QUIESCENCE_INCLUDE_CHECKS and qply == 0)
+
+    for move in moves:
+        if not in_check and not move.promotion and board.is_capture(move):
+            # Delta Pruning (pro Zug): Materialgewinn plus Marge bleibt unter alpha
+            victim = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+            if stand_pat + engine_config.PIECE_VALUES.get(victim, 0) + engine_config.QUIESCENCE_DELTA_MARGIN <= alpha:
+                continue
+        evaluator.push(board, move)
+        try:
+            score = -quiescence(pos, -beta, -alpha, ply + 1, qply + 1)
+        finally:
+            evaluator.pop(board)
+        if score > best_score:
+            best_score = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+    return best_score
 
-    for i, move in enumerate(moves_to_evaluate):
-        move_made = False
-        board_value = 0
 
+def negamax(pos: SearchPosition, depth: int, alpha: int, beta: int, ply: int, pv: List[chess.Move]) -> int:
+    """
+    Negamax-Suche mit Alpha-Beta und Principal Variation Search (PVS).
+    Arbeitet direkt mit push/pop auf der übergebenen Stellung.
+
+    Args:
+        pos (SearchPosition): Die zu durchsuchende Stellung (wird während der Suche verändert und wiederhergestellt).
+        depth (int): Verbleibende Suchtiefe.
+        alpha, beta (int): Suchfenster aus Sicht der Seite am Zug.
+        ply (int): Abstand zur Wurzel.
+        pv (List[chess.Move]): Ausgabeliste; enthält danach die Hauptvariante ab diesem Knoten.
+
+    Returns:
+        int: Bewertung aus Sicht der Seite am Zug.
+    """
+    global _quiescence_nodes
+    _count_node()
+    pv.clear()
+    board, evaluator = pos.board, pos.evaluator
+    if is_draw_by_rule(board):
+        return engine_config.STALEMATE
+    # Endspieldatenbank als exakte Bewertung; nur nach Schlag-/Bauernzügen (50-Züge-Zählung bei 0)
+    if ply > 0 and board.halfmove_clock == 0 and chess.popcount(board.occupied) <= endgame_tablebase.probe_limit:
+        wdl = endgame_tablebase.probe_wdl(board)
+        if wdl is not None:
+            if wdl > 1: return TB_WIN_SCORE - ply
+            if wdl < -1: return -TB_WIN_SCORE + ply
+            return engine_config.STALEMATE # Remis bzw. durch die 50-Züge-Regel gerettet/verspielt
+    if depth <= 0:
+        if engine_config.QUIESCENCE_ENABLED:
+            _quiescence_nodes = 0
+            return quiescence(pos, alpha, beta, ply)
+        return _evaluate_relative(pos, ply)
+
+    # Transpositionstabelle abfragen
+    tt = get_transposition_table()
+    tt_key = 0
+    tt_move: Optional[chess.Move] = None
+    alpha_orig = alpha
+    if tt is not None:
+        tt_key = chess.polyglot.zobrist_hash(board)
+        entry = tt.probe(tt_key)
+        if entry is not None:
+            tt_move = entry.move
+            if entry.depth >= depth:
+                tt_score = _score_from_tt(entry.score, ply)
+                if entry.flag == TT_EXACT:
+                    if tt_move is not None: pv.append(tt_move)
+                    return tt_score
+                elif entry.flag == TT_LOWER:
+                    alpha = max(alpha, tt_score)
+                elif entry.flag == TT_UPPER:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    return tt_score
+
+    moves = list(board.legal_moves)
+    if not moves:
+        # Matt (kürzere Matts sind schlechter für die verlierende Seite) oder Patt
+        return -engine_config.CHECKMATE + ply if board.is_check() else engine_config.STALEMATE
+
+    moves = _move_orderer.order_moves(board, moves, tt_move, ply)
+    best_score = -INFINITY_SCORE
+    best_move: Optional[chess.Move] = None
+    child_pv: List[chess.Move] = []
+
+    for index, move in enumerate(moves):
+        evaluator.push(board, move)
         try:
-            if gs.make_move(move): # Modifiziert gs
-                move_made = True
-                is_opponent_maximizer = (gs.board.turn == chess.WHITE)
-                board_value = minimax(gs, depth - 1, alpha, beta, is_opponent_maximizer) # Ruft minimax auf demselben gs auf
+            if index == 0:
+                score = -negamax(pos, depth - 1, -beta, -alpha, ply + 1, child_pv)
             else:
-                log.warning("find_best_move_minimax: Top-level make_move(%s) returned False. FEN: %s", move.uci(), gs.board.fen())
-                board_value = config.CHECKMATE + 1 if current_player_color == chess.WHITE else -config.CHECKMATE - 1
-        except Exception as e:
-            log.error("Exception during top-level make_move block: %s (Move: %s, FEN: %s)", e, move.uci(), gs.board.fen(), exc_info=True)
-            board_value = config.CHECKMATE + 1 if current_player_color == chess.WHITE else -config.CHECKMATE - 1
+                # Nullfenster-Suche: widerlegt nur, dass der Zug besser als alpha ist
+                score = -negamax(pos, depth - 1, -alpha - 1, -alpha, ply + 1, child_pv)
+                if alpha < score < beta:
+                    score = -negamax(pos, depth - 1, -beta, -alpha, ply + 1, child_pv)
         finally:
-            if move_made:
-                try:
-                    gs.undo_move() # Macht die Änderung an gs rückgängig
-                except Exception as e:
-                    log.critical("CRITICAL Exception during top-level undo_move: %s. Skipping move.", e, exc_info=True)
-                    continue
-
-        if not move_made:
-            log.warning("Skipping evaluation for move %s due to make_move failure.", move.uci())
-            continue
-
-        if current_player_color == chess.WHITE:
-            if board_value > best_value:
-                log.debug("New best move for White: %s (Value: %.1f > %.1f)", move.uci(), board_value, best_value)
-                best_value = board_value
-                best_move = move
-            alpha = max(alpha, board_value)
+            evaluator.pop(board)
+
+        if score > best_score:
+            best_score = score
+            best_move = move
+            if score > alpha:
+                alpha = score
+                pv[:] = [move] + child_pv
+                if alpha >= beta:
+                    _move_orderer.record_cutoff(board, move, depth, ply)
+                    break
+
+    if tt is not None:
+        if best_score <= alpha_orig:
+            flag = TT_UPPER # Kein Zug hat alpha verbessert -> tatsächlicher Wert höchstens best_score
+        elif best_score >= beta:
+            flag = TT_LOWER # Beta-Cutoff -> tatsächlicher Wert mindestens best_score
         else:
-            if board_value < best_value:
-                log.debug("New best move for Black: %s (Value: %.1f < %.1f)", move.uci(), board_value, best_value)
-                best_value = board_value
-                best_move = move
-            beta = min(beta, board_value)
+            flag = TT_EXACT
+        tt.store(tt_key, depth, flag, _score_to_tt(best_score, ply), best_move)
+    return best_score
 
-    if best_move is None and valid_moves:
-        log.warning("Minimax search completed but no best move identified. Choosing random move as fallback.")
-        best_move = find_random_move(valid_moves)
+
+# Bestes Ergebnis einer abgebrochenen Wurzelsuche: [Zug, Bewertung, Hauptvariante]
+_interrupted_root_result: List[Any] = [None, 0, []]
+
+def _search_root(board: chess.Board, valid_moves: List[chess.Move], depth: int) -> Tuple[Optional[chess.Move], int, List[chess.Move]]:
+    """
+    Durchsucht alle Züge der Wurzelstellung bis zur gegebenen Tiefe.
+    Gibt den besten Zug, seine Bewertung (aus Sicht der Seite am Zug) und die Hauptvariante zurück.
+    Kann SearchTimeout auslösen, wenn ein Zeitlimit gesetzt ist.
+    """
+    if not valid_moves:
+        log.info("_search_root: No valid moves to evaluate.")
+        return None, engine_config.STALEMATE, []
+
+    log.info("Starting Negamax search with depth %d for %s.", depth, "White" if board.turn == chess.WHITE else "Black")
+    pos = SearchPosition(board, copy=False) # Bewertung einmal pro Iteration neu berechnen
+    evaluator = pos.evaluator
+    tt = get_transposition_table()
+    root_key = chess.polyglot.zobrist_hash(board) if tt is not None else 0
+    best_move: Optional[chess.Move] = None
+    best_value = -INFINITY_SCORE
+    best_pv: List[chess.Move] = []
+    # Alle Züge mit der besten Bewertung; unter ihnen wird zufällig gewählt (Spielvielfalt)
+    equal_best_moves: List[chess.Move] = []
+    equal_best_pvs: List[List[chess.Move]] = []
+    child_pv: List[chess.Move] = []
+
+    # Zug aus der vorherigen Iteration (TT) zuerst, danach Schlagzüge, Killer, History
+    root_entry = tt.probe(root_key) if tt is not None else None
+    moves_to_evaluate = _move_orderer.order_moves(board, list(valid_moves),
+                                                  root_entry.move if root_entry else None, 0)
+    # Log-Argumente (UCI-Listen) nur aufbauen, wenn die Stufe aktiv ist
+    log_debug = log.isEnabledFor(logging.DEBUG)
+    if log_debug:
+        log.debug("Evaluating %d moves: %s", len(moves_to_evaluate), [m.uci() for m in moves_to_evaluate])
+
+    for move in moves_to_evaluate:
+        evaluator.push(board, move)
+        try:
+            if is_stop_requested() and best_move is not None:
+                # Abbruch zwischen zwei Wurzelzügen: bisheriges Ergebnis für "Sofort ziehen" merken
+                raise SearchTimeout()
+            if best_move is None:
+                value = -negamax(pos, depth - 1, -INFINITY_SCORE, INFINITY_SCORE, 1, child_pv)
+            else:
+                # Das Fenster reicht bis knapp unter den besten Wert, damit gleich gute
+                # Züge einen exakten Wert liefern und für die Zufallsauswahl erkannt werden.
+                alpha = best_value - 1
+                value = -negamax(pos, depth - 1, -alpha - 1, -alpha, 1, child_pv)
+                if value > alpha:
+                    value = -negamax(pos, depth - 1, -INFINITY_SCORE, -alpha, 1, child_pv)
+        except SearchTimeout:
+            _interrupted_root_result[:] = [best_move, best_value, best_pv]
+            raise
+        finally:
+            evaluator.pop(board)
+
+        if value > best_value:
+            if log_debug: log.debug("New best move: %s (Value: %d > %d)", move.uci(), value, best_value)
+            best_value = value
+            best_move = move
+            best_pv = [move] + child_pv
+            equal_best_moves = [move]
+            equal_best_pvs = [best_pv]
+        elif value == best_value:
+            equal_best_moves.append(move)
+            equal_best_pvs.append([move] + child_pv)
+
+    if len(equal_best_moves) > 1:
+        chosen_index = random.randrange(len(equal_best_moves))
+        best_move = equal_best_moves[chosen_index]
+        best_pv = equal_best_pvs[chosen_index]
+        if log_debug:
+            log.debug("%d moves share the best value %d. Randomly chose %s.", len(equal_best_moves), best_value, best_move.uci())
+
+    if tt is not None and best_move is not None:
+        tt.store(root_key, depth, TT_EXACT, _score_to_tt(best_value, 0), best_move)
 
     if best_move:
-        log.info("Minimax search finished. Best move found: %s with evaluation: %.1f", best_move.uci(), best_value)
+        if log.isEnabledFor(logging.INFO):
+            log.info("Negamax search finished. Best move found: %s with evaluation: %d (PV: %s)",
+                     best_move.uci(), best_value, " ".join(m.uci() for m in best_pv))
     else:
-        log.warning("Minimax search finished. No move could be selected.")
+        log.warning("Negamax search finished. No move could be selected.")
+
+    return best_move, best_value, best_pv
+
+
+def search_root_move(board: chess.Board, move: chess.Move, depth: int,
+                     alpha: int = -INFINITY_SCORE, beta: int = INFINITY_SCORE) -> Tuple[int, List[chess.Move]]:
+    """
+    Bewertet einen einzelnen Wurzelzug bis zur gegebenen Tiefe im Fenster (alpha, beta)
+    (Baustein der parallelen Wurzelsuche in parallel_search.py).
+
+    Returns:
+        Tuple[int, List[chess.Move]]: Bewertung aus Sicht der Seite am Zug in der Wurzelstellung
+        (<= alpha: obere Schranke, >= beta: untere Schranke, sonst exakt) und die Hauptvariante beginnend mit dem Zug.
+    """
+    pos = SearchPosition(board, copy=False)
+    evaluator = pos.evaluator
+    child_pv: List[chess.Move] = []
+    evaluator.push(board, move)
+    try:
+        score = -negamax(pos, depth - 1, -beta, -alpha, 1, child_pv)
+    finally:
+        evaluator.pop(board)
+    return score, [move] + child_pv
+
+
+def _store_search_result(board: chess.Board, pv: List[chess.Move], score: Optional[int]):
+    """Übernimmt Hauptvariante und Bewertung in die von GUI und TTS gelesenen Variablen."""
+    global _last_principal_variation, _last_search_board, _last_search_score
+    _last_search_board = board
+    _last_principal_variation = list(pv)
+    _last_search_score = score
+
+def _set_search_result(board: chess.Board, pv: List[chess.Move], score: Optional[int]):
+    """
+    Speichert Hauptvariante und Bewertung der letzten Suche für GUI und TTS.
+    Während des Ponderns wird das Ergebnis nur vorgemerkt und erst bei SearchControl.ponder_hit() veröffentlicht.
+    """
+    board = board.copy(stack=False)
+    with _ponder_lock:
+        if _is_pondering():
+            _active_control.pending_result = (board, list(pv), score)
+        else:
+            _store_search_result(board, pv, score)
+
+def _format_variation(board: chess.Board, pv: List[chess.Move]) -> Optional[str]:
+    """Formatiert eine Variante in SAN-Notation ab der gegebenen Stellung (None bei leerer/ungültiger Variante)."""
+    if board is None or not pv:
+        return None
+    try:
+        return board.variation_san(pv)
+    except ValueError as e:
+        log.warning("Could not format principal variation %s: %s", [m.uci() for m in pv], e)
+        return None
+
+def get_principal_variation() -> List[chess.Move]:
+    """Gibt die Hauptvariante (geplante Zugfolge) der letzten KI-Suche zurück."""
+    return list(_last_principal_variation)
+
+def get_principal_variation_board() -> Optional[chess.Board]:
+    """Gibt eine Kopie der Stellung zurück, von der die letzte Hauptvariante ausgeht (oder None)."""
+    return _last_search_board.copy(stack=False) if _last_search_board is not None else None
+
+def get_principal_variation_san() -> Optional[str]:
+    """
+    Gibt die Hauptvariante der letzten Suche in SAN-Notation zurück (z.B. "1. e4 e5 2. Sf3"),
+    ausgehend von der Stellung, in der die KI gesucht hat. None, wenn keine Variante vorliegt.
+    """
+    return _format_variation(_last_search_board, _last_principal_variation)
+
+def get_last_search_score() -> Optional[int]:
+    """Gibt die Bewertung der letzten Suche (Zentibauern aus Sicht der KI) zurück oder None."""
+    return _last_search_score
+
+
+def find_best_move_negamax(board: chess.Board, valid_moves: List[chess.Move], depth: int) -> Optional[chess.Move]:
+    """
+    Findet den besten Zug mit einer Negamax-Suche fester Tiefe.
+    Wird die Suche abgebrochen ("Sofort ziehen"), gilt der beste bis dahin vollständig
+    bewertete Wurzelzug (oder None, falls noch keiner fertig war).
+    WICHTIG: Das übergebene Brett wird während der Suche verändert (und wiederhergestellt).
+    """
+    global _nodes_searched
+    _nodes_searched = 0
+    start_progress_tracking()
+    _progress_info['depth'] = depth
+    try:
+        best_move, value, pv = _search_root(board, valid_moves, depth)
+    except SearchTimeout:
+        best_move, value, pv = _interrupted_root_result
+        log.info("Negamax search stopped early. Best move so far: %s", best_move.uci() if best_move else "None")
+        if best_move is None:
+            return None
+    _set_search_result(board, pv, value)
+    report_progress(score=value, pv=_format_variation(board, pv), pv_moves=[m.uci() for m in pv],
+                    completed_depth=depth)
+    return best_move
+
+
+def find_best_move_iterative(board: chess.Board, valid_moves: List[chess.Move],
+                             time_budget_ms: int, max_depth: int) -> Optional[chess.Move]:
+    """
+    Iterative Vertiefung: Sucht nacheinander mit Tiefe 1, 2, 3, ... bis das Zeitbudget
+    aufgebraucht oder max_depth erreicht ist. Zurückgegeben wird der beste Zug der
+    letzten *vollständig* abgeschlossenen Tiefe.
+    Tiefe 1 läuft immer ohne Zeitlimit, damit stets ein Suchergebnis vorliegt.
+    WICHTIG: Das übergebene Brett wird während der Suche verändert (und wiederhergestellt).
+    """
+    global _search_deadline, _nodes_searched, _budget_start, _budget_s, _search_depth
+    if not valid_moves:
+        log.info("find_best_move_iterative: No valid moves to evaluate.")
+        return None
+
+    start_time = time.monotonic()
+    start_progress_tracking()
+    budget_s = max(0, time_budget_ms) / 1000.0
+    _budget_start, _budget_s = start_time, budget_s
+    best_move: Optional[chess.Move] = None
+    completed_depth = 0
+    _nodes_searched = 0
+    log.info("Starting iterative deepening (Budget: %d ms, Max Depth: %d).", time_budget_ms, max_depth)
 
+    try:
+        for depth in range(1, max(1, max_depth) + 1):
+            # Ab Tiefe 2 gilt das Zeitbudget (Tiefe 1 liefert den garantierten Rückfallzug),
+            # beim Pondering erst nach SearchControl.ponder_hit()
+            with _ponder_lock:
+                _search_depth = depth
+                _search_deadline = start_time + budget_s if depth > 1 and not _is_pondering() else None
+            iteration_start = time.monotonic()
+            _progress_info['depth'] = depth
+            try:
+                move, value, pv = _search_root(board, valid_moves, depth)
+            except SearchTimeout:
+                log.info("Iterative deepening: Depth %d aborted after %.0f ms (%s).", depth,
+                         (time.monotonic() - start_time) * 1000,
+                         "stop requested" if is_stop_requested() else "time budget exhausted")
+                break
+
+            if move is not None:
+                best_move = move
+                completed_depth = depth
+                _set_search_result(board, pv, value)
+                report_progress(score=value, pv=_format_variation(board, pv), pv_moves=[m.uci() for m in pv],
+                                completed_depth=depth)
+            now = time.monotonic()
+            log.info("Iterative deepening: Depth %d completed in %.0f ms. Best move: %s (Value: %d, Nodes: %d)",
+                     depth, (now - iteration_start) * 1000, move.uci() if move else "None", value, _nodes_searched)
+
+            # Gefundenes Matt lässt sich durch tiefere Suche nicht verbessern
+            if abs(value) >= MATE_THRESHOLD:
+                log.debug("Iterative deepening: Mate score found at depth %d, stopping early.", depth)
+                break
+            # Die nächste Tiefe dauert ein Vielfaches der aktuellen. Ist bereits mehr als die
+            # Hälfte des Budgets verbraucht, wird sie kaum fertig -> Zeit nicht verschwenden.
+            if not _is_pondering() and now - start_time > budget_s / 2:
+                log.debug("Iterative deepening: More than half of the budget used, not starting depth %d.", depth + 1)
+                break
+    finally:
+        with _ponder_lock:
+            _search_deadline = None
+            _search_depth = 0
+
+    log.info("Iterative deepening finished after %.0f ms. Completed depth: %d, Best move: %s, Nodes: %d",
+             (time.monotonic() - start_time) * 1000, completed_depth,
+             best_move.uci() if best_move else "None", _nodes_searched)
     return best_move
 
 
 # --- Hauptfunktion zur Zugfindung ---
-def find_best_move(gs: GameState, valid_moves: List[chess.Move], return_queue: Optional[queue.Queue] = None):
+def find_best_move(position: SearchPosition, valid_moves: List[chess.Move], return_queue: Optional[queue.Queue] = None,
+                   time_budget_ms: Optional[int] = None, control: Optional[SearchControl] = None,
+                   progress_queue: Optional[queue.Queue] = None, max_depth: Optional[int] = None):
     """
-    Hauptfunktion zur Zugfindung der KI. Verwendet Buch, Endspiel-TB oder Minimax.
-    Übergibt eine Kopie des GameState an die Minimax-Suche.
+    Hauptfunktion zur Zugfindung der KI. Verwendet Buch, Endspiel-TB oder die Negamax-Suche.
+    Übergibt eine Kopie des Boards an die Suche; die Hauptvariante ist danach über
+    get_principal_variation() / get_principal_variation_san() abrufbar.
+    Mit aktivierter iterativer Vertiefung (engine_config.AI_USE_ITERATIVE_DEEPENING) bestimmt
+    time_budget_ms (Standard: engine_config.AI_TIME_BUDGET_MS) die Bedenkzeit statt einer festen Tiefe.
+
+    Args:
+        position (SearchPosition): Die Stellung der KI (z.B. SearchPosition.from_game_state(gs)).
+        control (SearchControl, optional): Steuersignale dieser Suche (siehe ai_search.AISearch).
+            Läuft im Prozess noch eine andere Suche, wartet diese Suche auf deren Ende.
+        progress_queue (queue.Queue, optional): Empfängt regelmäßig Fortschrittsmeldungen (Dict).
+        max_depth (int, optional): Höchste Suchtiefe; Standard: engine_config.AI_MAX_DEPTH
+            (bzw. engine_config.AI_DEPTH ohne iterative Vertiefung).
     """
-    log.info("find_best_move called for %s.", "White" if gs.board.turn == chess.WHITE else "Black")
+    global _progress_queue, _active_control
+    control = control if control is not None else SearchControl()
+    best_move_found = None
+    if _acquire_search_lock(control):
+        try:
+            set_stop_event(control.stop_event)
+            _progress_queue = progress_queue
+            with _ponder_lock:
+                _active_control = control
+            best_move_found = _select_move(position, valid_moves, time_budget_ms, max_depth)
+        finally:
+            with _ponder_lock:
+                _active_control = None
+            set_stop_event(None)
+            _progress_queue = None
+            _search_lock.release()
+
+    # 5. Ergebnis zurückgeben oder in Queue legen
+    if return_queue:
+        log.debug("Putting best move (%s) into return queue.", best_move_found.uci() if best_move_found else "None")
+        try:
+            return_queue.put(best_move_found)
+        except Exception as e_queue:
+            log.error("Exception putting move into queue: %s", e_queue, exc_info=True)
+    else:
+        log.debug("Returning best move directly: %s", best_move_found.uci() if best_move_found else "None")
+        return best_move_found
+
+def _select_move(position: SearchPosition, valid_moves: List[chess.Move], time_budget_ms: Optional[int],
+                 max_depth: Optional[int] = None) -> Optional[chess.Move]:
+    """Wählt den Zug der KI: Eröffnungsbuch, Endspieldatenbank, Suche, zuletzt Zufallszug."""
+    log.info("find_best_move called for %s.", "White" if position.turn == chess.WHITE else "Black")
     best_move_found = None
 
     if not valid_moves:
         log.info("No valid moves available.")
-        if return_queue: return_queue.put(None)
         return None
 
-    # --- Buch/Endspiel-Prüfung (mit Kopie des *Boards*) ---
-    board_copy = gs.board.copy()
-    log.debug("Created board copy for book/syzygy lookup. FEN: %s", board_copy.fen())
+    # --- Buch/Endspiel-Prüfung und Suche arbeiten auf einer gemeinsamen Kopie des Boards ---
+    board_copy = position.board.copy()
+    log.debug("Created board copy for book/syzygy lookup and search. FEN: %s", board_copy.fen())
 
-    # 1. Eröffnungsbuch prüfen
-    if config.POLYGLOT_BOOK_PATH and config.POLYGLOT_BOOK_PATH != "":
-        # (Logik bleibt gleich, verwendet board_copy)
-        log.debug("Checking opening book: %s", config.POLYGLOT_BOOK_PATH)
+    # 1. Eröffnungsbuch prüfen (Index im Speicher, siehe opening_book.py)
+    if engine_config.POLYGLOT_BOOK_PATH and engine_config.POLYGLOT_BOOK_PATH != "":
         try:
-            with chess.polyglot.open_reader(config.POLYGLOT_BOOK_PATH) as reader:
-                entries = list(reader.find_all(board_copy))
-                if entries:
-                    log.debug("Found %d entries in opening book.", len(entries))
-                    opening_move = random.choice(entries).move
-                    log.debug("Potential opening move from book: %s", opening_move.uci())
-                    if opening_move in valid_moves:
-                        log.info("Opening book move found and is legal: %s", opening_move.uci())
-                        best_move_found = opening_move
-                    else:
-                         log.warning("Opening book move %s is NOT currently legal for FEN %s", opening_move.uci(), gs.board.fen())
+            opening_move = opening_book.probe(board_copy)
+            if opening_move is not None:
+                if opening_move in valid_moves:
+                    log.info("Opening book move found and is legal: %s", opening_move.uci())
+                    best_move_found = opening_move
                 else:
-                    log.debug("No matching position found in opening book.")
-        except FileNotFoundError: log.warning("Opening book file not found at: %s", config.POLYGLOT_BOOK_PATH)
-        except IndexError: log.debug("IndexError while accessing opening book.")
+                    log.warning("Opening book move %s is NOT currently legal for FEN %s", opening_move.uci(), board_copy.fen())
         except Exception as e: log.error("Error reading opening book: %s", e, exc_info=True)
 
-    # 2. Endspieldatenbank prüfen
+    # 2. Endspieldatenbank prüfen (einmal geöffnet, Abfragen gecacht, siehe endgame_tablebase.py)
     piece_count = len(board_copy.piece_map())
-    syzygy_enabled = config.SYZYGY_PATH and config.SYZYGY_PATH != ""
-    syzygy_applicable = piece_count <= config.SYZYGY_MAX_PIECES
+    syzygy_enabled = engine_config.SYZYGY_PATH and engine_config.SYZYGY_PATH != ""
+    syzygy_applicable = piece_count <= engine_config.SYZYGY_MAX_PIECES
 
     if best_move_found is None and syzygy_enabled and syzygy_applicable:
-        # (Logik bleibt gleich, verwendet board_copy)
         log.debug("Checking Syzygy endgame tablebases (Piece count: %d <= %d): %s",
-                  piece_count, config.SYZYGY_MAX_PIECES, config.SYZYGY_PATH)
+                  piece_count, engine_config.SYZYGY_MAX_PIECES, engine_config.SYZYGY_PATH)
         try:
-            with chess.syzygy.open_tablebase(config.SYZYGY_PATH) as tablebase:
-                best_syzygy_move = None
-                best_wdl = -3
-                for move in valid_moves:
-                    wdl_opponent = None
-                    try:
-                        board_copy.push(move)
-                        wdl_opponent = tablebase.probe_wdl(board_copy)
-                        board_copy.pop()
-                    except Exception as e_push_pop:
-                        log.error("Exception during push/pop in Syzygy check for move %s: %s", move.uci(), e_push_pop, exc_info=True)
-                        if board_copy.move_stack and board_copy.peek() == move:
-                            try: board_copy.pop()
-                            except IndexError: pass
-                        continue
-                    if wdl_opponent is not None:
-                        current_player_wdl = -wdl_opponent
-                        if current_player_wdl > best_wdl:
-                            best_wdl = current_player_wdl
-                            best_syzygy_move = move
-                            if best_wdl > 0: break
-                        elif current_player_wdl == best_wdl:
-                            if random.choice([True, False]): best_syzygy_move = move
-                if best_syzygy_move is not None:
-                    if best_syzygy_move in valid_moves:
-                        log.info("Syzygy endgame tablebase move found: %s (Best WDL: %d)", best_syzygy_move.uci(), best_wdl)
-                        best_move_found = best_syzygy_move
-                    else: log.warning("Syzygy found move %s which is not in valid_moves?", best_syzygy_move.uci())
-                else: log.debug("Syzygy probe completed, no move selected.")
-        except FileNotFoundError: log.warning("Syzygy endgame tablebase path not found: %s", config.SYZYGY_PATH)
+            syzygy_result = endgame_tablebase.choose_move(board_copy, valid_moves)
+            if syzygy_result is not None:
+                best_syzygy_move, best_wdl = syzygy_result
+                if best_syzygy_move in valid_moves:
+                    log.info("Syzygy endgame tablebase move found: %s (Best WDL: %d)", best_syzygy_move.uci(), best_wdl)
+                    best_move_found = best_syzygy_move
+                else: log.warning("Syzygy found move %s which is not in valid_moves?", best_syzygy_move.uci())
+            else: log.debug("Syzygy probe completed, no move selected.")
         except Exception as e: log.error("Error accessing Syzygy endgame tablebase: %s", e, exc_info=True)
 
-    # 3. Wenn kein Buch/TB-Zug, nutze Minimax mit einer *Kopie* des GameState
+    # 3. Wenn kein Buch/TB-Zug, nutze die Negamax-Suche auf einer *Kopie* des Boards
     if best_move_found is None:
-        log.info("No book/Syzygy move found. Starting Minimax search (Depth: %d)...", config.AI_DEPTH)
+        use_iterative = engine_config.AI_USE_ITERATIVE_DEEPENING
+        budget_ms = time_budget_ms if time_budget_ms is not None else engine_config.AI_TIME_BUDGET_MS
+        if max_depth is None:
+            max_depth = engine_config.AI_MAX_DEPTH if use_iterative else engine_config.AI_DEPTH
+        if use_iterative:
+            log.info("No book/Syzygy move found. Starting iterative deepening search (Budget: %d ms)...", budget_ms)
+        else:
+            log.info("No book/Syzygy move found. Starting Negamax search (Depth: %d)...", max_depth)
         try:
-            # *** HIER DIE ÄNDERUNG: Verwende gs.copy() ***
-            search_gs = gs.copy()
-            log.debug("Created GameState copy for Minimax search.")
-            # Übergebe die Kopie an die Suchfunktion
-            best_move_found = find_best_move_minimax(search_gs, valid_moves, depth=config.AI_DEPTH)
-        except AttributeError as e_copy:
-             log.error("GameState object does not have a 'copy' method: %s. Falling back to FEN initialization.", e_copy)
-             # Fallback, falls copy() nicht implementiert ist
-             search_gs = GameState(fen=gs.get_fen())
-             best_move_found = find_best_move_minimax(search_gs, valid_moves, depth=config.AI_DEPTH)
+            # Die Suche arbeitet mit push/pop direkt auf der Kopie; die übergebene Stellung bleibt unberührt
+            search_board = board_copy
+            import parallel_search # Lokal importiert: parallel_search importiert seinerseits ai_opponent
+            # Pondering bleibt im KI-Thread, damit der Gegner während seiner Bedenkzeit nicht alle Kerne verliert
+            if use_iterative and parallel_search.is_enabled() and not _is_pondering():
+                # Wurzelzüge auf mehrere Prozesse verteilen; bei Problemen mit dem Pool: Einzelprozess-Suche
+                parallel_result = parallel_search.find_best_move_parallel(search_board, valid_moves, budget_ms, max_depth)
+                if parallel_result is not None:
+                    best_move_found, value, pv = parallel_result
+                    _set_search_result(search_board, pv, value)
+                elif not is_stop_requested():
+                    log.warning("Parallel search returned no result. Falling back to single-process search.")
+            if best_move_found is None and not is_stop_requested():
+                tt = get_transposition_table()
+                start_new_search()
+                if use_iterative:
+                    best_move_found = find_best_move_iterative(search_board, valid_moves, budget_ms, max_depth)
+                else:
+                    best_move_found = find_best_move_negamax(search_board, valid_moves, depth=max_depth)
+                if tt is not None: tt.log_stats()
+            pv_san = get_principal_variation_san()
+            if pv_san:
+                log.info("Principal variation: %s", pv_san)
         except Exception as e_search:
-             log.error("Exception during Minimax search execution: %s", e_search, exc_info=True)
+             log.error("Exception during Negamax search execution: %s", e_search, exc_info=True)
              best_move_found = None
 
     # 4. Fallback: Zufälliger Zug
     if best_move_found is None and valid_moves:
         log.warning("No best move identified after all checks. Choosing random move as final fallback.")
         best_move_found = find_random_move(valid_moves)
-
-    # 5. Ergebnis zurückgeben oder in Queue legen
-    if return_queue:
-        log.debug("Putting best move (%s) into return queue.", best_move_found.uci() if best_move_found else "None")
-        try:
-            return_queue.put(best_move_found)
-        except Exception as e_queue:
-            log.error("Exception putting move into queue: %s", e_queue, exc_info=True)
-    else:
-        log.debug("Returning best move directly: %s", best_move_found.uci() if best_move_found else "None")
-        return best_move_found
+    return best_move_found
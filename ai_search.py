@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul kapselt eine laufende KI-Suche in einem Objekt (AISearch).
+Die Suche läuft in einem eigenen Thread und kann jederzeit abgebrochen werden
+(cancel: Ergebnis wird verworfen) oder zum sofortigen Ziehen aufgefordert werden
+(move_now: der beste bisher gefundene Zug wird geliefert). Während der Suche werden
+regelmäßig Fortschrittsmeldungen (Tiefe, Knoten, Bewertung, Hauptvariante) in eine Queue gelegt,
+die die GUI z.B. in der Statuszeile anzeigen kann.
+Nach einem KI-Zug kann mit start_ponder_search() die vorhergesagte Antwort des Gegners
+(zweiter Zug der Hauptvariante) schon während dessen Bedenkzeit durchsucht werden ("Pondering").
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import threading
+import queue
+import logger
+import chess
+import engine_config
+import ai_opponent
+from game_state import GameState
+from search_position import SearchPosition
+from typing import Optional, List, Dict, Any, Tuple, Callable
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in ai_search.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+
+class AISearch:
+    """
+    Eine abbrechbare KI-Suche im Hintergrund.
+
+    Attributes:
+        control (ai_opponent.SearchControl): Steuersignale dieser Suche (Abbruch, Pondering); gehört nur ihr.
+        cancelled (bool): True, wenn das Ergebnis verworfen werden soll (z.B. Rückkehr ins Hauptmenü).
+        latest_progress (Dict[str, Any] | None): Letzte empfangene Fortschrittsmeldung.
+        pondering (bool): True, solange die Suche auf der vorhergesagten Stellung ohne Zeitlimit läuft.
+    """
+    def __init__(self, position: SearchPosition, valid_moves: List[chess.Move], time_budget_ms: Optional[int] = None,
+                 ponder: bool = False, max_depth: Optional[int] = None,
+                 on_finished: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            position (SearchPosition): Die zu durchsuchende Stellung (z.B. SearchPosition.from_game_state(gs)).
+            valid_moves (List[chess.Move]): Die legalen Züge der Stellung.
+            time_budget_ms (int, optional): Bedenkzeit; Standard: engine_config.AI_TIME_BUDGET_MS.
+            ponder (bool): Suche während der Bedenkzeit des Gegners (ohne Zeitlimit bis ponder_hit()).
+            max_depth (int, optional): Höchste Suchtiefe; Standard: engine_config.AI_MAX_DEPTH.
+            on_finished (Callable, optional): Wird im Such-Thread aufgerufen, sobald das Ergebnis bereitliegt
+                (z.B. um die im Leerlauf wartende Hauptschleife zu wecken).
+        """
+        self.position = position
+        self.valid_moves = valid_moves
+        self.time_budget_ms = time_budget_ms
+        self.pondering = ponder
+        self.max_depth = max_depth
+        self.on_finished = on_finished
+        self.control = ai_opponent.SearchControl(ponder=ponder)
+        self.cancelled = False
+        self.latest_progress: Optional[Dict[str, Any]] = None
+        self._move_queue: queue.Queue = queue.Queue()
+        self._progress_queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Startet die Suche im Hintergrund-Thread."""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="AI_Thread")
+        self._thread.start()
+        log.debug("AI search thread '%s' started.", self._thread.name)
+
+    def _run(self):
+        """Thread-Funktion: führt die Suche aus und ruft danach on_finished auf."""
+        try:
+            ai_opponent.find_best_move(self.position, self.valid_moves, self._move_queue, self.time_budget_ms,
+                                       control=self.control, progress_queue=self._progress_queue,
+                                       max_depth=self.max_depth)
+        finally:
+            if self.on_finished is not None:
+                try:
+                    self.on_finished()
+                except Exception as e:
+                    log.error("Error in on_finished callback of AI search: %s", e, exc_info=True)
+
+    def is_running(self) -> bool:
+        """Gibt zurück, ob der Such-Thread noch läuft."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def matches(self, board: chess.Board) -> bool:
+        """Gibt zurück, ob die Suche die gegebene Stellung durchsucht (Ponder-Treffer)."""
+        return not self.cancelled and self.position.board.fen() == board.fen()
+
+    def ponder_hit(self):
+        """Der Gegner hat den vorhergesagten Zug gespielt: Die Ponder-Suche wird zur normalen Suche mit Zeitbudget."""
+        if self.pondering:
+            self.pondering = False
+            self.control.ponder_hit()
+
+    def move_now(self):
+        """Fordert die Suche auf, sofort mit dem besten bisher gefundenen Zug zu antworten."""
+        if self.is_running() and not self.control.is_stopped():
+            log.info("AI search: 'Move now' requested.")
+            self.control.stop()
+
+    def cancel(self):
+        """Bricht die Suche ab und verwirft ihr Ergebnis."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self.control.stop()
+        log.info("AI search cancelled (Thread alive: %s).", self.is_running())
+
+    def join(self, timeout: Optional[float] = None):
+        """Wartet (höchstens timeout Sekunden) auf das Ende des Such-Threads."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll_result(self) -> Tuple[bool, Optional[chess.Move]]:
+        """
+        Fragt das Ergebnis ab, ohne zu blockieren.
+
+        Returns:
+            Tuple[bool, chess.Move | None]: (fertig, Zug). Abgebrochene Suchen liefern nie ein Ergebnis.
+        """
+        if self.cancelled:
+            return False, None
+        try:
+            return True, self._move_queue.get_nowait()
+        except queue.Empty:
+            if self._thread is not None and not self._thread.is_alive():
+                # Thread beendet, aber nichts in die Queue gelegt (sollte nicht vorkommen)
+                try:
+                    return True, self._move_queue.get_nowait()
+                except queue.Empty:
+                    log.warning("AI search thread finished, but move queue is empty.")
+                    return True, None
+            return False, None
+
+    def drain_progress(self) -> List[Dict[str, Any]]:
+        """Gibt alle seit dem letzten Aufruf eingegangenen Fortschrittsmeldungen in Reihenfolge zurück."""
+        messages = []
+        try:
+            while True:
+                messages.append(self._progress_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if messages:
+            self.latest_progress = messages[-1]
+        return messages
+
+    def poll_progress(self) -> Optional[Dict[str, Any]]:
+        """Gibt die neueste Fortschrittsmeldung zurück (ältere werden verworfen) oder None, wenn keine neue vorliegt."""
+        messages = self.drain_progress()
+        return messages[-1] if messages else None
+
+
+def start_ponder_search(gs: GameState, ai_move: chess.Move,
+                        on_finished: Optional[Callable[[], None]] = None) -> Optional[AISearch]:
+    """
+    Startet nach einem KI-Zug die Suche auf der vorhergesagten Antwort des Gegners.
+
+    Args:
+        gs (GameState): Der Spielzustand *nach* dem KI-Zug (wird nicht verändert).
+        ai_move (chess.Move): Der gerade ausgeführte KI-Zug.
+        on_finished (Callable, optional): Siehe AISearch.
+
+    Returns:
+        AISearch | None: Die laufende Ponder-Suche oder None, wenn keine Vorhersage möglich ist.
+    """
+    pv = ai_opponent.get_principal_variation()
+    if len(pv) < 2 or pv[0] != ai_move:
+        log.debug("Pondering skipped: no predicted reply in PV (%s).", [m.uci() for m in pv])
+        return None
+    predicted_move = pv[1]
+    if predicted_move not in gs.board.legal_moves:
+        log.warning("Pondering skipped: predicted reply %s is not legal.", predicted_move.uci())
+        return None
+    ponder_position = SearchPosition.from_game_state(gs)
+    ponder_position.push(predicted_move)
+    if ponder_position.is_game_over():
+        return None
+    valid_moves = ponder_position.legal_moves()
+    if not valid_moves:
+        return None
+    search = AISearch(ponder_position, valid_moves, ponder=True, on_finished=on_finished)
+    search.start()
+    log.info("Pondering on predicted reply %s.", predicted_move.uci())
+    return search
+
+
+def format_progress(progress: Dict[str, Any]) -> str:
+    """Formatiert eine Fortschrittsmeldung für die Statuszeile, z.B. "KI denkt... Tiefe 4 | +0.35 | 12k Knoten | Sf3 Sc6"."""
+    parts = [f"KI denkt... Tiefe {progress.get('depth', 0)}"]
+    score = progress.get('score')
+    if score is not None:
+        if abs(score) >= ai_opponent.MATE_THRESHOLD:
+            mate_in = (engine_config.CHECKMATE - abs(score) + 1) // 2 # Halbzüge bis zum Matt -> Züge
+            parts.append(f"Matt in {mate_in}" if score > 0 else f"Matt gegen KI in {mate_in}")
+        else:
+            parts.append(f"{score / 100:+.2f}")
+    nodes = progress.get('nodes', 0)
+    parts.append(f"{nodes / 1000:.0f}k Knoten" if nodes >= 1000 else f"{nodes} Knoten")
+    if progress.get('pv'):
+        parts.append(progress['pv'])
+    return " | ".join(parts)
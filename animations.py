@@ -178,8 +178,7 @@ def update_animation(screen: pygame.Surface, gs: 'GameState', board_display: 'Bo
             # 1. Zeichne das Brett und alle Figuren neu, *außer* der animierten Figur auf ihrem *Startfeld*
             #    (Das Startfeld wird während der Animation als leer behandelt).
             #    Das Zielfeld wird normal gezeichnet (falls eine Figur geschlagen wird).
-            board_display.draw_board(screen)
-            board_display.draw_coordinates(screen, flipped=gs.board.turn != chess.WHITE) # Beispiel: Koordinaten an Spieler anpassen
+            board_display.draw_static_board(screen, flipped=gs.board.turn != chess.WHITE) # Beispiel: Koordinaten an Spieler anpassen
             # Zeichne alle Figuren, außer der auf dem Startfeld der Animation
             board_display.draw_pieces(screen, gs.board, exclude_square=current_animation.start_square)
             # Hervorhebungen auch neu zeichnen (z.B. letzter Zug, Schach)
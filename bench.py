@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Kommandozeilenwerkzeug zum Messen der KI-Leistung (Benchmark), ohne Fenster und ohne Pygame-Anzeige.
+Für einen festen Satz von Stellungen wird mit iterativer Vertiefung bis zu einer festen Tiefe gesucht
+(Tiefe 1, 2, ..., wie ai_opponent.find_best_move_iterative, aber ohne Zeitbudget). Pro Stellung werden
+Knoten, Knoten pro Sekunde, Zeit bis zur jeweiligen Tiefe, Trefferquote der Transpositionstabelle und
+der beste Zug gemeldet. Die Ausgabe ist JSON, damit Läufe verschiedener Versionen verglichen werden
+können; mit --baseline und --threshold endet das Programm mit Code 1, wenn die Knoten pro Sekunde
+gegenüber einem früheren Lauf um mehr als den Schwellwert (in Prozent) gesunken sind.
+
+Eröffnungsbuch, Endspieldatenbank und Prozess-Pool werden nicht verwendet, damit die Knotenzahlen
+reproduzierbar sind (gleiche Knotenzahl = gleiche Suche). Mit --parallel N wird stattdessen die
+parallele Wurzelsuche (parallel_search.py) mit N Arbeitsprozessen gemessen; verglichen mit einem Lauf
+ohne --parallel zeigen Zeit und Knoten Beschleunigung und Mehraufwand der Verteilung.
+
+Aufruf z.B.:
+    python bench.py --depth 5 -o bench_neu.json
+    python bench.py --depth 5 --baseline bench_alt.json --threshold 5
+    python bench.py --depth 5 --parallel 3
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import time
+import json
+import random
+import argparse
+import platform
+import logger
+import chess
+import multiprocessing
+import engine_config
+import ai_opponent
+import parallel_search
+from typing import Optional, List, Dict, Any
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in bench.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Standardwerte der Kommandozeile ---
+DEFAULT_DEPTH = 4
+DEFAULT_THRESHOLD = 5.0      # Erlaubter Rückgang der Knoten pro Sekunde in Prozent
+DEFAULT_LOG_LEVEL = 'WARNING' # Die Suche loggt pro Tiefe; während der Messung nur Warnungen schreiben
+BENCH_UNLIMITED_BUDGET_MS = 10**9 # --parallel: Suche ohne praktisches Zeitlimit bis zur festen Tiefe
+BENCH_FORMAT_VERSION = 1
+
+# Feste Bench-Stellungen: Eröffnung, Mittelspiele mit vielen Schlagzügen, Endspiele
+BENCH_POSITIONS: List[str] = [
+    chess.STARTING_FEN,
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+    "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 1 5",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "2r3k1/pp3ppp/2n1b3/3p4/3P4/2PB1N2/P4PPP/R5K1 b - - 0 20",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "8/8/4k3/8/2p5/8/B2K4/8 w - - 0 1",
+]
+
+
+def bench_position(fen: str, depth: int) -> Dict[str, Any]:
+    """
+    Sucht eine Stellung mit iterativer Vertiefung bis zur Tiefe depth (leere TT, fester Zufallsstartwert).
+
+    Returns:
+        Dict[str, Any]: Messwerte der Stellung (Knoten, Zeit, NPS, Zeit bis Tiefe, TT-Trefferquote, Zug).
+    """
+    board = chess.Board(fen)
+    valid_moves = list(board.legal_moves)
+    random.seed(0) # Zufall entscheidet nur zwischen gleich bewerteten Wurzelzügen
+    ai_opponent.reset_transposition_table()
+    ai_opponent.start_new_search()
+
+    nodes = 0
+    best_move: Optional[chess.Move] = None
+    time_to_depth: List[int] = []
+    nodes_per_depth: List[int] = []
+    start_time = time.perf_counter()
+    for current_depth in range(1, depth + 1):
+        move = ai_opponent.find_best_move_negamax(board, valid_moves, current_depth)
+        nodes += ai_opponent.get_nodes_searched()
+        time_to_depth.append(int((time.perf_counter() - start_time) * 1000))
+        nodes_per_depth.append(nodes)
+        if move is not None:
+            best_move = move
+        score = ai_opponent.get_last_search_score()
+        # Gefundenes Matt lässt sich durch tiefere Suche nicht verbessern (wie in der iterativen Vertiefung)
+        if score is not None and abs(score) >= ai_opponent.MATE_THRESHOLD:
+            break
+    elapsed = time.perf_counter() - start_time
+
+    tt = ai_opponent.get_transposition_table()
+    return {
+        'fen': fen,
+        'depth': len(time_to_depth),
+        'nodes': nodes,
+        'time_ms': int(elapsed * 1000),
+        'nps': int(nodes / elapsed) if elapsed > 0 else 0,
+        'time_to_depth_ms': time_to_depth,
+        'nodes_to_depth': nodes_per_depth,
+        'tt_hit_rate': round(tt.hit_rate(), 4) if tt is not None else None,
+        'best_move': best_move.uci() if best_move else None,
+        'score': ai_opponent.get_last_search_score(),
+        'pv': ai_opponent.get_principal_variation_san(),
+    }
+
+
+def bench_position_parallel(fen: str, depth: int) -> Dict[str, Any]:
+    """
+    Sucht eine Stellung mit parallel_search.find_best_move_parallel bis zur Tiefe depth (ohne Zeitlimit).
+    Die Arbeitsprozesse behalten ihre Transpositionstabellen zwischen den Stellungen (wie im Spiel).
+
+    Returns:
+        Dict[str, Any]: Messwerte wie bench_position (Knoten aller Arbeitsprozesse, ohne Zeit bis Tiefe und TT-Trefferquote).
+    """
+    board = chess.Board(fen)
+    random.seed(0)
+    start_time = time.perf_counter()
+    result = parallel_search.find_best_move_parallel(board, list(board.legal_moves), BENCH_UNLIMITED_BUDGET_MS, depth)
+    elapsed = time.perf_counter() - start_time
+    nodes = parallel_search.get_nodes_searched()
+    return {
+        'fen': fen,
+        'depth': depth,
+        'nodes': nodes,
+        'time_ms': int(elapsed * 1000),
+        'nps': int(nodes / elapsed) if elapsed > 0 else 0,
+        'best_move': result[0].uci() if result else None,
+        'score': result[1] if result else None,
+        'pv': board.variation_san(result[2]) if result else None,
+    }
+
+
+def run_bench(depth: int = DEFAULT_DEPTH, positions: Optional[List[str]] = None, parallel: int = 0) -> Dict[str, Any]:
+    """
+    Führt den Benchmark über alle Stellungen aus und gibt das Ergebnis als JSON-fähiges Dictionary zurück.
+    parallel > 0 misst die parallele Wurzelsuche mit so vielen Arbeitsprozessen.
+    """
+    positions = positions or BENCH_POSITIONS
+    # Reproduzierbare Suche: nur die Negamax-Suche selbst wird gemessen
+    engine_config.SYZYGY_PROBE_IN_SEARCH = False
+    log.info("Bench: %d position(s), depth %d, parallel workers: %d.", len(positions), depth, parallel)
+    if parallel:
+        engine_config.AI_PARALLEL_WORKERS = parallel
+        if parallel_search.get_pool() is None:
+            raise RuntimeError("Prozess-Pool für --parallel konnte nicht angelegt werden.")
+        # Start der Arbeitsprozesse nicht mitmessen
+        parallel_search.find_best_move_parallel(chess.Board(), list(chess.Board().legal_moves), BENCH_UNLIMITED_BUDGET_MS, 1)
+    results = []
+    for index, fen in enumerate(positions, 1):
+        result = bench_position_parallel(fen, depth) if parallel else bench_position(fen, depth)
+        results.append(result)
+        print(f"[{index}/{len(positions)}] {result['best_move']} {result['nodes']} Knoten, "
+              f"{result['time_ms']} ms, {result['nps']} Knoten/s ({fen})", file=sys.stderr)
+    total_nodes = sum(r['nodes'] for r in results)
+    total_ms = sum(r['time_ms'] for r in results)
+    summary = {
+        'version': BENCH_FORMAT_VERSION,
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'chess': chess.__version__,
+        'depth': depth,
+        'parallel_workers': parallel,
+        'tt_size_mb': engine_config.TT_SIZE_MB if engine_config.TT_ENABLED else 0,
+        'positions': results,
+        'total': {
+            'nodes': total_nodes,
+            'time_ms': total_ms,
+            'nps': int(total_nodes * 1000 / total_ms) if total_ms > 0 else 0,
+        },
+    }
+    log.info("Bench finished: %s", summary['total'])
+    if parallel:
+        parallel_search.shutdown_pool()
+    return summary
+
+
+def compare_to_baseline(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """
+    Vergleicht die Knoten pro Sekunde mit einem früheren Lauf.
+
+    Returns:
+        bool: True, wenn der Rückgang höchstens threshold Prozent beträgt.
+    """
+    old_nps = baseline.get('total', {}).get('nps', 0)
+    new_nps = result['total']['nps']
+    change = (new_nps - old_nps) * 100.0 / old_nps if old_nps else 0.0
+    result['baseline'] = {'nps': old_nps, 'change_percent': round(change, 2), 'threshold_percent': threshold}
+    # Andere Knotenzahlen bedeuten eine geänderte Suche; NPS sind dann nur eingeschränkt vergleichbar
+    if baseline.get('depth') == result['depth'] and baseline.get('total', {}).get('nodes') != result['total']['nodes']:
+        log.warning("Bench: Node count differs from baseline (%s -> %d), search behaviour changed.",
+                    baseline.get('total', {}).get('nodes'), result['total']['nodes'])
+        result['baseline']['nodes_changed'] = True
+    passed = change >= -threshold
+    log.log(logging.INFO if passed else logging.WARNING,
+            "Bench: NPS %d -> %d (%+.1f%%, threshold -%.1f%%).", old_nps, new_nps, change, threshold)
+    return passed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Einstiegspunkt der Kommandozeile."""
+    parser = argparse.ArgumentParser(description="Misst die Suchleistung der KI über feste Stellungen (JSON-Ausgabe).")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help=f"Suchtiefe (Standard: {DEFAULT_DEPTH})")
+    parser.add_argument("--fen", action="append", help="Eigene Stellung(en) statt der Bench-Stellungen (mehrfach möglich)")
+    parser.add_argument("-o", "--output", help="Ergebnis zusätzlich in diese JSON-Datei schreiben")
+    parser.add_argument("--baseline", help="JSON-Datei eines früheren Laufs zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Erlaubter Rückgang der Knoten/s gegenüber --baseline in Prozent (Standard: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--parallel", type=int, default=0, metavar="N",
+                        help="Parallele Wurzelsuche mit N Arbeitsprozessen messen (Standard: 0 = Einzelprozess)")
+    parser.add_argument("--log-level", default=DEFAULT_LOG_LEVEL,
+                        help=f"Log-Stufe während der Messung (Standard: {DEFAULT_LOG_LEVEL})")
+    args = parser.parse_args(argv)
+
+    if args.depth < 1:
+        parser.error("--depth muss mindestens 1 sein")
+    if args.parallel < 0:
+        parser.error("--parallel darf nicht negativ sein")
+    positions = args.fen or BENCH_POSITIONS
+    for fen in positions:
+        try:
+            chess.Board(fen)
+        except ValueError as e:
+            parser.error(f"Ungültige FEN '{fen}': {e}")
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"Baseline konnte nicht gelesen werden: {e}")
+    try:
+        logger.set_level(args.log_level)
+    except ValueError as e:
+        parser.error(str(e))
+
+    result = run_bench(args.depth, positions, args.parallel)
+    passed = compare_to_baseline(result, baseline, args.threshold) if baseline is not None else True
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    if not passed:
+        print(f"Regression: {result['baseline']['change_percent']:+.1f}% Knoten/s "
+              f"(Schwellwert -{args.threshold:.1f}%)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support() # Für --parallel in gepackten Builds
+    sys.exit(main())
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Kommandozeilenwerkzeug zum Erstellen eines Eröffnungsbuchs (Polyglot-Format) aus PGN-Partiesammlungen.
+Die PGN-Dateien werden zeilenweise gelesen und in Blöcke zu je einigen hundert Partien zerlegt,
+ohne die Partien im Hauptprozess zu parsen. Ein Pool von Arbeitsprozessen wertet die Blöcke aus
+(Stellung + Zug bis zur maximalen Halbzugtiefe, gewichtet nach Gewinn/Remis/Niederlage), der
+Hauptprozess führt die Teilergebnisse zusammen und schreibt die .bin-Datei, die opening_book.py
+(bzw. chess.polyglot) direkt lesen kann.
+
+Aufruf z.B.:
+    python book_builder.py partien.pgn -o assets/books/eigenes.bin --max-ply 20 --min-count 3
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import os
+import time
+import io
+import struct
+import argparse
+import multiprocessing
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+import logger
+import chess
+import chess.pgn
+import chess.polyglot
+from typing import Optional, List, Tuple, Dict, Iterator
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in book_builder.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# Polyglot-Eintrag: Schlüssel (8 Byte), Zug (2), Gewicht (2), Lernwert (4), Big Endian
+_ENTRY_STRUCT = struct.Struct(">QHHI")
+_MAX_WEIGHT = 0xFFFF
+
+# --- Standardwerte der Kommandozeile ---
+DEFAULT_MAX_PLY = 20        # Nur die ersten N Halbzüge jeder Partie gehen ins Buch
+DEFAULT_MIN_COUNT = 2       # Züge, die seltener gespielt wurden, werden verworfen
+DEFAULT_CHUNK_GAMES = 500   # Partien pro Aufgabe für einen Arbeitsprozess
+DEFAULT_WEIGHTS = (2, 1, 0) # Gewicht pro Partie: Gewinn, Remis, Niederlage (aus Sicht des Ziehenden)
+
+_RESULTS = ("1-0", "0-1", "1/2-1/2")
+
+
+def encode_move(board: chess.Board, move: chess.Move) -> int:
+    """Kodiert einen Zug im Polyglot-Format (Rochade als König schlägt Turm, z.B. e1h1)."""
+    to_square = move.to_square
+    if not board.chess960 and board.is_castling(move):
+        to_square = chess.square(7 if board.is_kingside_castling(move) else 0, chess.square_rank(move.from_square))
+    promotion = move.promotion - 1 if move.promotion else 0
+    return to_square | (move.from_square << 6) | (promotion << 12)
+
+
+class _BookVisitor(chess.pgn.BaseVisitor):
+    """
+    PGN-Visitor, der nur die für das Buch nötigen Daten sammelt: Ergebnis und (Schlüssel, Zug, Farbe)
+    der ersten max_ply Halbzüge. Varianten und alle weiteren Züge werden gar nicht erst geparst.
+    """
+    def __init__(self, max_ply: int):
+        self.max_ply = max_ply
+        self.begin_game()
+
+    def begin_game(self):
+        self.game_result: Optional[str] = None
+        self.skip = False
+        self.ply = 0
+        self.entries: List[Tuple[int, int, chess.Color]] = []
+
+    def visit_header(self, tagname: str, tagvalue: str):
+        if tagname == "Result":
+            self.game_result = tagvalue
+        elif tagname == "FEN" or (tagname == "Variant" and tagvalue.lower() not in ("standard", "")):
+            self.skip = True # Nur Partien aus der Grundstellung
+
+    def end_headers(self):
+        if self.skip or self.game_result not in _RESULTS:
+            self.skip = True
+            return chess.pgn.SKIP
+        return None
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def begin_parse_san(self, board: chess.Board, san: str):
+        return chess.pgn.SKIP if self.ply >= self.max_ply else None
+
+    def visit_move(self, board: chess.Board, move: chess.Move):
+        self.entries.append((chess.polyglot.zobrist_hash(board), encode_move(board, move), board.turn))
+        self.ply += 1
+
+    def handle_error(self, error: Exception):
+        # Fehlerhafte Züge beenden die Auswertung dieser Partie; die Züge davor bleiben gültig
+        self.ply = self.max_ply
+
+    def result(self) -> Tuple[bool, Optional[str], List[Tuple[int, int, chess.Color]]]:
+        return self.skip, self.game_result, self.entries
+
+
+def _count_chunk(chunk: str, max_ply: int, weights: Tuple[int, int, int]) -> Tuple[Dict[int, int], Dict[int, int], int, int]:
+    """
+    Wertet einen Block von Partien im Arbeitsprozess aus.
+
+    Returns:
+        Tuple: (Gewichte, Anzahl Partien je Eintrag, ausgewertete Partien, übersprungene Partien).
+        Einträge sind als (Zobrist-Schlüssel << 16) | Polyglot-Zug kodiert.
+    """
+    win_weight, draw_weight, loss_weight = weights
+    entry_weights: Counter = Counter()
+    entry_counts: Counter = Counter()
+    games = skipped = 0
+    handle = io.StringIO(chunk)
+    visitor = _BookVisitor(max_ply)
+    while True:
+        try:
+            parsed = chess.pgn.read_game(handle, Visitor=lambda: visitor)
+        except Exception as e:
+            log.warning("Book builder: Error parsing game: %s", e)
+            skipped += 1
+            continue
+        if parsed is None:
+            break
+        skip, game_result, entries = parsed
+        if skip:
+            skipped += 1
+            continue
+        games += 1
+        for key, raw_move, turn in entries:
+            if game_result == "1/2-1/2":
+                weight = draw_weight
+            elif (game_result == "1-0") == (turn == chess.WHITE):
+                weight = win_weight
+            else:
+                weight = loss_weight
+            entry = (key << 16) | raw_move
+            entry_weights[entry] += weight
+            entry_counts[entry] += 1
+    return dict(entry_weights), dict(entry_counts), games, skipped
+
+
+def iter_pgn_chunks(paths: List[str], chunk_games: int) -> Iterator[str]:
+    """Liest die PGN-Dateien zeilenweise und liefert Textblöcke mit je chunk_games Partien (ohne zu parsen)."""
+    for path in paths:
+        log.info("Book builder: Reading %s", path)
+        lines: List[str] = []
+        games_in_chunk = 0
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.startswith("[Event "):
+                    if games_in_chunk >= chunk_games:
+                        yield "".join(lines)
+                        lines = []
+                        games_in_chunk = 0
+                    games_in_chunk += 1
+                lines.append(line)
+        if lines:
+            yield "".join(lines)
+
+
+def write_book(output_path: str, entry_weights: Dict[int, int], entry_counts: Dict[int, int], min_count: int) -> Tuple[int, int]:
+    """
+    Schreibt die Einträge als Polyglot-Buch (nach Schlüssel sortiert, je Stellung der stärkste Zug zuerst).
+    Gewichte werden pro Stellung so skaliert, dass sie in 16 Bit passen.
+
+    Returns:
+        Tuple[int, int]: (Anzahl der Stellungen, Anzahl der geschriebenen Einträge).
+    """
+    by_key: Dict[int, List[Tuple[int, int]]] = {}
+    for entry, weight in entry_weights.items():
+        if weight <= 0 or entry_counts.get(entry, 0) < min_count:
+            continue
+        by_key.setdefault(entry >> 16, []).append((weight, entry & 0xFFFF))
+
+    written = 0
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, 'wb') as f:
+        for key in sorted(by_key):
+            moves = sorted(by_key[key], reverse=True)
+            scale = min(1.0, _MAX_WEIGHT / moves[0][0])
+            for weight, raw_move in moves:
+                f.write(_ENTRY_STRUCT.pack(key, raw_move, max(1, int(weight * scale)), 0))
+                written += 1
+    return len(by_key), written
+
+
+def build_book(pgn_paths: List[str], output_path: str, max_ply: int = DEFAULT_MAX_PLY,
+               min_count: int = DEFAULT_MIN_COUNT, workers: int = 0,
+               chunk_games: int = DEFAULT_CHUNK_GAMES,
+               weights: Tuple[int, int, int] = DEFAULT_WEIGHTS) -> Dict[str, int]:
+    """
+    Erstellt ein Polyglot-Buch aus PGN-Dateien.
+
+    Args:
+        pgn_paths (List[str]): Die PGN-Dateien.
+        output_path (str): Zieldatei (.bin).
+        max_ply (int): Maximale Halbzugtiefe pro Partie.
+        min_count (int): Mindestanzahl Partien, in denen ein Zug gespielt wurde.
+        workers (int): Anzahl der Arbeitsprozesse (0 = alle Kerne).
+        chunk_games (int): Partien pro Aufgabe.
+        weights (Tuple[int, int, int]): Gewicht für Gewinn, Remis und Niederlage des Ziehenden.
+
+    Returns:
+        Dict[str, int]: Statistik (Partien, übersprungene Partien, Positionen, geschriebene Einträge).
+    """
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    start_time = time.monotonic()
+    entry_weights: Counter = Counter()
+    entry_counts: Counter = Counter()
+    stats = {'games': 0, 'skipped': 0}
+
+    def merge(future: concurrent.futures.Future):
+        chunk_weights, chunk_counts, games, skipped = future.result()
+        entry_weights.update(chunk_weights)
+        entry_counts.update(chunk_counts)
+        stats['games'] += games
+        stats['skipped'] += skipped
+
+    log.info("Book builder: %d file(s) -> %s (Max Ply: %d, Min Count: %d, Workers: %d)",
+             len(pgn_paths), output_path, max_ply, min_count, workers)
+    context = multiprocessing.get_context('spawn')
+    # Arbeitsprozesse loggen über den Hauptprozess (nur er schreibt und rotiert die Logdatei)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=logger.init_worker,
+                             initargs=(logger.get_process_queue(context), logger.get_level())) as pool:
+        pending = set()
+        for chunk in iter_pgn_chunks(pgn_paths, chunk_games):
+            pending.add(pool.submit(_count_chunk, chunk, max_ply, weights))
+            # Nur wenige Blöcke gleichzeitig im Speicher halten (Streaming auch bei sehr großen Dateien)
+            if len(pending) >= workers * 2:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    merge(future)
+                print(f"\r{stats['games']} Partien ausgewertet ...", end="", flush=True)
+        for future in concurrent.futures.as_completed(pending):
+            merge(future)
+
+    stats['positions'], stats['entries'] = write_book(output_path, entry_weights, entry_counts, min_count)
+    log.info("Book builder finished in %.1f s: %s", time.monotonic() - start_time, stats)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Einstiegspunkt der Kommandozeile."""
+    parser = argparse.ArgumentParser(description="Erstellt ein Polyglot-Eröffnungsbuch aus PGN-Dateien.")
+    parser.add_argument("pgn", nargs="+", help="PGN-Datei(en) mit Partien")
+    parser.add_argument("-o", "--output", required=True, help="Zieldatei (.bin)")
+    parser.add_argument("--max-ply", type=int, default=DEFAULT_MAX_PLY,
+                        help=f"Maximale Halbzugtiefe pro Partie (Standard: {DEFAULT_MAX_PLY})")
+    parser.add_argument("--min-count", type=int, default=DEFAULT_MIN_COUNT,
+                        help=f"Mindestanzahl Partien pro Zug (Standard: {DEFAULT_MIN_COUNT})")
+    parser.add_argument("--workers", type=int, default=0, help="Anzahl Arbeitsprozesse (Standard: alle Kerne)")
+    parser.add_argument("--chunk-games", type=int, default=DEFAULT_CHUNK_GAMES,
+                        help=f"Partien pro Aufgabe (Standard: {DEFAULT_CHUNK_GAMES})")
+    parser.add_argument("--weights", type=int, nargs=3, default=list(DEFAULT_WEIGHTS), metavar=("GEWINN", "REMIS", "NIEDERLAGE"),
+                        help="Gewicht je Partie aus Sicht des Ziehenden (Standard: 2 1 0)")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.pgn if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"PGN-Datei(en) nicht gefunden: {', '.join(missing)}")
+    stats = build_book(args.pgn, args.output, max_ply=args.max_ply, min_count=args.min_count,
+                       workers=args.workers, chunk_games=args.chunk_games, weights=tuple(args.weights))
+    print(f"\r{stats['games']} Partien ausgewertet ({stats['skipped']} übersprungen), "
+          f"{stats['positions']} Stellungen, {stats['entries']} Einträge -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -3,7 +3,7 @@
 """
 Konfigurationsdatei für das PyChess-Spiel.
 Enthält Konstanten für Fenstergröße, Farben, Schriftarten, Pfade,
-Spiel-Logik, KI-Einstellungen und mehr.
+Spiel-Logik, KI-Einstellungen (aus engine_config.py) und mehr.
 Initialisiert auch Pygame-Module wie font und lädt Ressourcen.
 """
 import pygame
@@ -29,8 +29,35 @@ log.info("<--- ==================== Starte Modul '%s' ==================== --->"
 DEBUG_MODE = False # Zusätzliche Log-Ausgaben (DEBUG Level) aktivieren?
 log.info("Debug Mode: %s", {"eingeschaltet" if DEBUG_MODE else "ausgeschaltet"})
 
+# --- Log-Stufe ---
+# Gilt für alle Module. 'DEBUG' protokolliert alles (Entwicklung), 'WARNING' ist die Stufe für den
+# Produktivbetrieb: Die Suche der KI ist dann unabhängig vom Umfang der Protokollierung.
+# Die Umgebungsvariable PYCHESS_LOG_LEVEL überschreibt den Wert.
+LOG_LEVEL = os.environ.get('PYCHESS_LOG_LEVEL', 'DEBUG')
+try:
+    logger.set_level(LOG_LEVEL)
+except ValueError as e:
+    log.error("Invalid LOG_LEVEL '%s': %s. Keeping DEBUG.", LOG_LEVEL, e)
+    LOG_LEVEL = 'DEBUG'
+log.info("Log Level: %s", LOG_LEVEL)
+# Log-Einträge werden von einem Hintergrund-Thread gesammelt geschrieben (siehe logger.py):
+# höchstens alle LOG_FLUSH_INTERVAL_MS Millisekunden bzw. LOG_BATCH_SIZE Einträge pro Schreibvorgang.
+# Ist die Queue (LOG_QUEUE_SIZE Einträge) voll, werden neue Einträge verworfen und gezählt, statt zu blockieren.
+LOG_FLUSH_INTERVAL_MS = 500
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 256
+logger.configure(flush_interval_ms=LOG_FLUSH_INTERVAL_MS, queue_size=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE)
+log.info("Log Writer: Flush interval %d ms, queue size %d, batch size %d", LOG_FLUSH_INTERVAL_MS, LOG_QUEUE_SIZE, LOG_BATCH_SIZE)
+
 TARGET_FPS = 60
 log.info("Target FPS set to: %d", TARGET_FPS)
+# Leerlauf im Spielzustand: Ohne Animation wartet die Hauptschleife blockierend auf das nächste Ereignis,
+# höchstens bis zur nächsten Anzeigeänderung (Timer-Sekunde, Blinkphase, Ablauf einer Statusnachricht).
+# Während die KI rechnet, wird ihr Fortschritt alle AI_PROGRESS_POLL_MS abgefragt; ihr Zug weckt die Schleife sofort.
+IDLE_WAIT_ENABLED = True
+IDLE_MAX_WAIT_MS = 1000
+AI_PROGRESS_POLL_MS = 100
+log.info("Idle wait: %s (max. %d ms, AI progress poll %d ms)", IDLE_WAIT_ENABLED, IDLE_MAX_WAIT_MS, AI_PROGRESS_POLL_MS)
 
 # -- Grundlegende Fenster- und Brett-Einstellungen --
 WIDTH = 800      # Breite des Hauptfensters in Pixeln
@@ -81,18 +108,6 @@ SAVE_DIR = os.path.join(BASE_DIR, 'saves')       # Verzeichnis für Speicherstä
 log.info("Assets Directory: %s", ASSETS_DIR)
 log.info("Save Directory: %s", SAVE_DIR)
 
-
-# Pfad zum Standard-Eröffnungsbuch (Polyglot-Format)
-POLYGLOT_BOOK_PATH = os.path.join(BOOK_DIR, 'human.bin')
-# POLYGLOT_BOOK_PATH = "" # Deaktivieren, wenn kein Buch verwendet wird
-log.info("Polyglot Book Path: %s", POLYGLOT_BOOK_PATH if POLYGLOT_BOOK_PATH else "Disabled")
-
-# Pfad zu den Syzygy-Endspieldatenbanken (optional)
-SYZYGY_PATH = "" # Standardmäßig deaktiviert
-SYZYGY_MAX_PIECES = 7 # Maximale Anzahl Figuren für Syzygy-Nutzung
-log.info("Syzygy Path: %s", SYZYGY_PATH if SYZYGY_PATH else "Disabled")
-if SYZYGY_PATH: log.info("Syzygy Max Pieces: %d", SYZYGY_MAX_PIECES)
-
 # --- Speicherformat Version ---
 # Wird in die Speicherdatei geschrieben, um Kompatibilität zu prüfen
 SAVE_FORMAT_VERSION = "1.0"
@@ -406,25 +421,17 @@ log.info("Highlight Legal Moves: %s", HIGHLIGHT_LEGAL_MOVES)
 log.info("Flip Board Automatically: %s", FLIP_BOARD_AUTOMATICALLY)
 
 # --- KI-Einstellungen ---
+# Such- und Bewertungsparameter der KI stehen in engine_config.py (ohne pygame, auch für uci.py) und
+# werden hier re-exportiert. Zur Laufzeit geänderte Werte (z.B. AI_DEPTH) in engine_config setzen!
+from engine_config import *
 AI_ENABLED = True           # Ist die KI standardmäßig aktiviert? (wird im Menü gesetzt)
 AI_PLAYER = chess.BLACK     # Welche Farbe spielt die KI standardmäßig? (wird im Menü gesetzt)
-AI_DEPTH = 2                # Suchtiefe für die Minimax-KI
-# Einstellungen für Hintergrund-KI (Neu)
 BACKGROUND_AI_DEPTH = 1     # Geringe Tiefe oder Zufallszüge für Hintergrundspiel
 BACKGROUND_AI_MOVE_DELAY = 2000 # Millisekunden zwischen Zügen im Hintergrundspiel
 log.info("Default AI Settings: Enabled=%s, Player=%s, Depth=%d", AI_ENABLED, "Black" if AI_PLAYER == chess.BLACK else "White", AI_DEPTH)
 log.info("Background AI Settings: Depth=%d, Delay=%d ms", BACKGROUND_AI_DEPTH, BACKGROUND_AI_MOVE_DELAY)
 
 
-# Werte für die Materialbewertung
-PIECE_VALUES = {
-    chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330,
-    chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 20000
-}
-CHECKMATE = 100000 # Sehr hoher Wert für Schachmatt
-STALEMATE = 0      # Wert für Patt
-log.info("Piece Values: %s", PIECE_VALUES)
-log.info("Checkmate Score: %d, Stalemate Score: %d", CHECKMATE, STALEMATE)
 
 # --- Text-to-Speech (TTS) Einstellungen ---
 ENABLE_TTS = False          # Generelle Aktivierung von TTS
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul stellt die Syzygy-Endspieldatenbanken (engine_config.SYZYGY_PATH) für die KI bereit.
+Die Datenbank wird einmal für die gesamte Laufzeit des Prozesses geöffnet; die Ergebnisse von
+WDL- und DTZ-Abfragen werden in einem LRU-Cache (Schlüssel: Zobrist-Hash) gehalten.
+choose_move() wählt an der Wurzel den Zug anhand von WDL und DTZ, damit gewonnene Endspiele
+tatsächlich verwandelt werden; probe_wdl() liefert der Suche exakte Bewertungen für Stellungen
+mit höchstens probe_limit Steinen.
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import random
+import threading
+from collections import OrderedDict
+import logger
+import chess
+import chess.polyglot
+import chess.syzygy
+import engine_config
+from typing import Optional, List, Tuple
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in endgame_tablebase.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Datenbank-Zustand (einmal pro Prozess geöffnet) ---
+_tablebase: Optional[chess.syzygy.Tablebase] = None
+_tablebase_path: Optional[str] = None  # Pfad der geöffneten Datenbank (None = noch nicht geöffnet)
+_open_lock = threading.Lock()
+# Höchste Steinanzahl, für die abgefragt wird (0 = keine Datenbank verfügbar).
+# Die Suche prüft diesen Wert direkt, bevor sie probe_wdl() aufruft.
+probe_limit: int = 0
+
+# --- LRU-Caches der Abfrageergebnisse (Schlüssel: Zobrist-Hash) ---
+_wdl_cache: "OrderedDict[int, Optional[int]]" = OrderedDict()
+_dtz_cache: "OrderedDict[int, Optional[int]]" = OrderedDict()
+_cache_hits: int = 0
+_cache_misses: int = 0
+
+
+def open_tablebase(path: Optional[str] = None) -> Optional[chess.syzygy.Tablebase]:
+    """
+    Öffnet die Endspieldatenbank (nur beim ersten Aufruf bzw. bei geändertem Pfad).
+
+    Args:
+        path (str, optional): Verzeichnis der Syzygy-Dateien; Standard: engine_config.SYZYGY_PATH.
+
+    Returns:
+        chess.syzygy.Tablebase | None: Die geöffnete Datenbank oder None, wenn keine verfügbar ist.
+    """
+    global _tablebase, _tablebase_path, probe_limit
+    path = engine_config.SYZYGY_PATH if path is None else path
+    if not path:
+        return None
+    with _open_lock:
+        if _tablebase_path == path:
+            return _tablebase
+        close()
+        _tablebase_path = path
+        try:
+            tablebase = chess.syzygy.open_tablebase(path)
+        except FileNotFoundError:
+            log.warning("Syzygy endgame tablebase path not found: %s", path)
+            return None
+        except Exception as e:
+            log.error("Error opening Syzygy endgame tablebase %s: %s", path, e, exc_info=True)
+            return None
+        if not tablebase.wdl:
+            log.warning("No Syzygy WDL tables found in: %s", path)
+            tablebase.close()
+            return None
+        # Tabellennamen wie "KQvKR": Anzahl der Buchstaben ohne "v" = Anzahl der Steine
+        max_pieces = max(len(name) - 1 for name in tablebase.wdl)
+        _tablebase = tablebase
+        probe_limit = min(engine_config.SYZYGY_MAX_PIECES, max_pieces)
+        log.info("Syzygy endgame tablebase opened: %s (%d WDL / %d DTZ tables, up to %d pieces).",
+                 path, len(tablebase.wdl), len(tablebase.dtz), probe_limit)
+        return _tablebase
+
+def close():
+    """Schließt die Endspieldatenbank und leert die Caches (z.B. beim Programmende)."""
+    global _tablebase, _tablebase_path, probe_limit
+    if _tablebase is not None:
+        log.info("Closing Syzygy endgame tablebase (Cache hits: %d, misses: %d).", _cache_hits, _cache_misses)
+        _tablebase.close()
+    _tablebase = None
+    _tablebase_path = None
+    probe_limit = 0
+    _wdl_cache.clear()
+    _dtz_cache.clear()
+
+def is_applicable(board: chess.Board) -> bool:
+    """Gibt zurück, ob die Stellung in der Datenbank stehen kann (Steinanzahl, keine Rochaderechte)."""
+    return chess.popcount(board.occupied) <= probe_limit and not board.castling_rights
+
+
+def _cached_probe(cache: OrderedDict, board: chess.Board, dtz: bool) -> Optional[int]:
+    """Fragt WDL bzw. DTZ ab und merkt sich das Ergebnis im LRU-Cache (ältester Eintrag fliegt zuerst)."""
+    global _cache_hits, _cache_misses
+    key = chess.polyglot.zobrist_hash(board)
+    if key in cache:
+        cache.move_to_end(key)
+        _cache_hits += 1
+        return cache[key]
+    _cache_misses += 1
+    try:
+        result = _tablebase.get_dtz(board) if dtz else _tablebase.get_wdl(board)
+    except Exception as e:
+        log.error("Error probing Syzygy %s for FEN %s: %s", "DTZ" if dtz else "WDL", board.fen(), e, exc_info=True)
+        result = None
+    cache[key] = result
+    if len(cache) > engine_config.SYZYGY_CACHE_SIZE:
+        cache.popitem(last=False)
+    return result
+
+def probe_wdl(board: chess.Board) -> Optional[int]:
+    """
+    WDL-Wert der Stellung aus Sicht der Seite am Zug (2 Gewinn, 1 Gewinn nach 50-Züge-Regel verspielt,
+    0 Remis, -1 gerettete Niederlage, -2 Niederlage) oder None, wenn die Stellung nicht abgedeckt ist.
+    """
+    if _tablebase is None or not is_applicable(board):
+        return None
+    return _cached_probe(_wdl_cache, board, dtz=False)
+
+def probe_dtz(board: chess.Board) -> Optional[int]:
+    """DTZ-Wert (Halbzüge bis zum nächsten Schlag-/Bauernzug bei bestem Spiel) aus Sicht der Seite am Zug oder None."""
+    if _tablebase is None or not is_applicable(board):
+        return None
+    return _cached_probe(_dtz_cache, board, dtz=True)
+
+
+def choose_move(board: chess.Board, valid_moves: List[chess.Move]) -> Optional[Tuple[chess.Move, int]]:
+    """
+    Wählt an der Wurzel den Zug mit dem besten WDL-Wert; DTZ entscheidet zwischen gleich bewerteten Zügen:
+    Im Gewinn zuerst Matt, dann Schlag-/Bauernzüge (setzen die 50-Züge-Zählung zurück), dann der kürzeste
+    Weg zur nächsten Umwandlung; in Verluststellungen der längste Widerstand.
+
+    Returns:
+        Tuple[chess.Move, int] | None: (Zug, WDL aus Sicht der Seite am Zug) oder None, wenn die
+        Stellung nicht abgedeckt ist.
+    """
+    if open_tablebase() is None or not is_applicable(board):
+        return None
+    best_key = None
+    best_moves: List[chess.Move] = []
+    best_wdl = -3
+    for move in valid_moves:
+        zeroing = board.is_zeroing(move)
+        board.push(move)
+        try:
+            if board.is_checkmate():
+                wdl, dtz_opponent, mate = 2, 0, True
+            else:
+                wdl_opponent = probe_wdl(board)
+                if wdl_opponent is None:
+                    continue
+                wdl, mate = -wdl_opponent, False
+                dtz_opponent = probe_dtz(board) if wdl != 0 else 0
+                if dtz_opponent is None:
+                    dtz_opponent = 0
+        finally:
+            board.pop()
+        if wdl > 0:
+            key = (wdl, mate, zeroing, -abs(dtz_opponent))
+        elif wdl < 0:
+            key = (wdl, False, False, abs(dtz_opponent))
+        else:
+            key = (wdl, False, False, 0)
+        if best_key is None or key > best_key:
+            best_key, best_moves, best_wdl = key, [move], wdl
+        elif key == best_key:
+            best_moves.append(move)
+    if not best_moves:
+        return None
+    move = random.choice(best_moves)
+    log.debug("Syzygy root choice: %s (WDL: %d, Key: %s, Candidates: %d)", move.uci(), best_wdl, best_key, len(best_moves))
+    return move, best_wdl
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# Dateiname: PyChess/engine_config.py
+"""
+Konfiguration der Schach-Engine (KI-Suche, Bewertung, Eröffnungsbuch, Endspieldatenbanken).
+Importiert weder pygame noch Schriftarten, Bilder, Sounds oder Tolk, damit die Engine auch ohne
+Anzeige läuft (uci.py, bench.py, perft.py, Arbeitsprozesse der parallelen Suche).
+config.py re-exportiert alle Werte für die GUI; Änderungen zur Laufzeit hier vornehmen.
+"""
+import chess # Wird für chess.PAWN usw. in den Bewertungstabellen benötigt
+import os
+import logger, logging
+import sys # Für kritische Fehler
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in engine_config.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Verzeichnisse (config.py definiert die vollständigen Pfade der GUI) ---
+_BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'books')
+
+# Pfad zum Standard-Eröffnungsbuch (Polyglot-Format)
+POLYGLOT_BOOK_PATH = os.path.join(_BOOK_DIR, 'human.bin')
+# POLYGLOT_BOOK_PATH = "" # Deaktivieren, wenn kein Buch verwendet wird
+log.info("Polyglot Book Path: %s", POLYGLOT_BOOK_PATH if POLYGLOT_BOOK_PATH else "Disabled")
+
+# Pfad zu den Syzygy-Endspieldatenbanken (optional)
+SYZYGY_PATH = "" # Standardmäßig deaktiviert
+SYZYGY_MAX_PIECES = 7 # Maximale Anzahl Figuren für Syzygy-Nutzung
+SYZYGY_CACHE_SIZE = 100000 # Anzahl gecachter WDL-/DTZ-Abfrageergebnisse (je LRU-Cache)
+SYZYGY_PROBE_IN_SEARCH = True # Datenbank auch innerhalb der Suche als exakte Bewertung nutzen
+log.info("Syzygy Path: %s", SYZYGY_PATH if SYZYGY_PATH else "Disabled")
+if SYZYGY_PATH: log.info("Syzygy Max Pieces: %d, Cache Size: %d, Probe in Search: %s", SYZYGY_MAX_PIECES, SYZYGY_CACHE_SIZE, SYZYGY_PROBE_IN_SEARCH)
+
+# --- KI-Einstellungen ---
+AI_DEPTH = 2                # Suchtiefe für die Negamax-KI
+# Iterative Vertiefung: Suche Tiefe 1, 2, 3, ... bis das Zeitbudget aufgebraucht ist
+AI_USE_ITERATIVE_DEEPENING = True # False = feste Suche mit AI_DEPTH
+AI_TIME_BUDGET_MS = 3000    # Bedenkzeit der KI pro Zug in Millisekunden
+AI_MAX_DEPTH = 8            # Obergrenze für die iterative Vertiefung
+AI_PROGRESS_INTERVAL_MS = 250 # Mindestabstand der Fortschrittsmeldungen der Suche (Statuszeile)
+AI_PONDER_ENABLED = True    # Während der Bedenkzeit des Spielers die erwartete Antwort vorausberechnen
+log.info("Iterative Deepening: Enabled=%s, Time Budget=%d ms, Max Depth=%d", AI_USE_ITERATIVE_DEEPENING, AI_TIME_BUDGET_MS, AI_MAX_DEPTH)
+log.info("Pondering: Enabled=%s", AI_PONDER_ENABLED)
+
+# Transpositionstabelle (bleibt zwischen den Zügen einer Partie erhalten)
+TT_ENABLED = True           # Transpositionstabelle in der Suche verwenden?
+TT_SIZE_MB = 32             # Speicherobergrenze der Tabelle in Megabyte
+TT_REPLACEMENT_POLICY = 'depth' # 'depth' (tiefere Einträge bevorzugt) oder 'always' (immer ersetzen)
+log.info("Transposition Table: Enabled=%s, Size=%d MB, Replacement=%s", TT_ENABLED, TT_SIZE_MB, TT_REPLACEMENT_POLICY)
+
+# Parallele Suche: Wurzelzüge werden auf mehrere Prozesse verteilt (nur mit iterativer Vertiefung)
+# Standardmäßig aus, bis "python bench.py --parallel N" gegenüber dem Lauf ohne --parallel eine echte Beschleunigung zeigt
+AI_PARALLEL_ENABLED = False # False = Suche nur im KI-Thread (ein Prozessorkern)
+AI_PARALLEL_WORKERS = 0     # Anzahl der Arbeitsprozesse; 0 = alle Kerne außer einem
+log.info("Parallel Search: Enabled=%s, Workers=%s", AI_PARALLEL_ENABLED, AI_PARALLEL_WORKERS or "auto")
+
+# Ruhesuche (Quiescence Search) am Suchhorizont: Schlagfolgen werden zu Ende gerechnet
+QUIESCENCE_ENABLED = True          # False = Bewertung direkt am Horizont (Horizonteffekt!)
+QUIESCENCE_INCLUDE_CHECKS = False  # Auf der ersten Ebene der Ruhesuche auch Schachgebote untersuchen?
+QUIESCENCE_MAX_NODES = 2000        # Knotenlimit pro Ruhesuche (ab einem Horizontknoten), verhindert Explosion
+QUIESCENCE_DELTA_MARGIN = 200      # Sicherheitsmarge für Delta Pruning in Zentibauern
+log.info("Quiescence Search: Enabled=%s, Checks=%s, Max Nodes=%d, Delta Margin=%d",
+         QUIESCENCE_ENABLED, QUIESCENCE_INCLUDE_CHECKS, QUIESCENCE_MAX_NODES, QUIESCENCE_DELTA_MARGIN)
+
+
+# Werte für die Materialbewertung
+PIECE_VALUES = {
+    chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330,
+    chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 20000
+}
+CHECKMATE = 100000 # Sehr hoher Wert für Schachmatt
+STALEMATE = 0      # Wert für Patt
+log.info("Piece Values: %s", PIECE_VALUES)
+log.info("Checkmate Score: %d, Stalemate Score: %d", CHECKMATE, STALEMATE)
+
+# Figur-Feld-Tabellen (Piece-Square Tables) für Mittel- und Endspiel, Werte in Zentibauern.
+# Darstellung aus Sicht von Weiß mit Reihe 8 oben (wie ein Diagramm): Index 0 = a8, Index 63 = h1.
+# Für Weiß wird mit (Feld ^ 56) indiziert, für Schwarz direkt mit dem Feld (gespiegelt).
+# Werte nach den PeSTO-Tabellen (Chess Programming Wiki).
+PST_MIDGAME = {
+    chess.PAWN: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+         98, 134,  61,  95,  68, 126,  34, -11,
+         -6,   7,  26,  31,  65,  56,  25, -20,
+        -14,  13,   6,  21,  23,  12,  17, -23,
+        -27,  -2,  -5,  12,  17,   6,  10, -25,
+        -26,  -4,  -4, -10,   3,   3,  33, -12,
+        -35,  -1, -20, -23, -15,  24,  38, -22,
+          0,   0,   0,   0,   0,   0,   0,   0,
+    ],
+    chess.KNIGHT: [
+       -167, -89, -34, -49,  61, -97, -15,-107,
+        -73, -41,  72,  36,  23,  62,   7, -17,
+        -47,  60,  37,  65,  84, 129,  73,  44,
+         -9,  17,  19,  53,  37,  69,  18,  22,
+        -13,   4,  16,  13,  28,  19,  21,  -8,
+        -23,  -9,  12,  10,  19,  17,  25, -16,
+        -29, -53, -12,  -3,  -1,  18, -14, -19,
+       -105, -21, -58, -33, -17, -28, -19, -23,
+    ],
+    chess.BISHOP: [
+        -29,   4, -82, -37, -25, -42,   7,  -8,
+        -26,  16, -18, -13,  30,  59,  18, -47,
+        -16,  37,  43,  40,  35,  50,  37,  -2,
+         -4,   5,  19,  50,  37,  37,   7,  -2,
+         -6,  13,  13,  26,  34,  12,  10,   4,
+          0,  15,  15,  15,  14,  27,  18,  10,
+          4,  15,  16,   0,   7,  21,  33,   1,
+        -33,  -3, -14, -21, -13, -12, -39, -21,
+    ],
+    chess.ROOK: [
+         32,  42,  32,  51,  63,   9,  31,  43,
+         27,  32,  58,  62,  80,  67,  26,  44,
+         -5,  19,  26,  36,  17,  45,  61,  16,
+        -24, -11,   7,  26,  24,  35,  -8, -20,
+        -36, -26, -12,  -1,   9,  -7,   6, -23,
+        -45, -25, -16, -17,   3,   0,  -5, -33,
+        -44, -16, -20,  -9,  -1,  11,  -6, -71,
+        -19, -13,   1,  17,  16,   7, -37, -26,
+    ],
+    chess.QUEEN: [
+        -28,   0,  29,  12,  59,  44,  43,  45,
+        -24, -39,  -5,   1, -16,  57,  28,  54,
+        -13, -17,   7,   8,  29,  56,  47,  57,
+        -27, -27, -16, -16,  -1,  17,  -2,   1,
+         -9, -26,  -9, -10,  -2,  -4,   3,  -3,
+        -14,   2, -11,  -2,  -5,   2,  14,   5,
+        -35,  -8,  11,   2,   8,  15,  -3,   1,
+         -1, -18,  -9,  10, -15, -25, -31, -50,
+    ],
+    chess.KING: [
+        -65,  23,  16, -15, -56, -34,   2,  13,
+         29,  -1, -20,  -7,  -8,  -4, -38, -29,
+         -9,  24,   2, -16, -20,   6,  22, -22,
+        -17, -20, -12, -27, -30, -25, -14, -36,
+        -49,  -1, -27, -39, -46, -44, -33, -51,
+        -14, -14, -22, -46, -44, -30, -15, -27,
+          1,   7,  -8, -64, -43, -16,   9,   8,
+        -15,  36,  12, -54,   8, -28,  24,  14,
+    ],
+}
+PST_ENDGAME = {
+    chess.PAWN: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+        178, 173, 158, 134, 147, 132, 165, 187,
+         94, 100,  85,  67,  56,  53,  82,  84,
+         32,  24,  13,   5,  -2,   4,  17,  17,
+         13,   9,  -3,  -7,  -7,  -8,   3,  -1,
+          4,   7,  -6,   1,   0,  -5,  -1,  -8,
+         13,   8,   8,  10,  13,   0,   2,  -7,
+          0,   0,   0,   0,   0,   0,   0,   0,
+    ],
+    chess.KNIGHT: [
+        -58, -38, -13, -28, -31, -27, -63, -99,
+        -25,  -8, -25,  -2,  -9, -25, -24, -52,
+        -24, -20,  10,   9,  -1,  -9, -19, -41,
+        -17,   3,  22,  22,  22,  11,   8, -18,
+        -18,  -6,  16,  25,  16,  17,   4, -18,
+        -23,  -3,  -1,  15,  10,  -3, -20, -22,
+        -42, -20, -10,  -5,  -2, -20, -23, -44,
+        -29, -51, -23, -15, -22, -18, -50, -64,
+    ],
+    chess.BISHOP: [
+        -14, -21, -11,  -8,  -7,  -9, -17, -24,
+         -8,  -4,   7, -12,  -3, -13,  -4, -14,
+          2,  -8,   0,  -1,  -2,   6,   0,   4,
+         -3,   9,  12,   9,  14,  10,   3,   2,
+         -6,   3,  13,  19,   7,  10,  -3,  -9,
+        -12,  -3,   8,  10,  13,   3,  -7, -15,
+        -14, -18,  -7,  -1,   4,  -9, -15, -27,
+        -23,  -9, -23,  -5,  -9, -16,  -5, -17,
+    ],
+    chess.ROOK: [
+         13,  10,  18,  15,  12,  12,   8,   5,
+         11,  13,  13,  11,  -3,   3,   8,   3,
+          7,   7,   7,   5,   4,  -3,  -5,  -3,
+          4,   3,  13,   1,   2,   1,  -1,   2,
+          3,   5,   8,   4,  -5,  -6,  -8, -11,
+         -4,   0,  -5,  -1,  -7, -12,  -8, -16,
+         -6,  -6,   0,   2,  -9,  -9, -11,  -3,
+         -9,   2,   3,  -1,  -5, -13,   4, -20,
+    ],
+    chess.QUEEN: [
+         -9,  22,  22,  27,  27,  19,  10,  20,
+        -17,  20,  32,  41,  58,  25,  30,   0,
+        -20,   6,   9,  49,  47,  35,  19,   9,
+          3,  22,  24,  45,  57,  40,  57,  36,
+        -18,  28,  19,  47,  31,  34,  39,  23,
+        -16, -27,  15,   6,   9,  17,  10,   5,
+        -22, -23, -30, -16, -16, -23, -36, -32,
+        -33, -28, -22, -43,  -5, -32, -20, -41,
+    ],
+    chess.KING: [
+        -74, -35, -18, -18, -11,  15,   4, -17,
+        -12,  17,  14,  17,  17,  38,  23,  11,
+         10,  17,  23,  15,  20,  45,  44,  13,
+         -8,  22,  24,  27,  26,  33,  26,   3,
+        -18,  -4,  21,  24,  27,  23,   9, -11,
+        -19,  -3,  11,  21,  23,  16,   7,  -9,
+        -27, -11,   4,  13,  14,   4,  -5, -17,
+        -53, -34, -21, -11, -28, -14, -24, -43,
+    ],
+}
+# Spielphase: Gewicht jeder Figur (Summe aller Figuren der Grundstellung = GAME_PHASE_MAX).
+# Phase GAME_PHASE_MAX = reines Mittelspiel, 0 = reines Endspiel; dazwischen wird interpoliert.
+GAME_PHASE_WEIGHTS = {chess.PAWN: 0, chess.KNIGHT: 1, chess.BISHOP: 1, chess.ROOK: 2, chess.QUEEN: 4, chess.KING: 0}
+GAME_PHASE_MAX = 24
+EVAL_USE_PST = True # False = reine Materialbewertung
+log.info("Evaluation: PST=%s, Game Phase Max=%d", EVAL_USE_PST, GAME_PHASE_MAX)
+
+# Nur die Einstellungen (Großbuchstaben) werden von config.py per "from engine_config import *" übernommen
+__all__ = [name for name in dir() if name.isupper() and not name.startswith('_')]
+
+log.info("%s loading complete.", __name__)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul enthält die Stellungsbewertung der Schach-KI: Material plus
+Figur-Feld-Tabellen (engine_config.PST_MIDGAME / engine_config.PST_ENDGAME), zwischen Mittel- und
+Endspiel nach der Spielphase interpoliert ("tapered eval").
+Der IncrementalEvaluator führt die Bewertung bei jedem Zug (push) und jeder Zugrücknahme (pop)
+inkrementell mit, sodass die Bewertung eines Blattknotens O(1) statt O(64) kostet.
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import logger
+import chess
+import engine_config
+from typing import Optional, List, Tuple
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in evaluation.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# Einstellungen von engine_config, nach deren Änderung rebuild_tables() aufgerufen werden muss
+EVAL_SETTINGS = ('PIECE_VALUES', 'PST_MIDGAME', 'PST_ENDGAME', 'GAME_PHASE_WEIGHTS', 'GAME_PHASE_MAX', 'EVAL_USE_PST')
+
+def _build_tables(pst: dict) -> List[List[List[int]]]:
+    """
+    Kombiniert Materialwert und Figur-Feld-Tabelle zu einer Nachschlagetabelle
+    [Farbe][Figurentyp][Feld] mit Vorzeichen aus Sicht von Weiß.
+    Der Königswert fließt nicht ein (beide Könige stehen immer auf dem Brett).
+    """
+    tables = [[[0] * 64 for _ in range(7)] for _ in range(2)]
+    for piece_type in chess.PIECE_TYPES:
+        material = engine_config.PIECE_VALUES.get(piece_type, 0) if piece_type != chess.KING else 0
+        piece_table = pst.get(piece_type) if engine_config.EVAL_USE_PST else None
+        for square in chess.SQUARES:
+            # Tabellen sind mit a8 = Index 0 notiert: Weiß wird gespiegelt, Schwarz direkt indiziert
+            white_bonus = piece_table[square ^ 56] if piece_table else 0
+            black_bonus = piece_table[square] if piece_table else 0
+            tables[chess.WHITE][piece_type][square] = material + white_bonus
+            tables[chess.BLACK][piece_type][square] = -(material + black_bonus)
+    return tables
+
+# Vorberechnete Tabellen: _MG/_EG[Farbe][Figurentyp][Feld]
+_MG = _build_tables(engine_config.PST_MIDGAME)
+_EG = _build_tables(engine_config.PST_ENDGAME)
+_PHASE = [0] + [engine_config.GAME_PHASE_WEIGHTS.get(pt, 0) for pt in chess.PIECE_TYPES]
+_PHASE_MAX = engine_config.GAME_PHASE_MAX
+
+def rebuild_tables():
+    """
+    Baut die vorberechneten Tabellen nach einer Änderung von engine_config neu auf
+    (PIECE_VALUES, PST_*, GAME_PHASE_*, EVAL_USE_PST), z.B. für Engine-Vergleiche in tournament.py.
+    Laufende IncrementalEvaluator-Objekte müssen danach mit reset() neu berechnet werden.
+    """
+    global _MG, _EG, _PHASE, _PHASE_MAX
+    _MG = _build_tables(engine_config.PST_MIDGAME)
+    _EG = _build_tables(engine_config.PST_ENDGAME)
+    _PHASE = [0] + [engine_config.GAME_PHASE_WEIGHTS.get(pt, 0) for pt in chess.PIECE_TYPES]
+    _PHASE_MAX = engine_config.GAME_PHASE_MAX
+    log.info("Evaluation tables rebuilt (PST=%s, Game Phase Max=%d).", engine_config.EVAL_USE_PST, _PHASE_MAX)
+
+
+def _taper(mg: int, eg: int, phase: int) -> int:
+    """Interpoliert zwischen Mittel- und Endspielbewertung anhand der Spielphase."""
+    phase = min(phase, _PHASE_MAX)
+    return (mg * phase + eg * (_PHASE_MAX - phase)) // _PHASE_MAX
+
+def compute_terms(board: chess.Board) -> Tuple[int, int, int]:
+    """Berechnet Mittelspiel-, Endspielbewertung (Sicht Weiß) und Spielphase vollständig neu."""
+    mg = eg = phase = 0
+    for square, piece in board.piece_map().items():
+        mg += _MG[piece.color][piece.piece_type][square]
+        eg += _EG[piece.color][piece.piece_type][square]
+        phase += _PHASE[piece.piece_type]
+    return mg, eg, phase
+
+def evaluate(board: chess.Board) -> int:
+    """Bewertet die Stellung (Material + Figur-Feld-Tabellen) aus Sicht von Weiß, ohne Spielende-Prüfung."""
+    return _taper(*compute_terms(board))
+
+
+class IncrementalEvaluator:
+    """
+    Führt die Bewertung während der Suche inkrementell mit.
+    Züge müssen über push()/pop() dieses Objekts ausgeführt werden, damit Brett und Bewertung
+    synchron bleiben.
+
+    Attributes:
+        mg (int): Mittelspielbewertung aus Sicht von Weiß.
+        eg (int): Endspielbewertung aus Sicht von Weiß.
+        phase (int): Spielphase (GAME_PHASE_MAX = Mittelspiel, 0 = Endspiel).
+    """
+    __slots__ = ('mg', 'eg', 'phase', '_stack')
+
+    def __init__(self, board: Optional[chess.Board] = None):
+        self.mg = 0
+        self.eg = 0
+        self.phase = 0
+        self._stack: List[Tuple[int, int, int]] = []
+        if board is not None:
+            self.reset(board)
+
+    def reset(self, board: chess.Board):
+        """Berechnet die Bewertung für die gegebene Stellung neu (einmal pro Suche)."""
+        self.mg, self.eg, self.phase = compute_terms(board)
+        self._stack.clear()
+
+    def push(self, board: chess.Board, move: chess.Move):
+        """Aktualisiert die Bewertung für den Zug und führt ihn anschließend auf dem Brett aus."""
+        self._stack.append((self.mg, self.eg, self.phase))
+        if move:
+            color = board.turn
+            from_sq, to_sq = move.from_square, move.to_square
+            piece_type = board.piece_type_at(from_sq)
+            mg_own, eg_own = _MG[color], _EG[color]
+            mg = self.mg - mg_own[piece_type][from_sq]
+            eg = self.eg - eg_own[piece_type][from_sq]
+
+            if piece_type == chess.KING and board.is_castling(move):
+                # Rochade: König und Turm ziehen (python-chess kodiert e1g1 bzw. König schlägt Turm)
+                back_rank = chess.square_rank(from_sq)
+                kingside = chess.square_file(to_sq) > chess.square_file(from_sq)
+                if board.piece_type_at(to_sq) == chess.ROOK and board.color_at(to_sq) == color:
+                    rook_from = to_sq
+                else:
+                    rook_from = chess.square(7 if kingside else 0, back_rank)
+                king_to = chess.square(6 if kingside else 2, back_rank)
+                rook_to = chess.square(5 if kingside else 3, back_rank)
+                mg += mg_own[chess.KING][king_to] - mg_own[chess.ROOK][rook_from] + mg_own[chess.ROOK][rook_to]
+                eg += eg_own[chess.KING][king_to] - eg_own[chess.ROOK][rook_from] + eg_own[chess.ROOK][rook_to]
+            else:
+                if board.is_en_passant(move):
+                    captured_sq = to_sq - 8 if color == chess.WHITE else to_sq + 8
+                    captured_type = chess.PAWN
+                else:
+                    captured_sq = to_sq
+                    captured_type = board.piece_type_at(to_sq)
+                if captured_type:
+                    mg -= _MG[not color][captured_type][captured_sq]
+                    eg -= _EG[not color][captured_type][captured_sq]
+                    self.phase -= _PHASE[captured_type]
+                new_type = move.promotion or piece_type
+                if new_type != piece_type:
+                    self.phase += _PHASE[new_type] - _PHASE[piece_type]
+                mg += mg_own[new_type][to_sq]
+                eg += eg_own[new_type][to_sq]
+            self.mg, self.eg = mg, eg
+        board.push(move)
+
+    def pop(self, board: chess.Board) -> chess.Move:
+        """Nimmt den letzten Zug auf dem Brett zurück und stellt die vorherige Bewertung wieder her."""
+        move = board.pop()
+        self.mg, self.eg, self.phase = self._stack.pop()
+        return move
+
+    def evaluate(self) -> int:
+        """Gibt die aktuelle Bewertung aus Sicht von Weiß zurück (O(1))."""
+        return _taper(self.mg, self.eg, self.phase)
+
+    def evaluate_relative(self, turn: chess.Color) -> int:
+        """Gibt die aktuelle Bewertung aus Sicht der Seite am Zug zurück."""
+        score = _taper(self.mg, self.eg, self.phase)
+        return score if turn == chess.WHITE else -score
@@ -9,6 +9,7 @@ import sys # Für kritische Fehler
 import logger
 import config
 import animations
+import ai_opponent # Für die Ansage der KI-Hauptvariante
 from typing import Optional, List, Dict, Any
 from pygame.event import Event
 from game_state import GameState
@@ -307,6 +308,23 @@ def handle_events(screen: pygame.Surface, gs: 'GameState', board_display: 'Board
                          log.error("Error getting or speaking time: %s", e, exc_info=True)
                          tts_integration.speak_text("Fehler bei Zeitansage", interrupt=True)
 
+                elif event.key == pygame.K_m and gui_state.get('ai_thinking', False): # M KI soll sofort ziehen
+                    log.info("'Move now' requested (M).")
+                    status_display.display_message("KI zieht sofort", 'info', duration=2)
+                    if config.ENABLE_TTS: tts_integration.speak_text("KI zieht sofort", interrupt=True)
+                    action_result = 'AI_MOVE_NOW' # Signal an main.py
+
+                elif event.key == pygame.K_i and allow_global_action: # I Geplante KI-Variante ansagen
+                    pv_san = ai_opponent.get_principal_variation_san()
+                    log.info("Announcing AI principal variation (I): %s", pv_san)
+                    if pv_san:
+                        status_display.display_message(f"KI-Variante: {pv_san}", 'info', duration=5)
+                        tts_integration.speak_principal_variation(ai_opponent.get_principal_variation_board(),
+                                                                  ai_opponent.get_principal_variation(), interrupt=True)
+                    else:
+                        status_display.display_message("Keine KI-Variante verfügbar", 'warning', duration=2)
+                        if config.ENABLE_TTS: tts_integration.speak_text("Keine KI-Variante verfügbar", interrupt=True)
+
                 elif event.key == pygame.K_a and allow_global_action: # A Audio an/aus
                      config.ENABLE_SOUNDS = not config.ENABLE_SOUNDS
                      status_text = "Soundeffekte An" if config.ENABLE_SOUNDS else "Soundeffekte Aus"
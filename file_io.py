@@ -13,6 +13,7 @@ import time
 import datetime # Für Zeitstempel
 import chess # Für chess.Board, chess.Move, chess.Piece etc.
 import config # Für SAVE_DIR, SAVE_FORMAT_VERSION etc.
+import engine_config # Für AI_DEPTH
 from gui.status_display import display_message # Für die Anzeige von Statusmeldungen
 from game_state import GameState
 from gui import timer_logic # Zum Abrufen der aktuellen Zeit
@@ -165,7 +166,7 @@ def _serialize_game_state(gs: GameState, gui_state: Dict[str, Any]) -> Dict[str,
             "elapsed_time_ms": elapsed_time,
             "is_ai_game": is_ai_game,
             "ai_player_color": ai_player_color_str,
-            "ai_depth": config.AI_DEPTH if is_ai_game else None,
+            "ai_depth": engine_config.AI_DEPTH if is_ai_game else None,
             "board_flipped": gui_state.get('board_flipped', False),
             # Füge hier ggf. weitere Metadaten hinzu
         }
@@ -25,6 +25,18 @@ log = logger.setup_logger(
 log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
 
 
+def get_board_key(board: chess.Board) -> Tuple:
+    """
+    Gibt einen billigen Vergleichsschlüssel der Stellung ohne Zugfolge zurück
+    (Figuren, Zugrecht, Rochaderechte, En-passant-Feld): gleiche Schlüssel = gleiche legale Züge.
+    Die ersten acht Einträge sind die Bitboards (Farben, dann Figurentypen); BoardDisplay.sync_pieces
+    bestimmt daraus die geänderten Felder.
+    """
+    return (board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK], board.pawns, board.knights,
+            board.bishops, board.rooks, board.queens, board.kings, board.turn, board.castling_rights,
+            board.ep_square)
+
+
 class GameState:
     """
     Repräsentiert den aktuellen logischen Zustand des Schachspiels.
@@ -56,6 +68,11 @@ class GameState:
         self.captured_by_black = captured_b if captured_b is not None else []
         log.debug("Initial capture lists - White: %d, Black: %d. Redo stack size: %d",
                   len(self.captured_by_white), len(self.captured_by_black), len(self.redo_stack))
+        # Ergebnis von is_game_over() für die zuletzt geprüfte Stellung (die GUI fragt jeden Frame)
+        self._game_over_key: Optional[Tuple] = None
+        self._game_over_cached = False
+        # Zählt Zug, Undo, Redo und Reset; ersetzt die Zugfolge im Vergleichsschlüssel (position_key)
+        self._position_version = 0
 
 
         # Wenn FEN angegeben wird UND kein Board übergeben wurde, setze FEN
@@ -107,6 +124,7 @@ class GameState:
         captured_piece: Optional[chess.Piece] = None
         is_capture = False
         moving_color = self.board.turn
+        log_debug = log.isEnabledFor(logging.DEBUG) # Log-Argumente nur bei aktiver Stufe berechnen
 
         try:
             if move in self.board.legal_moves:
@@ -116,15 +134,16 @@ class GameState:
                     if self.board.is_en_passant(move):
                         capture_sq = move.to_square - 8 if moving_color == chess.WHITE else move.to_square + 8
                         captured_piece = chess.Piece(chess.PAWN, not moving_color)
-                        log.debug("En passant capture detected by %s. Captured piece: %s at %s (assumed)",
-                                  "White" if moving_color == chess.WHITE else "Black",
-                                  captured_piece.symbol(), chess.square_name(capture_sq))
+                        if log_debug: log.debug("En passant capture detected by %s. Captured piece: %s at %s (assumed)",
+                                                "White" if moving_color == chess.WHITE else "Black",
+                                                captured_piece.symbol(), chess.square_name(capture_sq))
                     else:
                         captured_piece = self.board.piece_at(move.to_square)
                         if captured_piece:
-                             log.debug("Regular capture detected by %s. Captured piece: %s at %s",
-                                       "White" if moving_color == chess.WHITE else "Black",
-                                       captured_piece.symbol(), chess.square_name(move.to_square))
+                             if log_debug:
+                                 log.debug("Regular capture detected by %s. Captured piece: %s at %s",
+                                           "White" if moving_color == chess.WHITE else "Black",
+                                           captured_piece.symbol(), chess.square_name(move.to_square))
                         else:
                              log.warning("is_capture is True for move %s, but no piece found at target square %s!",
                                          move.uci(), chess.square_name(move.to_square))
@@ -132,24 +151,25 @@ class GameState:
 
                 # --- Führe den Zug aus ---
                 self.board.push(move)
+                self._position_version += 1
 
                 # --- Füge geschlagene Figur zur Liste hinzu ---
                 if is_capture and captured_piece:
                     if moving_color == chess.WHITE: # Weiß hat geschlagen (schwarze Figur)
                         self.captured_by_white.append(captured_piece)
-                        log.debug("Added captured %s to captured_by_white list (Total: %d)",
-                                  captured_piece.symbol(), len(self.captured_by_white))
+                        if log_debug: log.debug("Added captured %s to captured_by_white list (Total: %d)",
+                                                captured_piece.symbol(), len(self.captured_by_white))
                     else: # Schwarz hat geschlagen (weiße Figur)
                         self.captured_by_black.append(captured_piece)
-                        log.debug("Added captured %s to captured_by_black list (Total: %d)",
-                                  captured_piece.symbol(), len(self.captured_by_black))
+                        if log_debug: log.debug("Added captured %s to captured_by_black list (Total: %d)",
+                                                captured_piece.symbol(), len(self.captured_by_black))
 
                 # --- Lösche den Redo-Stack ---
                 if self.redo_stack:
                     log.debug("Clearing redo stack (%d items) due to new move.", len(self.redo_stack))
                     self.redo_stack.clear()
 
-                log.info("Move executed: %s", move.uci())
+                if log.isEnabledFor(logging.INFO): log.info("Move executed: %s", move.uci())
                 return True
             else:
                 log.warning("Attempted to execute illegal move %s in make_move.", move.uci())
@@ -200,6 +220,7 @@ class GameState:
 
             # 2. Pop den Zug vom Board-Stack
             undone_move = self.board.pop()
+            self._position_version += 1
 
             # 3. Füge Zug und wiederhergestellte Figur zum Redo-Stack hinzu
             self.redo_stack.append((undone_move, captured_piece_to_restore))
@@ -238,6 +259,7 @@ class GameState:
 
             # 3. Führe den Zug direkt auf dem Brett aus
             self.board.push(move_to_redo)
+            self._position_version += 1
 
             # 4. Füge die ursprünglich geschlagene Figur wieder zur Capture-Liste hinzu
             if originally_captured_piece:
@@ -274,10 +296,23 @@ class GameState:
             log.error("Exception generating legal moves: %s (FEN: %s)", e, self.board.fen(), exc_info=True)
             return []
 
+    def position_key(self) -> Tuple:
+        """
+        Gibt einen billigen Vergleichsschlüssel der Stellung samt Zugfolge zurück (unabhängig von der Partielänge).
+        Er ändert sich mit jedem Zug, Undo/Redo, Laden oder direktem Aufstellen von Figuren.
+        """
+        return get_board_key(self.board) + (self.board.halfmove_clock, len(self.board.move_stack),
+                                            self._position_version)
+
     def is_game_over(self) -> bool:
-        """Prüft, ob das Spiel beendet ist (inkl. Remis-Claims)."""
+        """Prüft, ob das Spiel beendet ist (inkl. Remis-Claims); das Ergebnis wird pro Stellung zwischengespeichert."""
         try:
-            return self.board.is_game_over(claim_draw=True)
+            key = self.position_key()
+            if key != self._game_over_key:
+                # Remis-Claims (Wiederholung) sind teuer: nur nach einer Änderung der Stellung neu prüfen
+                self._game_over_cached = self.board.is_game_over(claim_draw=True)
+                self._game_over_key = key
+            return self._game_over_cached
         except Exception as e:
             log.error("Exception during is_game_over check: %s (FEN: %s)", e, self.board.fen(), exc_info=True)
             return False
@@ -302,6 +337,7 @@ class GameState:
     def reset_game(self, fen: Optional[str] = None):
         """Setzt das Spiel zurück und leert Stacks/Listen."""
         log.info("Resetting game state...")
+        self._position_version += 1
         try:
             if fen:
                 log.info("Resetting to FEN: %s", fen)
@@ -15,7 +15,7 @@ log = logger.setup_logger(
 )
 
 __all__ = [
-    "board_display", "chess_gui", "fullscreen_logic", "menu_logic",
+    "board_display", "chess_gui", "fullscreen_logic", "game_renderer", "menu_logic",
     "navigation_logic", "save_load_logic", "startup_logic",
     "status_display", "timer_logic", "tts_integration"
 ]
@@ -12,8 +12,8 @@ import chess
 import config
 import logger
 # Importiere GameState nur für Type Hinting, um Zirkelbezüge zu vermeiden
-from typing import TYPE_CHECKING, Optional, Tuple
-from game_state import GameState
+from typing import TYPE_CHECKING, Optional, Tuple, List, Dict, FrozenSet, Iterable
+from game_state import GameState, get_board_key
 # --- Logger Konfiguration ---
 if logger is None:
      print("FEHLER in board_display.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
@@ -26,6 +26,9 @@ log = logger.setup_logger(
 )
 log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
 
+# Vorgerenderte Ebenen eines Bretts: (Felder mit Koordinaten, nur Felder, [(Glyphe, Position relativ zum Brett)])
+_StaticLayers = Tuple[pygame.Surface, pygame.Surface, List[Tuple[pygame.Surface, Tuple[int, int]]]]
+
 class BoardDisplay:
     """
     Verwaltet die detaillierte Darstellung des Schachbretts und seiner Elemente.
@@ -49,33 +52,49 @@ class BoardDisplay:
         self.board_offset_y = board_offset_y
         self.coord_font = config.COORDINATE_FONT
         self.coord_font = pygame.font.Font(None, config.DEFAULT_FONT_SMALL_SIZE)
-        
+        # Vorgerenderte statische Ebenen je (Feldgröße, Brettdrehung), siehe _get_static_layers()
+        self._static_layers: Dict[Tuple[int, bool], _StaticLayers] = {}
+        # Halbtransparente Hervorhebungen je (Art, Farbe, Feldgröße), siehe _get_overlay()
+        self._overlays: Dict[Tuple[str, Tuple[int, ...], int], pygame.Surface] = {}
+        # Zielfelder der legalen Züge für die zuletzt abgefragte (Stellung, Startfeld), siehe get_legal_targets()
+        self._legal_targets_key: Optional[Tuple] = None
+        self._legal_targets: Tuple[FrozenSet[chess.Square], FrozenSet[chess.Square]] = (frozenset(), frozenset())
+        # Figurenebene: Bild und Bildschirmposition je Feld, abgeglichen mit dem Brett in sync_pieces()
+        self._piece_images: Dict[chess.Piece, pygame.Surface] = {}
+        self._piece_sprites: List[Optional[pygame.Surface]] = [None] * 64
+        self._piece_positions: List[Optional[Tuple[int, int]]] = [None] * 64
+        self._piece_blits: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        self._pieces_board_key: Optional[Tuple] = None
+        self._pieces_layout_key: Optional[Tuple[int, int, int]] = None
+
         log.info("BoardDisplay initialized (Size: %dx%d, Offset: %d,%d, SqSize: %d)",
                  width, height, board_offset_x, board_offset_y, square_size)
 
-    # --- Rest der Methoden bleibt gleich (draw_board, draw_coordinates, etc.) ---
-    # (Ich füge sie hier nicht erneut ein, um die Antwort kurz zu halten,
-    #  aber sie sind Teil der Klasse und verwenden den Logger wie zuvor)
-    def draw_board(self, screen: pygame.Surface):
-        """Zeichnet die Quadrate des Schachbretts."""
-        try:
-            colors = [config.LIGHT_SQUARE_COLOR, config.DARK_SQUARE_COLOR]
-            for r in range(8):
-                for c in range(8):
-                    color_index = (r + c) % 2
-                    pygame.draw.rect(screen, colors[color_index], pygame.Rect(
-                        self.board_offset_x + c * self.sq_size,
-                        self.board_offset_y + r * self.sq_size,
-                        self.sq_size, self.sq_size))
-        except Exception as e:
-            log.error("Error drawing board squares: %s", e, exc_info=True)
+    def invalidate_static_layers(self):
+        """Verwirft die vorgerenderten Ebenen; sie werden beim nächsten Zeichnen neu erstellt (nach Größenänderung/Vollbild)."""
+        self._static_layers.clear()
 
-    def draw_coordinates(self, screen: pygame.Surface, flipped: bool = False):
-        """Zeichnet die algebraischen Koordinaten."""
-        if not self.coord_font:
-             log.warning("Cannot draw coordinates, font not available.")
-             return
-        try:
+    def _get_static_layers(self, flipped: bool) -> _StaticLayers:
+        """
+        Gibt die vorgerenderten Ebenen für Feldgröße und Brettdrehung zurück und erstellt sie beim ersten Bedarf:
+        Felder mit Koordinaten, nur die Felder und die Koordinaten-Glyphen (Position relativ zum Brett).
+        Die Position des Bretts gehört nicht zum Schlüssel, da die Ebenen erst beim Blitten verschoben werden.
+        """
+        layer_key = (self.sq_size, flipped)
+        layers = self._static_layers.get(layer_key)
+        if layers is not None:
+            return layers
+        size = (8 * self.sq_size, 8 * self.sq_size)
+        squares_layer = pygame.Surface(size)
+        colors = [config.LIGHT_SQUARE_COLOR, config.DARK_SQUARE_COLOR]
+        for r in range(8):
+            for c in range(8):
+                color_index = (r + c) % 2
+                pygame.draw.rect(squares_layer, colors[color_index], pygame.Rect(
+                    c * self.sq_size, r * self.sq_size, self.sq_size, self.sq_size))
+
+        coord_glyphs = []
+        if self.coord_font:
             coord_color_light = config.COORDINATE_TEXT_COLOR_LIGHT
             coord_color_dark = config.COORDINATE_TEXT_COLOR_DARK
             files = "abcdefgh"
@@ -91,54 +110,186 @@ class BoardDisplay:
                 text_color_file = coord_color_light if is_dark_square_last_rank else coord_color_dark
                 text_surface_file = self.coord_font.render(file_char, True, text_color_file)
                 text_rect_file = text_surface_file.get_rect(bottomright=(
-                    self.board_offset_x + (i + 1) * self.sq_size - padding,
-                    self.board_offset_y + 8 * self.sq_size - padding ))
-                screen.blit(text_surface_file, text_rect_file)
+                    (i + 1) * self.sq_size - padding, 8 * self.sq_size - padding))
+                coord_glyphs.append((text_surface_file, text_rect_file.topleft))
 
                 rank_char = ranks[i]
                 is_dark_square_first_file = (i + 0) % 2 == 1
                 if flipped: is_dark_square_first_file = not is_dark_square_first_file
                 text_color_rank = coord_color_dark if is_dark_square_first_file else coord_color_light
                 text_surface_rank = self.coord_font.render(rank_char, True, text_color_rank)
-                text_rect_rank = text_surface_rank.get_rect(topleft=(
-                    self.board_offset_x + padding,
-                    self.board_offset_y + i * self.sq_size + padding ))
-                screen.blit(text_surface_rank, text_rect_rank)
+                text_rect_rank = text_surface_rank.get_rect(topleft=(padding, i * self.sq_size + padding))
+                coord_glyphs.append((text_surface_rank, text_rect_rank.topleft))
+
+        static_layer = squares_layer.copy()
+        static_layer.blits(coord_glyphs, doreturn=False)
+        if pygame.display.get_surface() is not None:
+            # Im Pixelformat des Fensters blittet pygame ohne Umwandlung pro Frame
+            squares_layer = squares_layer.convert()
+            static_layer = static_layer.convert()
+        layers = (static_layer, squares_layer, coord_glyphs)
+        self._static_layers[layer_key] = layers
+        log.debug("Static board layers rendered (SqSize: %d, flipped: %s)", self.sq_size, flipped)
+        return layers
+
+    def draw_static_board(self, screen: pygame.Surface, flipped: bool = False):
+        """Zeichnet Felder und Koordinaten mit einem einzigen Blit der vorgerenderten Ebene."""
+        try:
+            screen.blit(self._get_static_layers(flipped)[0], (self.board_offset_x, self.board_offset_y))
         except Exception as e:
-            log.error("Error drawing coordinates: %s", e, exc_info=True)
+            log.error("Error drawing static board layer: %s", e, exc_info=True)
+
+    def draw_board(self, screen: pygame.Surface):
+        """Zeichnet die Quadrate des Schachbretts (aus der vorgerenderten Ebene)."""
+        try:
+            screen.blit(self._get_static_layers(False)[1], (self.board_offset_x, self.board_offset_y))
+        except Exception as e:
+            log.error("Error drawing board squares: %s", e, exc_info=True)
 
-    def draw_pieces(self, screen: pygame.Surface, board: chess.Board, exclude_square: Optional[chess.Square] = None):
-        """Zeichnet die Figuren auf dem Brett."""
+    def draw_coordinates(self, screen: pygame.Surface, flipped: bool = False):
+        """Zeichnet die algebraischen Koordinaten (vorgerenderte Glyphen)."""
+        if not self.coord_font:
+             log.warning("Cannot draw coordinates, font not available.")
+             return
         try:
-            for square_index in chess.SQUARES:
-                if square_index == exclude_square: continue
-                piece = board.piece_at(square_index)
-                if piece:
-                    piece_color_char = 'w' if piece.color == chess.WHITE else 'b'
-                    piece_symbol_upper = piece.symbol().upper()
-                    piece_key = f"{piece_color_char}{piece_symbol_upper}"
-                    rank = chess.square_rank(square_index)
-                    file = chess.square_file(square_index)
-                    pygame_row = 7 - rank
-                    pygame_col = file
-                    image = config.IMAGES.get(piece_key)
-                    if image:
-                        pixel_x = self.board_offset_x + pygame_col * self.sq_size
-                        pixel_y = self.board_offset_y + pygame_row * self.sq_size
-                        image_rect = image.get_rect(center=(pixel_x + self.sq_size // 2, pixel_y + self.sq_size // 2))
-                        screen.blit(image, image_rect.topleft)
+            offset_x, offset_y = self.board_offset_x, self.board_offset_y
+            coord_glyphs = self._get_static_layers(flipped)[2]
+            screen.blits([(glyph, (offset_x + x, offset_y + y)) for glyph, (x, y) in coord_glyphs],
+                         doreturn=False)
+        except Exception as e:
+            log.error("Error drawing coordinates: %s", e, exc_info=True)
+
+    def _get_overlay(self, kind: str, color: Tuple[int, ...]) -> pygame.Surface:
+        """
+        Gibt die vorgerenderte Hervorhebung eines Feldes zurück und erstellt sie beim ersten Bedarf.
+
+        Args:
+            kind (str): 'fill' (ganzes Feld), 'ring' (Kreis für Schlagzüge) oder 'dot' (Punkt für ruhige Züge).
+            color (Tuple[int, ...]): Farbe (RGBA bei 'fill'; bei 'ring'/'dot' wird nur RGB verwendet).
+        """
+        overlay_key = (kind, color, self.sq_size)
+        overlay = self._overlays.get(overlay_key)
+        if overlay is None:
+            overlay = pygame.Surface((self.sq_size, self.sq_size), pygame.SRCALPHA)
+            center = (self.sq_size // 2, self.sq_size // 2)
+            if kind == 'fill':
+                overlay.fill(color)
+            elif kind == 'ring':
+                pygame.draw.circle(overlay, color[:3], center, self.sq_size // 2 - 4, 3)
+            else:
+                pygame.draw.circle(overlay, color[:3], center, self.sq_size // 6)
+            self._overlays[overlay_key] = overlay
+        return overlay
+
+    def get_legal_targets(self, board: chess.Board, square_index: chess.Square) -> Tuple[FrozenSet[chess.Square], FrozenSet[chess.Square]]:
+        """
+        Gibt die Zielfelder der legalen Züge der Figur auf square_index zurück (leer, wenn dort keine Figur
+        der Partei am Zug steht). Berechnet wird nur, wenn sich Stellung oder Startfeld geändert haben.
+
+        Returns:
+            Tuple[FrozenSet[chess.Square], FrozenSet[chess.Square]]: (Felder ruhiger Züge, Felder von Schlagzügen).
+        """
+        targets_key = (get_board_key(board), square_index)
+        if targets_key != self._legal_targets_key:
+            quiet_targets, capture_targets = set(), set()
+            piece = board.piece_at(square_index)
+            if piece and piece.color == board.turn:
+                for move in board.generate_legal_moves(from_mask=chess.BB_SQUARES[square_index]):
+                    if board.is_capture(move):
+                        capture_targets.add(move.to_square)
                     else:
-                        log.warning("Image for piece '%s' not found. Drawing fallback.", piece_key)
-                        try:
-                            fallback_font = config.DEFAULT_FONT_BOLD
-                            fallback_text = piece.symbol()
-                            fallback_color = config.WHITE if piece.color == chess.WHITE else config.BLACK
-                            txt_surf = fallback_font.render(fallback_text, True, fallback_color)
-                            txt_rect = txt_surf.get_rect(center=(self.board_offset_x + pygame_col * self.sq_size + self.sq_size // 2,
-                                                                  self.board_offset_y + pygame_row * self.sq_size + self.sq_size // 2))
-                            screen.blit(txt_surf, txt_rect)
-                        except Exception as e_fallback:
-                            log.error("Error drawing fallback text for piece %s: %s", piece_key, e_fallback)
+                        quiet_targets.add(move.to_square)
+            self._legal_targets = (frozenset(quiet_targets), frozenset(capture_targets))
+            self._legal_targets_key = targets_key
+        return self._legal_targets
+
+    def _square_topleft(self, square_index: chess.Square) -> Tuple[int, int]:
+        """Pixelkoordinaten der linken oberen Ecke eines Feldes."""
+        return (self.board_offset_x + chess.square_file(square_index) * self.sq_size,
+                self.board_offset_y + (7 - chess.square_rank(square_index)) * self.sq_size)
+
+    def _get_piece_sprite(self, piece: chess.Piece) -> Optional[pygame.Surface]:
+        """Gibt das Bild einer Figur zurück (beim ersten Bedarf aus config.IMAGES oder als Text-Ersatz erstellt)."""
+        sprite = self._piece_images.get(piece)
+        if sprite is None:
+            piece_key = f"{'w' if piece.color == chess.WHITE else 'b'}{piece.symbol().upper()}"
+            sprite = config.IMAGES.get(piece_key)
+            if not sprite:
+                log.warning("Image for piece '%s' not found. Drawing fallback.", piece_key)
+                try:
+                    fallback_color = config.WHITE if piece.color == chess.WHITE else config.BLACK
+                    sprite = config.DEFAULT_FONT_BOLD.render(piece.symbol(), True, fallback_color)
+                except Exception as e_fallback:
+                    log.error("Error rendering fallback text for piece %s: %s", piece_key, e_fallback)
+                    return None
+            self._piece_images[piece] = sprite
+        return sprite
+
+    def _update_piece_sprite(self, board: chess.Board, square_index: chess.Square):
+        """Setzt Bild und Bildschirmposition (zentriert im Feld) der Figur auf einem Feld neu."""
+        piece = board.piece_at(square_index)
+        sprite = self._get_piece_sprite(piece) if piece else None
+        self._piece_sprites[square_index] = sprite
+        if sprite is None:
+            self._piece_positions[square_index] = None
+            return
+        width, height = sprite.get_size()
+        pixel_x, pixel_y = self._square_topleft(square_index)
+        self._piece_positions[square_index] = (pixel_x + self.sq_size // 2 - width // 2,
+                                               pixel_y + self.sq_size // 2 - height // 2)
+
+    def sync_pieces(self, board: chess.Board) -> List[chess.Square]:
+        """
+        Gleicht die Figurenebene (64 Einträge: Bild und Position je Feld) mit dem Brett ab.
+        Neu gesetzt werden nur die Felder, deren Bitboards sich seit dem letzten Abgleich geändert haben;
+        nach einem Zug sind das Start- und Zielfeld, ggf. das Feld der geschlagenen Figur (en passant),
+        der Turm bei der Rochade und das Umwandlungsfeld. Nach Undo, Laden oder Aufstellen entsprechend mehr.
+
+        Returns:
+            List[chess.Square]: Die geänderten Felder (leer, wenn das Brett unverändert ist).
+        """
+        board_key = get_board_key(board)
+        layout_key = (self.board_offset_x, self.board_offset_y, self.sq_size)
+        if layout_key != self._pieces_layout_key:
+            changed_mask = chess.BB_ALL # Brett verschoben/skaliert: alle Positionen neu berechnen
+            self._pieces_layout_key = layout_key
+        elif board_key == self._pieces_board_key:
+            return []
+        elif self._pieces_board_key is None:
+            changed_mask = chess.BB_ALL
+        else:
+            changed_mask = 0
+            for old_bitboard, new_bitboard in zip(self._pieces_board_key[:8], board_key[:8]): # Die acht Bitboards
+                changed_mask |= old_bitboard ^ new_bitboard
+        changed_squares = list(chess.scan_forward(changed_mask))
+        for square_index in changed_squares:
+            self._update_piece_sprite(board, square_index)
+        self._pieces_board_key = board_key
+        if changed_squares:
+            self._piece_blits = [(self._piece_sprites[square_index], self._piece_positions[square_index])
+                                 for square_index in chess.SQUARES if self._piece_sprites[square_index] is not None]
+        return changed_squares
+
+    def draw_pieces(self, screen: pygame.Surface, board: chess.Board, exclude_square: Optional[chess.Square] = None,
+                    squares: Optional[Iterable[chess.Square]] = None):
+        """
+        Zeichnet die Figuren auf dem Brett aus der Figurenebene (siehe sync_pieces).
+
+        Args:
+            exclude_square (chess.Square, optional): Feld, dessen Figur nicht gezeichnet wird (Startfeld einer Animation).
+            squares (Iterable[chess.Square], optional): Nur die Figuren dieser Felder zeichnen (z.B. geänderte Felder).
+        """
+        try:
+            self.sync_pieces(board)
+            if squares is None and exclude_square is None:
+                screen.blits(self._piece_blits, doreturn=False)
+                return
+            if squares is None:
+                squares = chess.SQUARES
+            screen.blits([(self._piece_sprites[square_index], self._piece_positions[square_index])
+                          for square_index in squares
+                          if square_index != exclude_square and self._piece_sprites[square_index] is not None],
+                         doreturn=False)
         except Exception as e:
             log.error("Error drawing pieces: %s", e, exc_info=True)
 
@@ -148,13 +299,7 @@ class BoardDisplay:
             log.warning("Attempted to highlight invalid square index: %s", square_index)
             return
         try:
-            col, row = self.square_to_coords(square_index)
-            if col == -1: return
-            pixel_x = self.board_offset_x + col * self.sq_size
-            pixel_y = self.board_offset_y + row * self.sq_size
-            highlight_surface = pygame.Surface((self.sq_size, self.sq_size), pygame.SRCALPHA)
-            highlight_surface.fill(color)
-            screen.blit(highlight_surface, (pixel_x, pixel_y))
+            screen.blit(self._get_overlay('fill', color), self._square_topleft(square_index))
         except Exception as e:
             log.error("Error highlighting square %s: %s", square_index, e, exc_info=True)
 
@@ -163,20 +308,14 @@ class BoardDisplay:
         if not config.HIGHLIGHT_LEGAL_MOVES: return
         if not (0 <= square_index <= 63): return
         try:
-            piece = board.piece_at(square_index)
-            if not piece or piece.color != board.turn: return
-            legal_moves = [move for move in board.legal_moves if move.from_square == square_index]
-            if not legal_moves: return
+            quiet_targets, capture_targets = self.get_legal_targets(board, square_index)
+            if capture_targets:
+                ring = self._get_overlay('ring', config.HIGHLIGHT_COLOR_LEGAL_CAPTURE)
+                screen.blits([(ring, self._square_topleft(target)) for target in capture_targets], doreturn=False)
             current_time_ms = pygame.time.get_ticks()
-            for move in legal_moves:
-                target_square = move.to_square
-                center_x, center_y = self.get_square_center_coords(target_square)
-                if center_x is None: continue
-                if board.is_capture(move):
-                    pygame.draw.circle(screen, config.HIGHLIGHT_COLOR_LEGAL_CAPTURE[:3], (center_x, center_y), self.sq_size // 2 - 4, 3)
-                else:
-                    if (current_time_ms % config.LEGAL_MOVE_BLINK_CYCLE_MS) < config.LEGAL_MOVE_BLINK_ON_MS:
-                         pygame.draw.circle(screen, config.HIGHLIGHT_COLOR_LEGAL_MOVE[:3], (center_x, center_y), self.sq_size // 6)
+            if quiet_targets and (current_time_ms % config.LEGAL_MOVE_BLINK_CYCLE_MS) < config.LEGAL_MOVE_BLINK_ON_MS:
+                dot = self._get_overlay('dot', config.HIGHLIGHT_COLOR_LEGAL_MOVE)
+                screen.blits([(dot, self._square_topleft(target)) for target in quiet_targets], doreturn=False)
         except Exception as e:
             log.error("Error highlighting legal moves for square %s: %s", square_index, e, exc_info=True)
 
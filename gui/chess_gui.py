@@ -60,7 +60,7 @@ except ImportError as e_cu:
 
 
 # Importiere BoardDisplay und GameState nur für Type Hinting
-from typing import TYPE_CHECKING, Optional, Tuple, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, Tuple, List, Dict, Any, Iterable
 if TYPE_CHECKING:
     # Verwende relative Pfade auch für Type Hinting innerhalb des Pakets
     try:
@@ -182,38 +182,25 @@ def draw_captured_pieces(screen: pygame.Surface, gs: 'GameState', board_display:
         log.error("Error drawing captured pieces: %s", e, exc_info=True)
 
 
-# --- Haupt-Zeichenfunktion ---
-
-def draw_game_state(
+def draw_board_area(
     screen: pygame.Surface,
     gs: 'GameState',
     board_display: 'BoardDisplay',
-    selected_square_index: Optional[chess.Square] = None, # Der Cursor
-    source_square_index: Optional[chess.Square] = None,  # Die aufgenommene Figur
+    selected_square_index: Optional[chess.Square] = None,
+    source_square_index: Optional[chess.Square] = None,
     last_move: Optional[chess.Move] = None,
-    board_flipped: bool = False
+    board_flipped: bool = False,
+    piece_squares: Optional[Iterable[chess.Square]] = None
     ):
     """
-    Zeichnet den kompletten aktuellen Spielzustand auf den Bildschirm.
-    Hebt Cursor und aufgenommene Figur unterschiedlich hervor.
-
-    Args:
-        screen (pygame.Surface): Die Hauptzeichenfläche.
-        gs (GameState): Der aktuelle Spielzustand.
-        board_display (BoardDisplay): Das Objekt, das für das Zeichnen des Bretts zuständig ist.
-        selected_square_index (chess.Square, optional): Index des Cursors (0-63).
-        source_square_index (chess.Square, optional): Index der aufgenommenen Figur (0-63).
-        last_move (chess.Move, optional): Der letzte ausgeführte Zug zur Hervorhebung.
-        board_flipped (bool): Gibt an, ob das Brett gedreht angezeigt wird.
+    Zeichnet nur das Brett mit Koordinaten, Hervorhebungen und Figuren (ohne geschlagene Figuren).
+    Mit gesetztem Clip-Bereich (screen.set_clip) lassen sich so einzelne Felder neu zeichnen
+    (siehe game_renderer). Parameter wie bei draw_game_state(); piece_squares beschränkt die
+    gezeichneten Figuren auf diese Felder (die Felder im Clip-Bereich).
     """
-    # log.debug("Drawing game state...") # Sehr spammy
-
     try:
-        # 1. Zeichne das Brett (Felder)
-        board_display.draw_board(screen)
-
-        # 2. Zeichne Koordinaten
-        board_display.draw_coordinates(screen, flipped=board_flipped)
+        # 1./2. Zeichne das Brett (Felder) und die Koordinaten: ein Blit der vorgerenderten Ebene
+        board_display.draw_static_board(screen, flipped=board_flipped)
 
         # 3. Hebe den letzten Zug hervor (Start- und Endfeld)
         if last_move:
@@ -238,7 +225,41 @@ def draw_game_state(
 
         # 8. Zeichne die Figuren (über den Hervorhebungen)
         #    Hier wird keine Figur ausgeschlossen, da wir den statischen Zustand zeichnen.
-        board_display.draw_pieces(screen, gs.board, exclude_square=None)
+        board_display.draw_pieces(screen, gs.board, exclude_square=None, squares=piece_squares)
+
+    except Exception as e:
+        log.error("Error during draw_board_area: %s", e, exc_info=True)
+
+
+# --- Haupt-Zeichenfunktion ---
+
+def draw_game_state(
+    screen: pygame.Surface,
+    gs: 'GameState',
+    board_display: 'BoardDisplay',
+    selected_square_index: Optional[chess.Square] = None, # Der Cursor
+    source_square_index: Optional[chess.Square] = None,  # Die aufgenommene Figur
+    last_move: Optional[chess.Move] = None,
+    board_flipped: bool = False
+    ):
+    """
+    Zeichnet den kompletten aktuellen Spielzustand auf den Bildschirm.
+    Hebt Cursor und aufgenommene Figur unterschiedlich hervor.
+
+    Args:
+        screen (pygame.Surface): Die Hauptzeichenfläche.
+        gs (GameState): Der aktuelle Spielzustand.
+        board_display (BoardDisplay): Das Objekt, das für das Zeichnen des Bretts zuständig ist.
+        selected_square_index (chess.Square, optional): Index des Cursors (0-63).
+        source_square_index (chess.Square, optional): Index der aufgenommenen Figur (0-63).
+        last_move (chess.Move, optional): Der letzte ausgeführte Zug zur Hervorhebung.
+        board_flipped (bool): Gibt an, ob das Brett gedreht angezeigt wird.
+    """
+    # log.debug("Drawing game state...") # Sehr spammy
+
+    try:
+        # 1. - 8. Brett, Koordinaten, Hervorhebungen und Figuren
+        draw_board_area(screen, gs, board_display, selected_square_index, source_square_index, last_move, board_flipped)
 
         # 9. Zeichne geschlagene Figuren NEBEN dem Brett
         draw_captured_pieces(screen, gs, board_display)
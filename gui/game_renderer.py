@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul zeichnet den Spielzustand (GAME) mit Dirty Rectangles.
+Statt jeden Frame das ganze Fenster neu zu zeichnen und mit pygame.display.flip() anzuzeigen,
+merkt es sich, was zuletzt gezeichnet wurde (Figur und Hervorhebungen je Feld, geschlagene Figuren,
+Timer-Text, Statuszeile, Menü/Spielende-Anzeige). Neu gezeichnet und mit pygame.display.update(rects)
+angezeigt werden nur die Bereiche, die sich geändert haben; ein Frame ohne Änderung kostet fast nichts.
+Das ganze Fenster wird nur nach invalidate() (Zustandswechsel, Größenänderung, verdecktes Fenster),
+während einer Zuganimation und bei Änderungen unter einem halbtransparenten Menü neu gezeichnet.
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import logger
+import pygame
+import chess
+import config
+import chess_utils
+import animations
+from gui import chess_gui
+from gui import timer_logic
+from gui import status_display
+from gui import menu_logic
+from typing import TYPE_CHECKING, Optional, List, Tuple, Dict, Any
+if TYPE_CHECKING:
+    from gui.board_display import BoardDisplay
+    from game_state import GameState
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in game_renderer.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Markierungen eines Feldes (Bitmaske, Teil des Feldzustands) ---
+_MARK_LAST_MOVE = 1
+_MARK_SOURCE = 2
+_MARK_CURSOR = 4
+_MARK_CHECK = 8
+_MARK_LEGAL_TARGET = 16   # Punkt für ruhige Züge (blinkt)
+_MARK_LEGAL_CAPTURE = 32  # Ring für Schlagzüge
+
+# Ab so vielen geänderten Feldern wird das Brett einmal für das umschließende Rechteck gezeichnet
+_MAX_SEPARATE_SQUARES = 4
+
+# --- Modul-Zustandsvariablen (was zuletzt auf dem Bildschirm steht) ---
+_full_redraw: bool = True
+_layout_key: Optional[Tuple] = None    # Fenstergröße, Brettposition, Feldgröße, Brettdrehung
+_board_key: Optional[Tuple] = None     # Schneller Vergleich: GameState.position_key(), Auswahl, letzter Zug, Blinkphase
+_square_states: List[Optional[Tuple]] = [None] * 64
+_captured_key: Optional[Tuple] = None
+_timer_text: Optional[str] = None
+_timer_rect: Optional[pygame.Rect] = None
+_status_key: Optional[Tuple] = None
+_status_rect: Optional[pygame.Rect] = None
+_overlay_key: Optional[Tuple] = None
+
+def invalidate():
+    """Erzwingt im nächsten Frame das Neuzeichnen des ganzen Fensters (z.B. nach Größen- oder Zustandswechsel)."""
+    global _full_redraw
+    _full_redraw = True
+
+def redraw_pending() -> bool:
+    """Gibt zurück, ob der nächste Frame das ganze Fenster neu zeichnen muss (z.B. direkt nach einer Animation)."""
+    return _full_redraw
+
+def get_ms_until_blink_change() -> int:
+    """Gibt zurück, in wie vielen Millisekunden die Punkte der legalen Züge ein- bzw. ausgeblendet werden."""
+    phase_ms = pygame.time.get_ticks() % config.LEGAL_MOVE_BLINK_CYCLE_MS
+    if phase_ms < config.LEGAL_MOVE_BLINK_ON_MS:
+        return config.LEGAL_MOVE_BLINK_ON_MS - phase_ms
+    return config.LEGAL_MOVE_BLINK_CYCLE_MS - phase_ms
+
+def _legal_move_blink_on() -> bool:
+    """Gibt zurück, ob die Punkte der legalen Züge in der aktuellen Blinkphase sichtbar sind."""
+    return (pygame.time.get_ticks() % config.LEGAL_MOVE_BLINK_CYCLE_MS) < config.LEGAL_MOVE_BLINK_ON_MS
+
+def _compute_square_states(board_display: 'BoardDisplay', board: chess.Board, selected: Optional[chess.Square],
+                           source: Optional[chess.Square], last_move: Optional[chess.Move], blink_on: bool) -> List[Tuple]:
+    """Berechnet für jedes Feld (Figur, Markierungen) so, wie chess_gui.draw_board_area es zeichnet."""
+    marks = [0] * 64
+    if last_move:
+        marks[last_move.from_square] |= _MARK_LAST_MOVE
+        marks[last_move.to_square] |= _MARK_LAST_MOVE
+    if source is not None:
+        marks[source] |= _MARK_SOURCE
+    if selected is not None:
+        marks[selected] |= _MARK_CURSOR
+        if config.HIGHLIGHT_LEGAL_MOVES and source is not None:
+            # Dieselben zwischengespeicherten Zielfelder, die BoardDisplay.highlight_legal_moves zeichnet
+            quiet_targets, capture_targets = board_display.get_legal_targets(board, source)
+            for target in capture_targets:
+                marks[target] |= _MARK_LEGAL_CAPTURE
+            if blink_on:
+                for target in quiet_targets:
+                    marks[target] |= _MARK_LEGAL_TARGET
+    if board.is_check():
+        king_square = board.king(board.turn)
+        if king_square is not None:
+            marks[king_square] |= _MARK_CHECK
+    pieces = board.piece_map()
+    return [(pieces.get(square), marks[square]) for square in chess.SQUARES]
+
+def _square_rect(board_display: 'BoardDisplay', square: chess.Square) -> pygame.Rect:
+    """Bildschirmbereich eines Feldes."""
+    col, row = board_display.square_to_coords(square)
+    return pygame.Rect(board_display.board_offset_x + col * board_display.sq_size,
+                       board_display.board_offset_y + row * board_display.sq_size,
+                       board_display.sq_size, board_display.sq_size)
+
+def _captured_panel_rects(screen: pygame.Surface, board_display: 'BoardDisplay') -> List[pygame.Rect]:
+    """Bereiche links und rechts neben dem Brett, in denen die geschlagenen Figuren stehen."""
+    top, height = board_display.board_offset_y, board_display.height
+    right_x = board_display.board_offset_x + board_display.width
+    return [pygame.Rect(0, top, board_display.board_offset_x, height),
+            pygame.Rect(right_x, top, screen.get_width() - right_x, height)]
+
+def _redraw_header(screen: pygame.Surface) -> Optional[pygame.Rect]:
+    """
+    Löscht die alten Bereiche von Timer und Statuszeile und zeichnet beide neu (in der Reihenfolge
+    des ganzen Frames, da sich eine lange Statuszeile mit dem Timer überschneiden kann).
+
+    Returns:
+        pygame.Rect | None: Anzuzeigender Bereich (alte und neue Bereiche zusammen).
+    """
+    global _timer_rect, _status_rect
+    old_rects = [rect for rect in (_timer_rect, _status_rect) if rect is not None]
+    for rect in old_rects:
+        screen.fill(config.WINDOW_BACKGROUND_COLOR, rect)
+    _timer_rect = timer_logic.draw_game_timer(screen)
+    _status_rect = status_display.draw_status_display(screen)
+    rects = old_rects + [rect for rect in (_timer_rect, _status_rect) if rect is not None]
+    return rects[0].unionall(rects[1:]) if rects else None
+
+def _draw_overlays(screen: pygame.Surface, gs: 'GameState', gui_state: Dict[str, Any]):
+    """Zeichnet das In-Game-Menü bzw. den Spielende-Text über das Spielfeld."""
+    if gui_state['menu_active']:
+        menu_logic.draw_menu(screen, menu_logic.get_highlighted_index())
+    elif gui_state['game_over']: # Zeichne Spielende-Text nur wenn kein Menü aktiv ist
+        game_over_text = chess_utils.get_game_over_text(gs.board)
+        if game_over_text:
+            chess_gui.draw_game_over_text(screen, game_over_text)
+
+def draw_game_frame(screen: pygame.Surface, gs: 'GameState', board_display: 'BoardDisplay',
+                    gui_state: Dict[str, Any], selected: Optional[chess.Square],
+                    source: Optional[chess.Square], animating: bool = False) -> int:
+    """
+    Zeichnet einen Frame des Spielzustands und zeigt ihn an (ersetzt screen.fill + draw_game_state + flip).
+
+    Args:
+        gui_state (Dict[str, Any]): game_gui_state aus main.py (last_move, board_flipped, menu_active, game_over).
+        selected (chess.Square, optional): Cursor-Feld.
+        source (chess.Square, optional): Feld der aufgenommenen Figur.
+        animating (bool): Eine Zuganimation läuft (das ganze Fenster wird neu gezeichnet).
+
+    Returns:
+        int: Anzahl der angezeigten Bereiche (0 = nichts geändert, -1 = ganzes Fenster).
+    """
+    global _full_redraw, _layout_key, _board_key, _square_states, _captured_key
+    global _timer_text, _timer_rect, _status_key, _status_rect, _overlay_key
+
+    board = gs.board
+    last_move = gui_state.get('last_move')
+    flipped = gui_state.get('board_flipped', False)
+    layout_key = (screen.get_size(), board_display.board_offset_x, board_display.board_offset_y,
+                  board_display.sq_size, flipped)
+    show_legal = config.HIGHLIGHT_LEGAL_MOVES and selected is not None and source is not None
+    board_key = (gs.position_key(), selected, source, last_move,
+                 _legal_move_blink_on() if show_legal else None)
+    timer_text = timer_logic.get_formatted_time()
+    status_key = status_display.get_display_state()
+    menu_active = gui_state['menu_active']
+    overlay_key = (menu_active, gui_state['game_over'],
+                   menu_logic.get_highlighted_index() if menu_active else None,
+                   pygame.mouse.get_pos() if menu_active else None) # Maus-Hover im Menü
+
+    # Halbtransparente Menüs/Texte liegen über dem Brett: jede Änderung zeichnet dann alles neu
+    has_overlay = menu_active or gui_state['game_over']
+    changed = board_key != _board_key or timer_text != _timer_text or status_key != _status_key
+    if animating or _full_redraw or layout_key != _layout_key or overlay_key != _overlay_key or (has_overlay and changed):
+        screen.fill(config.WINDOW_BACKGROUND_COLOR)
+        if animating:
+            animations.update_animation(screen, gs, board_display)
+        else:
+            chess_gui.draw_game_state(screen, gs, board_display, selected_square_index=selected,
+                                      source_square_index=source, last_move=last_move, board_flipped=flipped)
+        _timer_rect = timer_logic.draw_game_timer(screen)
+        _status_rect = status_display.draw_status_display(screen)
+        _draw_overlays(screen, gs, gui_state)
+        pygame.display.flip()
+
+        # Nach einer Animation muss der nächste Frame wieder vollständig gezeichnet werden
+        _full_redraw = animating
+        _layout_key, _overlay_key = layout_key, overlay_key
+        _timer_text, _status_key = timer_text, status_key
+        _board_key = board_key
+        _square_states = _compute_square_states(board_display, board, selected, source, last_move, board_key[-1] or False)
+        _captured_key = (tuple(gs.get_captured_by_white()), tuple(gs.get_captured_by_black()))
+        return -1
+
+    dirty_rects: List[pygame.Rect] = []
+
+    # --- Brett: nur Felder mit geänderter Figur oder Markierung ---
+    if board_key != _board_key:
+        states = _compute_square_states(board_display, board, selected, source, last_move, board_key[-1] or False)
+        dirty_squares = [square for square in chess.SQUARES if states[square] != _square_states[square]]
+        if dirty_squares:
+            square_rects = [_square_rect(board_display, square) for square in dirty_squares]
+            if len(square_rects) > _MAX_SEPARATE_SQUARES:
+                # Umschließendes Rechteck: es enthält auch unveränderte Felder, also alle Figuren zeichnen
+                clip_rects = [square_rects[0].unionall(square_rects[1:])]
+                clip_squares = [None]
+            else:
+                clip_rects = square_rects
+                clip_squares = [(square,) for square in dirty_squares] # Nur die Figur dieses Feldes
+            for clip_rect, piece_squares in zip(clip_rects, clip_squares):
+                screen.set_clip(clip_rect)
+                chess_gui.draw_board_area(screen, gs, board_display, selected, source, last_move, flipped,
+                                          piece_squares=piece_squares)
+            screen.set_clip(None)
+            dirty_rects.extend(clip_rects)
+        _board_key, _square_states = board_key, states
+
+        captured_key = (tuple(gs.get_captured_by_white()), tuple(gs.get_captured_by_black()))
+        if captured_key != _captured_key:
+            panel_rects = _captured_panel_rects(screen, board_display)
+            for panel_rect in panel_rects:
+                screen.fill(config.WINDOW_BACKGROUND_COLOR, panel_rect)
+            chess_gui.draw_captured_pieces(screen, gs, board_display)
+            dirty_rects.extend(panel_rects)
+            _captured_key = captured_key
+
+    # --- Timer (einmal pro Sekunde) und Statuszeile ---
+    if timer_text != _timer_text or status_key != _status_key:
+        header_rect = _redraw_header(screen)
+        if header_rect is not None: dirty_rects.append(header_rect)
+        _timer_text, _status_key = timer_text, status_key
+
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
+    return len(dirty_rects)
@@ -11,6 +11,7 @@ import logger
 import sys # Für kritische Fehler
 import chess # Für chess.WHITE/BLACK Konstanten
 import config # Für AI Einstellungen
+import engine_config # Für die Suchtiefe der KI (AI_DEPTH)
 import file_io
 from . import timer_logic
 from game_state import GameState
@@ -109,9 +110,9 @@ def load_game(gs: 'GameState', gui_state: Dict[str, Any], filename: Optional[str
             ai_color_str = loaded_metadata.get('ai_player_color')
             if config.AI_ENABLED and ai_color_str:
                 config.AI_PLAYER = chess.WHITE if ai_color_str == 'WHITE' else chess.BLACK
-                config.AI_DEPTH = loaded_metadata.get('ai_depth', config.AI_DEPTH) # Behalte alten Wert bei Fehler
+                engine_config.AI_DEPTH = loaded_metadata.get('ai_depth', engine_config.AI_DEPTH) # Behalte alten Wert bei Fehler
                 log.info("AI settings restored: Enabled=True, Player=%s, Depth=%d",
-                         ai_color_str, config.AI_DEPTH)
+                         ai_color_str, engine_config.AI_DEPTH)
             else:
                 config.AI_ENABLED = False
                 log.info("AI settings restored: Enabled=False")
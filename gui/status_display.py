@@ -13,7 +13,7 @@ import chess
 import chess_utils
 import config
 from game_state import GameState
-from typing import Optional
+from typing import Optional, Tuple
 
 # --- Logger Konfiguration ---
 if logger is None:
@@ -93,9 +93,21 @@ def display_message(message: str, msg_type: str = 'info', duration: Optional[flo
         log.debug("Status Display Updated: '%s' (Type: %s, Duration: %s)", _current_message, _message_type, _message_duration)
     # else: Nachricht wurde nicht angezeigt, aber geloggt.
 
-def draw_status_display(screen: pygame.Surface):
+def get_ms_until_timeout() -> Optional[int]:
     """
-    Zeichnet die aktuelle Statusnachricht auf den Bildschirm.
+    Gibt zurück, in wie vielen Millisekunden die temporäre Nachricht abläuft.
+
+    Returns:
+        int | None: Verbleibende Millisekunden oder None, wenn keine befristete Nachricht angezeigt wird.
+    """
+    if _message_type == 'default' or _message_duration is None:
+        return None
+    remaining_s = _message_duration - (time.monotonic() - _message_start_time)
+    return max(0, int(remaining_s * 1000) + 1) # +1: danach ist die Nachricht sicher abgelaufen
+
+def get_display_state() -> Tuple[str, Tuple[int, int, int]]:
+    """
+    Gibt den aktuell anzuzeigenden Text und seine Farbe zurück.
     Wechselt zur Standardnachricht zurück, wenn die temporäre Nachricht abgelaufen ist.
     """
     global _current_message, _message_type, _message_start_time, _message_duration, _default_message
@@ -134,7 +146,16 @@ def draw_status_display(screen: pygame.Surface):
     # elif current_display_type == 'debug': text_color = config.GREY # Beispiel: Grau für Debug
     else: # default
         text_color = config.STATUS_TEXT_COLOR
+    return display_text, text_color
 
+def draw_status_display(screen: pygame.Surface) -> Optional[pygame.Rect]:
+    """
+    Zeichnet die aktuelle Statusnachricht auf den Bildschirm.
+
+    Returns:
+        pygame.Rect | None: Der gezeichnete Bereich (inkl. Hintergrund) oder None, wenn kein Text angezeigt wird.
+    """
+    display_text, text_color = get_display_state()
 
     # --- Text rendern und zeichnen ---
     if display_text: # Nur zeichnen, wenn Text vorhanden ist
@@ -155,6 +176,7 @@ def draw_status_display(screen: pygame.Surface):
 
             # Zeichne den Text über den Hintergrund
             screen.blit(text_surface, text_rect)
+            return bg_rect
 
         except AttributeError as e_cfg:
              log.error("Error accessing font/color config for status display: %s. Using fallbacks.", e_cfg)
@@ -164,8 +186,10 @@ def draw_status_display(screen: pygame.Surface):
                  fallback_surf = fallback_font.render(display_text, True, (255, 0, 0)) # Rot als Fehlerindikator
                  fallback_rect = fallback_surf.get_rect(midtop=(config.WIDTH // 2, 10)) # Feste Position oben mittig
                  screen.blit(fallback_surf, fallback_rect)
+                 return fallback_rect
              except Exception as e_fallback_draw:
                   log.critical("Cannot draw even fallback status text: %s", e_fallback_draw)
         except Exception as e:
             log.error("Error drawing status display: %s", e, exc_info=True)
+    return None
 
@@ -9,6 +9,7 @@ import sys # Für kritische Fehler
 import logger
 import pygame
 import config
+from typing import Optional
 
 # --- Logger Konfiguration ---
 if logger is None:
@@ -96,6 +97,17 @@ def get_elapsed_time_ms() -> int:
         # log.debug("Timer stopped. Returning paused time: %d ms", _elapsed_ms_before_pause) # Spammy
         return _elapsed_ms_before_pause
 
+def get_ms_until_next_second() -> Optional[int]:
+    """
+    Gibt zurück, in wie vielen Millisekunden sich die angezeigte Zeit ändert.
+
+    Returns:
+        int | None: Millisekunden bis zur nächsten vollen Sekunde oder None, wenn der Timer steht.
+    """
+    if not _is_running:
+        return None
+    return 1000 - get_elapsed_time_ms() % 1000
+
 def set_elapsed_time_ms(elapsed_ms: int):
     """
     Setzt die gespeicherte vergangene Zeit. Nützlich beim Laden eines Spiels.
@@ -139,12 +151,15 @@ def format_time(time_ms: int) -> str:
 
 # --- Zeichenfunktion ---
 
-def draw_game_timer(screen: pygame.Surface):
+def draw_game_timer(screen: pygame.Surface) -> Optional[pygame.Rect]:
     """
     Zeichnet den aktuellen Stand des Spielzeit-Timers auf den Bildschirm.
 
     Args:
         screen (pygame.Surface): Die Hauptzeichenfläche.
+
+    Returns:
+        pygame.Rect | None: Der gezeichnete Bereich (inkl. Hintergrund) oder None bei einem Fehler.
     """
     # log.debug("Drawing game timer...") # Sehr spammy
     try:
@@ -170,6 +185,7 @@ def draw_game_timer(screen: pygame.Surface):
 
         # Zeichne den Text über den Hintergrund
         screen.blit(text_surface, text_rect)
+        return bg_rect
 
     except AttributeError as e_cfg:
          log.error("Error accessing font/color config for timer display: %s. Using fallbacks.", e_cfg)
@@ -179,10 +195,12 @@ def draw_game_timer(screen: pygame.Surface):
              fallback_surf = fallback_font.render(format_time(get_elapsed_time_ms()), True, (255, 0, 0)) # Rot als Fehlerindikator
              fallback_rect = fallback_surf.get_rect(topleft=(10, 10)) # Feste Position
              screen.blit(fallback_surf, fallback_rect)
+             return fallback_rect
          except Exception as e_fallback_draw:
               log.critical("Cannot draw even fallback timer text: %s", e_fallback_draw)
     except Exception as e:
         log.error("Error drawing game timer: %s", e, exc_info=True)
+    return None
 
 def get_formatted_time() -> str:
     """
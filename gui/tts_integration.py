@@ -12,7 +12,7 @@ import chess
 import config
 import tts_utils
 import chess_utils
-from typing import Optional
+from typing import Optional, List
 # --- Logger Konfiguration ---
 if logger is None:
      print("FEHLER in tts_integration.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
@@ -291,3 +291,30 @@ def speak_san(san_move: str, interrupt: bool = False):
     except Exception as e:
         log.error("Error in speak_san for SAN '%s': %s", san_move, e, exc_info=True)
 
+
+def format_variation_for_speech(board: chess.Board, moves: List[chess.Move]) -> Optional[str]:
+    """
+    Formatiert eine Zugfolge (z.B. die Hauptvariante der KI) ab der gegebenen Stellung
+    für die Sprachausgabe. Züge werden mit Komma getrennt.
+    """
+    if not moves: return None
+    try:
+        board_copy = board.copy(stack=False)
+        parts = []
+        for move in moves:
+            parts.append(format_move_for_speech_from_san(board_copy.san(move)))
+            board_copy.push(move)
+        return ", ".join(parts)
+    except Exception as e:
+        log.error("Error formatting variation %s for speech: %s", [m.uci() for m in moves], e, exc_info=True)
+        return None
+
+def speak_principal_variation(board: chess.Board, moves: List[chess.Move], interrupt: bool = True):
+    """Sagt die von der KI geplante Zugfolge (Hauptvariante) an."""
+    if not config.ENABLE_TTS: return
+    speech_text = format_variation_for_speech(board, moves)
+    if speech_text:
+        log.debug("Requesting TTS speak for principal variation: '%s'", speech_text)
+        tts_utils.speak(f"Geplante Variante: {speech_text}", interrupt=interrupt)
+    else:
+        tts_utils.speak("Keine Variante verfügbar", interrupt=interrupt)
@@ -1,7 +1,346 @@
 from pythonjsonlogger import jsonlogger
 import logging
 import logging.handlers
+import copy
+import multiprocessing
 import os
+import queue
+import time
+import atexit
+import threading
+from typing import Optional, Dict, List, Union, Tuple
+
+# --- Globale Log-Stufe ---
+# None = jeder Logger verwendet die Stufe aus setup_logger(). Mit set_level() (z.B. aus config.LOG_LEVEL)
+# werden alle bisherigen und künftigen Logger auf eine gemeinsame Stufe gesetzt, etwa 'WARNING' für den
+# Produktivbetrieb. Heiße Pfade prüfen vor teuren Log-Argumenten log.isEnabledFor(...).
+_level_override: Optional[int] = None
+_loggers: List[logging.Logger] = []
+
+# --- Hintergrund-Schreiber ---
+# Pro Logdatei gibt es genau einen Datei-Handler, den ein einzelner Hintergrund-Thread bedient (_BatchWriter).
+# Die Logger legen ihre Einträge nur in eine begrenzte Queue; JSON-Formatierung und Dateizugriff finden
+# gesammelt und nicht im GUI- oder KI-Thread statt. Ist die Queue voll, wird der Eintrag verworfen und gezählt.
+FLUSH_INTERVAL_S = 0.5   # Höchstens so lange sammelt der Schreiber Einträge, bevor er schreibt
+QUEUE_SIZE = 10000       # Maximale Anzahl wartender Einträge pro Logdatei
+BATCH_SIZE = 256         # Maximale Anzahl Einträge pro Schreibvorgang
+_writers: Dict[str, '_BatchWriter'] = {}
+
+
+class _BatchWriter:
+    """
+    Schreibt Log-Einträge einer Datei gesammelt in einem Hintergrund-Thread.
+
+    Attributes:
+        dropped (int): Anzahl der wegen voller Queue verworfenen Einträge.
+        written (int): Anzahl der geschriebenen Einträge.
+    """
+    def __init__(self, file_handler: logging.FileHandler):
+        self._file_handler = file_handler
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.dropped = 0
+        self.written = 0
+        self._reported_dropped = 0
+        self._thread = threading.Thread(target=self._run, daemon=True, name="LogWriter")
+        self._thread.start()
+
+    def enqueue(self, record: Optional[logging.LogRecord]):
+        """Legt einen Eintrag in die Queue; blockiert nie (volle Queue = Eintrag verwerfen)."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _collect(self) -> Tuple[List[logging.LogRecord], bool]:
+        """Wartet auf den ersten Eintrag und sammelt weitere bis BATCH_SIZE oder FLUSH_INTERVAL_S."""
+        batch: List[logging.LogRecord] = []
+        record = self._queue.get()
+        if record is None:
+            return batch, True
+        batch.append(record)
+        deadline = time.monotonic() + FLUSH_INTERVAL_S
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                record = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is None:
+                return batch, True
+            batch.append(record)
+        return batch, False
+
+    def _write(self, batch: List[logging.LogRecord]):
+        """Formatiert die Einträge und schreibt sie mit einem einzigen write/flush."""
+        handler = self._file_handler
+        lines = []
+        for record in batch:
+            try:
+                lines.append(handler.format(record))
+            except Exception:
+                handler.handleError(record)
+        if self.dropped != self._reported_dropped:
+            lost = self.dropped - self._reported_dropped
+            self._reported_dropped = self.dropped
+            lines.append(handler.format(logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': "Log queue full: %d record(s) dropped (total: %d).", 'args': (lost, self.dropped)})))
+        if not lines:
+            return
+        try:
+            if handler.stream is None:
+                handler.stream = handler._open()
+            handler.stream.write(handler.terminator.join(lines) + handler.terminator)
+            handler.stream.flush()
+            self.written += len(batch)
+            if isinstance(handler, logging.handlers.RotatingFileHandler) and handler.maxBytes > 0 \
+               and handler.stream.tell() >= handler.maxBytes:
+                handler.doRollover()
+        except Exception:
+            handler.handleError(batch[-1])
+
+    def _run(self):
+        """Schreibschleife des Hintergrund-Threads (endet mit dem Eintrag None)."""
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            self._write(batch)
+        self._file_handler.close()
+
+    def close(self, timeout: float = 2.0):
+        """Schreibt alle wartenden Einträge und beendet den Thread."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+
+class _BatchQueueHandler(logging.Handler):
+    """
+    Handler der Logger: reicht Einträge ohne JSON-Formatierung und ohne Datei-Lock an den _BatchWriter weiter.
+    Nachricht und Traceback werden vorher in Text umgewandelt (wie logging.handlers.QueueHandler.prepare),
+    damit veränderliche Argumente (z.B. ein Brett, auf dem danach gezogen wird) den Stand beim Loggen zeigen.
+    """
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, writer: _BatchWriter):
+        super().__init__()
+        self.writer = writer
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Gibt eine Kopie des Eintrags mit fertig formatierter Nachricht und Traceback-Text zurück."""
+        # Kopie: Weitere Handler (Konsole, Root-Logger) erhalten den unveränderten Eintrag
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Kein Handler-Lock nötig: die Queue ist threadsicher
+        if self.filter(record):
+            self.emit(record)
+            return True
+        return False
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.writer.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+_queue_handlers: Dict[str, _BatchQueueHandler] = {}
+
+# --- Arbeitsprozesse (multiprocessing) ---
+# Mehrere Prozesse dürfen nicht dieselbe Logdatei rotieren (unter Windows schlägt das Umbenennen fehl, unter
+# POSIX verteilen sich die Sicherungen). Arbeitsprozesse schreiben deshalb nie selbst: Ihre Einträge gehen über
+# eine multiprocessing-Queue an den Hauptprozess, dessen _BatchWriter sie schreibt. Der Hauptprozess erzeugt die
+# Queue mit get_process_queue() und übergibt sie dem Initializer des Pools, der init_worker() aufruft. Einträge,
+# die vorher entstehen (Modulimporte im Arbeitsprozess), werden bis dahin zwischengespeichert.
+_LogTarget = Tuple[str, bool, int, int]   # (Logdatei, rotate, max_bytes, backup_count)
+_is_worker_process = multiprocessing.parent_process() is not None
+_process_queue = None                     # Hauptprozess: Queue, aus der der Listener-Thread liest
+_process_listener: Optional[threading.Thread] = None
+_worker_queue = None                      # Arbeitsprozess: Queue zum Hauptprozess (gesetzt von init_worker())
+_worker_backlog: List[Tuple[_LogTarget, logging.LogRecord]] = []
+_worker_dropped = 0
+
+
+def _send_to_parent(target: _LogTarget, record: logging.LogRecord):
+    """Sendet einen vorbereiteten Eintrag an den Hauptprozess (oder merkt ihn bis init_worker() vor)."""
+    global _worker_dropped
+    if _worker_queue is not None:
+        _worker_queue.put((target, record))
+    elif len(_worker_backlog) < QUEUE_SIZE:
+        _worker_backlog.append((target, record))
+    else:
+        _worker_dropped += 1
+
+
+class _ProcessQueueHandler(_BatchQueueHandler):
+    """Handler im Arbeitsprozess: sendet vorbereitete Einträge an den Schreiber des Hauptprozesses."""
+    def __init__(self, target: _LogTarget):
+        logging.Handler.__init__(self)
+        self.target = target
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            _send_to_parent(self.target, self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+def _parse_level(level: Union[int, str]) -> int:
+    """Wandelt eine Log-Stufe ('DEBUG', 'WARNING', 20, ...) in den numerischen Wert um."""
+    if isinstance(level, str):
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unbekannte Log-Stufe: {level}")
+        return value
+    return int(level)
+
+def set_level(level: Union[int, str]):
+    """
+    Setzt die Log-Stufe aller mit setup_logger() erstellten Logger (auch künftiger).
+    """
+    global _level_override
+    _level_override = _parse_level(level)
+    for logger in _loggers:
+        logger.setLevel(_level_override)
+        for handler in logger.handlers:
+            if not isinstance(handler, _BatchQueueHandler):
+                handler.setLevel(_level_override)
+
+def get_level() -> Optional[int]:
+    """Gibt die mit set_level() gesetzte Log-Stufe zurück (None = Stufe pro Logger)."""
+    return _level_override
+
+def configure(flush_interval_ms: Optional[int] = None, queue_size: Optional[int] = None,
+              batch_size: Optional[int] = None):
+    """Passt die Parameter des Hintergrund-Schreibers an (gilt auch für bereits laufende Schreiber)."""
+    global FLUSH_INTERVAL_S, QUEUE_SIZE, BATCH_SIZE
+    if flush_interval_ms is not None:
+        FLUSH_INTERVAL_S = max(0, flush_interval_ms) / 1000.0
+    if batch_size is not None:
+        BATCH_SIZE = max(1, batch_size)
+    if queue_size is not None:
+        QUEUE_SIZE = max(1, queue_size)
+        for writer in _writers.values():
+            writer._queue.maxsize = QUEUE_SIZE
+
+def get_stats() -> Dict[str, Dict[str, int]]:
+    """Gibt pro Logdatei die Anzahl geschriebener und verworfener Einträge zurück."""
+    return {path: {'written': writer.written, 'dropped': writer.dropped} for path, writer in _writers.items()}
+
+def _make_formatter() -> logging.Formatter:
+    """Erstellt den JSON-Formatter aller Logger."""
+    return jsonlogger.JsonFormatter(
+        '%(asctime)s %(name)s %(levelname)s %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+def _get_queue_handler(log_file: str, json_formatter: logging.Formatter, rotate: bool,
+                       max_bytes: int, backup_count: int) -> _BatchQueueHandler:
+    """
+    Gibt den gemeinsamen Handler der Logdatei zurück; legt Datei-Handler und Schreiber beim ersten Aufruf an.
+    In Arbeitsprozessen wird keine Datei geöffnet, sondern an den Hauptprozess weitergeleitet.
+    """
+    key = os.path.abspath(log_file)
+    handler = _queue_handlers.get(key)
+    if handler is not None:
+        return handler
+    if _is_worker_process:
+        handler = _ProcessQueueHandler((key, rotate, max_bytes, backup_count))
+        _queue_handlers[key] = handler
+        return handler
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    if rotate:
+        fh = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+    else:
+        fh = logging.FileHandler(log_file, encoding='utf-8')
+    fh.setFormatter(json_formatter)
+    writer = _BatchWriter(fh)
+    _writers[key] = writer
+    handler = _BatchQueueHandler(writer)
+    _queue_handlers[key] = handler
+    return handler
+
+def _listen(process_queue):
+    """Listener-Thread im Hauptprozess: übergibt die Einträge der Arbeitsprozesse an den Schreiber ihrer Datei."""
+    json_formatter = _make_formatter()
+    while True:
+        try:
+            item = process_queue.get()
+        except (EOFError, OSError):
+            break
+        if item is None:
+            break
+        (log_file, rotate, max_bytes, backup_count), record = item
+        _get_queue_handler(log_file, json_formatter, rotate, max_bytes, backup_count).handle(record)
+
+def get_process_queue(context=None):
+    """
+    Gibt die Queue zurück, über die Arbeitsprozesse ins Log des Hauptprozesses schreiben (an init_worker()
+    übergeben). Startet beim ersten Aufruf den Listener-Thread.
+
+    Args:
+        context: multiprocessing-Kontext des Pools (z.B. multiprocessing.get_context('spawn')).
+    """
+    global _process_queue, _process_listener
+    if _is_worker_process and _worker_queue is not None:
+        return _worker_queue # Pool eines Arbeitsprozesses: direkt an den Hauptprozess weiterreichen
+    if _process_queue is None:
+        _process_queue = (context or multiprocessing).Queue()
+        _process_listener = threading.Thread(target=_listen, args=(_process_queue,), daemon=True,
+                                             name="LogListener")
+        _process_listener.start()
+    return _process_queue
+
+def init_worker(process_queue, level: Optional[Union[int, str]] = None):
+    """
+    Im Initializer eines Arbeitsprozesses aufrufen: leitet alle Logeinträge über process_queue
+    (siehe get_process_queue()) an den Hauptprozess und setzt optional die Log-Stufe.
+    """
+    global _worker_queue, _worker_dropped
+    if level is not None:
+        set_level(level)
+    _worker_queue = process_queue
+    for target, record in _worker_backlog:
+        process_queue.put((target, record))
+    _worker_backlog.clear()
+    if _worker_dropped:
+        log.warning("Log backlog full before worker initialization: %d record(s) dropped.", _worker_dropped)
+        _worker_dropped = 0
+
+def shutdown():
+    """
+    Schreibt alle noch wartenden Einträge und beendet Listener- und Schreiber-Threads (beim Programmende).
+    Die Handler werden von den Loggern entfernt; spätere Einträge landen damit nicht mehr in einer toten
+    Queue, sondern gehen an logging.lastResort (Warnungen und Fehler auf stderr).
+    """
+    global _process_queue, _process_listener
+    if _process_queue is not None:
+        _process_queue.put(None)
+        _process_listener.join(2.0)
+        _process_queue = None
+        _process_listener = None
+    for writer in list(_writers.values()):
+        writer.close()
+    for logger in _loggers:
+        for handler in list(logger.handlers):
+            if isinstance(handler, _BatchQueueHandler):
+                logger.removeHandler(handler)
+    _writers.clear()
+    _queue_handlers.clear()
+
+atexit.register(shutdown)
 
 def setup_logger(
     name: str,
@@ -14,15 +353,15 @@ def setup_logger(
 ) -> logging.Logger:
     """
     Erstellt einen Logger mit JSON-Format.
+    Dateiausgaben laufen über eine Queue an einen Hintergrund-Thread (siehe _BatchWriter).
     """
+    if _level_override is not None:
+        level = _level_override
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
     # JSON Formatter
-    json_formatter = jsonlogger.JsonFormatter(
-        '%(asctime)s %(name)s %(levelname)s %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    json_formatter = _make_formatter()
 
     if logger.hasHandlers():
         logger.handlers.clear()
@@ -34,17 +373,10 @@ def setup_logger(
         logger.addHandler(ch)
 
     if log_file:
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        if rotate:
-            fh = logging.handlers.RotatingFileHandler(
-                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
-            )
-        else:
-            fh = logging.FileHandler(log_file, encoding='utf-8')
-        fh.setLevel(level)
-        fh.setFormatter(json_formatter)
-        logger.addHandler(fh)
+        logger.addHandler(_get_queue_handler(log_file, json_formatter, rotate, max_bytes, backup_count))
 
+    if logger not in _loggers:
+        _loggers.append(logger)
     return logger
 
 
@@ -9,12 +9,18 @@ import logging
 import sys # Für kritische Fehler
 import os # Für sys.path Manipulation (Fallback)
 import queue
-import threading
-from typing import List, Tuple, Any # Für Type Hinting
+import multiprocessing # Für freeze_support (parallele KI-Suche)
+from typing import List, Tuple, Any, Optional, Dict # Für Type Hinting
 import pygame
 # Importiere file_io hier nicht mehr direkt, save/load läuft über save_load_logic
 import config
+import engine_config # KI-Einstellungen (AI_DEPTH, AI_PONDER_ENABLED, ...)
 import ai_opponent
+import parallel_search
+import opening_book
+import endgame_tablebase
+from search_position import SearchPosition
+from ai_search import AISearch, format_progress, start_ponder_search
 from game_state import GameState
 import animations
 import chess_utils
@@ -41,8 +47,7 @@ from gui import tts_integration
 from gui import fullscreen_logic
 from gui import timer_logic
 from gui import status_display
-from gui import menu_logic
-from gui import chess_gui
+from gui import game_renderer # Zeichnet den Spielzustand nur in geänderten Bereichen
 from gui import save_load_logic # Geändert: save/load wird jetzt hierüber aufgerufen
 from gui import navigation_logic # Für Aktionen nach Undo/Redo
 log.debug("Alle GUI-Module erfolgreich importiert.")
@@ -52,6 +57,56 @@ log.debug("Alle GUI-Module erfolgreich importiert.")
 # --- Globale Variable für Hintergrundmusik-Status ---
 _background_music_loaded = False
 
+# Eigenes Ereignis: Eine KI-Suche ist fertig (weckt die im Leerlauf wartende Hauptschleife)
+AI_SEARCH_FINISHED_EVENT = pygame.event.custom_type()
+
+def _notify_ai_search_finished():
+    """Wird im Such-Thread aufgerufen und legt AI_SEARCH_FINISHED_EVENT in die Pygame-Ereignisqueue."""
+    try:
+        pygame.event.post(pygame.event.Event(AI_SEARCH_FINISHED_EVENT))
+    except pygame.error as e: # z.B. Pygame bereits beendet
+        log.debug("Could not post AI_SEARCH_FINISHED_EVENT: %s", e)
+
+def _get_idle_timeout_ms(app_state: str, gs: GameState, game_gui_state: Dict[str, Any]) -> int:
+    """
+    Bestimmt, wie lange die Hauptschleife nach dem Frame blockierend auf Ereignisse warten darf,
+    ohne dass eine Anzeigeänderung verpasst wird.
+
+    Returns:
+        int: Wartezeit in Millisekunden; 0 = nächster Frame mit voller Bildrate
+             (Menüs und Übergänge, Animationen, ausstehender Neuaufbau oder KI-Start).
+    """
+    if not config.IDLE_WAIT_ENABLED or app_state != 'GAME':
+        return 0
+    if animations.is_animating() or game_renderer.redraw_pending():
+        return 0
+    if not game_gui_state['menu_active'] and not game_gui_state['game_over'] and not game_gui_state['ai_thinking'] \
+            and game_gui_state.get('player_turn_finished', False) \
+            and config.AI_ENABLED and gs.board.turn == config.AI_PLAYER:
+        return 0 # Die KI wird im nächsten Frame gestartet
+
+    timeouts = [config.IDLE_MAX_WAIT_MS, timer_logic.get_ms_until_next_second(), status_display.get_ms_until_timeout()]
+    if config.HIGHLIGHT_LEGAL_MOVES and event_handler.get_selected_square() is not None \
+            and event_handler.get_source_square() is not None:
+        timeouts.append(game_renderer.get_ms_until_blink_change())
+    if game_gui_state['ai_thinking']:
+        timeouts.append(config.AI_PROGRESS_POLL_MS) # Fortschritt anzeigen; der fertige Zug weckt per Ereignis
+    return max(1, min(timeout for timeout in timeouts if timeout is not None))
+
+def _cancel_ai_search(ai_search: Optional[AISearch]):
+    """
+    Bricht eine laufende KI-Suche ab und wartet kurz auf das Ende des Such-Threads.
+    Läuft er länger, wartet die nächste Suche in ai_opponent.find_best_move auf ihn (eine Suche pro Prozess).
+    """
+    if ai_search is None or not ai_search.is_running():
+        return
+    ai_search.cancel()
+    ai_search.join(timeout=1.0)
+    if ai_search.is_running():
+        log.warning("AI search thread did not stop within 1 s after cancel; the next search waits for it.")
+    else:
+        log.info("AI search stopped.")
+
 def main():
     """
     Initialisiert das Spiel und startet die Hauptschleife mit Zustandsmaschine.
@@ -233,22 +288,28 @@ def main():
 
     running = True
 
-    # --- KI-Thread Management ---
-    ai_move_queue = queue.Queue()
-    ai_thread = None
+    # --- KI-Such-Management (Suche läuft in einem eigenen Thread, siehe ai_search.AISearch) ---
+    ai_search: Optional[AISearch] = None
+    ponder_search: Optional[AISearch] = None # Suche auf der vorhergesagten Antwort während der Bedenkzeit des Spielers
+
+    # Ereignis, das das Warten im Leerlauf beendet hat (wird im nächsten Durchlauf zuerst verarbeitet)
+    pending_events: List[pygame.event.Event] = []
 
     # --- Hauptschleife ---
     while running:
         current_time_ms = pygame.time.get_ticks()
-        events = pygame.event.get()
+        events = pending_events + pygame.event.get()
+        pending_events = []
         for event in events:
             if event.type == pygame.QUIT:
                 log.info("QUIT event received. Initiating shutdown.")
                 running = False
-                if app_state == 'GAME' and ai_thread and ai_thread.is_alive():
-                    log.warning("AI thread still alive during shutdown request.")
+                _cancel_ai_search(ai_search); _cancel_ai_search(ponder_search)
                 continue # Direkt zur nächsten Iteration (oder Schleifenende)
 
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                game_renderer.invalidate() # Fensterinhalt war verdeckt: einmal vollständig neu zeichnen
+
             if event.type == pygame.VIDEORESIZE:
                 if not fullscreen_logic.get_fullscreen_state():
                     old_width, old_height = config.WIDTH, config.HEIGHT
@@ -263,7 +324,9 @@ def main():
                         if board_display:
                             board_display.board_offset_x = config.BOARD_OFFSET_X
                             board_display.board_offset_y = config.BOARD_OFFSET_Y
+                            board_display.invalidate_static_layers() # Neues Fenster: Ebenen im passenden Pixelformat erstellen
                         config.STATUS_POS_X = config.WIDTH // 2
+                        game_renderer.invalidate()
                         log.info("Window resized successfully to %dx%d", config.WIDTH, config.HEIGHT)
                     except pygame.error as e:
                         log.error("Error handling window resize: %s", e, exc_info=True)
@@ -288,14 +351,18 @@ def main():
                        if board_display:
                            board_display.board_offset_x = config.BOARD_OFFSET_X
                            board_display.board_offset_y = config.BOARD_OFFSET_Y
+                           board_display.invalidate_static_layers() # Neues Fenster: Ebenen im passenden Pixelformat erstellen
                        config.STATUS_POS_X = config.WIDTH // 2
+                       game_renderer.invalidate()
                        log.info("Fullscreen toggled. New window size: %dx%d", new_width, new_height)
                     except Exception as e:
                         log.error("Error toggling fullscreen: %s", e, exc_info=True)
                     continue # F11 verarbeitet
 
-        # --- Hintergrund zeichnen ---
-        screen.fill(config.WINDOW_BACKGROUND_COLOR)
+        # --- Hintergrund zeichnen (der Spielzustand zeichnet selbst, siehe game_renderer) ---
+        if app_state != 'GAME':
+            screen.fill(config.WINDOW_BACKGROUND_COLOR)
+            game_renderer.invalidate() # Beim Eintritt in den Spielzustand das ganze Fenster neu zeichnen
         if app_state in ['MAIN_MENU', 'NEW_GAME_SUBMENU', 'ANIMATING_TO_SUB', 'ANIMATING_TO_MAIN']:
             # Sicherstellen, dass die Funktionen existieren
             if hasattr(startup_logic, '_update_background_game') and callable(startup_logic._update_background_game) and \
@@ -323,6 +390,8 @@ def main():
                 # Rufe die angepasste Ladefunktion auf, die gs und gui_state aktualisiert
                 if save_load_logic.load_game(gs, game_gui_state):
                     log.info("Game loaded successfully.")
+                    ai_opponent.reset_transposition_table()
+                    opening_book.reset_game() # Neue Partie: Eröffnungsbuch wieder befragen
                     if config.mixer_initialized: pygame.mixer.music.stop(); log.debug("Stopped background music (if playing).")
                     # Setze GUI-Status basierend auf geladenem Zustand
                     game_gui_state['game_over'] = gs.is_game_over()
@@ -365,12 +434,16 @@ def main():
                 if config.mixer_initialized: pygame.mixer.music.stop(); log.debug("Stopped background music (if playing).")
                 gs.reset_game()
                 gs.board.clear_board() # Brett leeren vor Animation
+                ai_opponent.reset_transposition_table() # Suchergebnisse der alten Partie verwerfen
+                opening_book.reset_game() # Neue Partie: Eröffnungsbuch wieder befragen
                 log.debug("GameState reset, board cleared.")
                 # Setze AI Konfiguration basierend auf Auswahl
                 config.AI_ENABLED = (action == 'START_AI')
                 if config.AI_ENABLED:
                     config.AI_PLAYER = chess.BLACK # Standardmäßig spielt AI Schwarz
-                    log.info("AI Enabled set to: True, Player: BLACK, Depth: %d", config.AI_DEPTH)
+                    log.info("AI Enabled set to: True, Player: BLACK, Depth: %d", engine_config.AI_DEPTH)
+                    parallel_search.warm_up() # Arbeitsprozesse der parallelen Suche vorab starten
+                    opening_book.load() # Buch einmal in den Speicher laden (nicht erst beim ersten KI-Zug)
                 else:
                     log.info("AI Enabled set to: False")
 
@@ -462,8 +535,7 @@ def main():
 
         # === ZUSTAND: ANIMATING_PIECE_SETUP ===
         elif app_state == 'ANIMATING_PIECE_SETUP':
-            board_display.draw_board(screen)
-            board_display.draw_coordinates(screen, flipped=game_gui_state.get('board_flipped', False))
+            board_display.draw_static_board(screen, flipped=game_gui_state.get('board_flipped', False))
             board_display.draw_pieces(screen, gs.board) # Zeichnet bisher platzierte
 
             if piece_setup_index < len(start_pieces_with_squares) and \
@@ -498,12 +570,18 @@ def main():
             if exit_action: log.debug("Event handler returned action: '%s'", exit_action)
             if exit_action == 'QUIT':
                  log.info("Quit action received from game event handler.")
+                 _cancel_ai_search(ai_search); _cancel_ai_search(ponder_search)
                  running = False; continue
+            elif exit_action == 'AI_MOVE_NOW':
+                 if ai_search is not None and game_gui_state['ai_thinking']:
+                     ai_search.move_now()
             elif exit_action == 'TO_MAIN_MENU':
                  log.info("Return to Main Menu action received.")
                  timer_logic.stop_game_timer()
                  if config.mixer_initialized: pygame.mixer.music.stop(); log.debug("Stopped background music.")
-                 if ai_thread and ai_thread.is_alive(): log.warning("AI thread still active when returning to menu.")
+                 _cancel_ai_search(ai_search); _cancel_ai_search(ponder_search)
+                 ponder_search = None
+                 game_gui_state['ai_thinking'] = False
                  startup_logic.initialize_main_menu()
                  log.info("Changing state from '%s' to 'MAIN_MENU'", current_app_state)
                  app_state = 'MAIN_MENU'
@@ -521,7 +599,11 @@ def main():
             elif exit_action == 'NEW_GAME_REQUESTED':
                 log.info("New Game requested from in-game menu.")
                 if config.mixer_initialized: pygame.mixer.music.stop(); log.debug("Stopped background music.")
+                _cancel_ai_search(ai_search); _cancel_ai_search(ponder_search)
+                ponder_search = None
                 gs.reset_game(); gs.board.clear_board()
+                ai_opponent.reset_transposition_table()
+                opening_book.reset_game() # Neue Partie: Eröffnungsbuch wieder befragen
                 log.debug("GameState reset, board cleared for new game.")
                 # Behalte aktuelle AI Einstellung bei Neustart aus dem Spiel
                 log.info("Restarting game with current AI settings (Enabled: %s).", config.AI_ENABLED)
@@ -538,6 +620,10 @@ def main():
                 continue
             elif exit_action == 'GAME_LOADED': # Spezielles Signal von event_handler nach erfolgreichem Laden
                  log.info("Action 'GAME_LOADED' received. Resetting GUI state.")
+                 _cancel_ai_search(ai_search); _cancel_ai_search(ponder_search)
+                 ponder_search = None
+                 ai_opponent.reset_transposition_table()
+                 opening_book.reset_game() # Neue Partie: Eröffnungsbuch wieder befragen
                  # Setze GUI-Status basierend auf geladenem Zustand (wurde in load_game gemacht)
                  game_gui_state['game_over'] = gs.is_game_over()
                  game_gui_state['menu_active'] = False
@@ -555,6 +641,9 @@ def main():
 
             elif exit_action == 'UNDO_PERFORMED' or exit_action == 'REDO_PERFORMED':
                 log.info("Action performed: %s", exit_action)
+                # Die vorhergesagte Stellung passt nach Undo/Redo nicht mehr
+                _cancel_ai_search(ponder_search)
+                ponder_search = None
                 status_display.update_default_status(gs)
                 # Timer wird gestoppt bei Undo, muss ggf. wieder gestartet werden
                 if not game_gui_state['game_over'] and not game_gui_state['menu_active']:
@@ -588,28 +677,42 @@ def main():
                     log.debug("Conditions met to start AI move calculation.")
                     game_gui_state['ai_thinking'] = True
                     valid_moves = gs.get_valid_moves()
-                    if valid_moves:
+                    if ponder_search is not None and valid_moves and ponder_search.matches(gs.board):
+                        # Ponder-Treffer: Die Suche läuft mit warmer TT und History einfach weiter
+                        log.info("AI turn: Ponder hit, continuing background search.")
+                        status_display.display_message("KI denkt...", 'info')
+                        ai_search = ponder_search
+                        ai_search.ponder_hit()
+                        ponder_search = None
+                    elif valid_moves:
+                        if ponder_search is not None:
+                            # Ponder-Fehlschlag: Suche verwerfen, die Transpositionstabelle bleibt erhalten
+                            log.info("AI turn: Ponder miss, starting new search.")
+                            _cancel_ai_search(ponder_search)
+                            ponder_search = None
                         log.info("AI turn: Starting thinking process...")
                         status_display.display_message("KI denkt...", 'info')
-                        # Übergebe eine Kopie von gs an den Thread
-                        gs_copy_for_ai = gs.copy()
-                        ai_thread = threading.Thread(target=ai_opponent.find_best_move, args=(gs_copy_for_ai, valid_moves, ai_move_queue), daemon=True, name="AI_Thread")
-                        ai_thread.start()
-                        log.debug("AI thread '%s' started with a copy of GameState.", ai_thread.name)
+                        # Die Suche bekommt nur eine schlanke Kopie des Bretts, nicht den GameState
+                        ai_search = AISearch(SearchPosition.from_game_state(gs), valid_moves,
+                                             on_finished=_notify_ai_search_finished)
+                        ai_search.start()
+                        log.debug("AI search started with a SearchPosition copy of the board.")
                     else:
                         log.warning("AI is turn, but no valid moves available. Game should be over?")
                         game_gui_state['ai_thinking'] = False
                         status_display.update_default_status(gs)
 
                 # Verarbeite Ergebnis des KI-Threads
-                if game_gui_state['ai_thinking']:
+                if game_gui_state['ai_thinking'] and ai_search is not None:
                     try:
-                        if ai_thread and not ai_thread.is_alive() and ai_move_queue.empty():
-                            log.warning("AI thread finished, but move queue is empty.")
-                            game_gui_state['ai_thinking'] = False
-                            status_display.update_default_status(gs)
-
-                        ai_move = ai_move_queue.get_nowait()
+                        # Live-Suchinfo (Tiefe, Bewertung, Knoten, Variante) in der Statuszeile
+                        progress = ai_search.poll_progress()
+                        if progress:
+                            status_display.display_message(format_progress(progress), 'info')
+
+                        search_done, ai_move = ai_search.poll_result()
+                        if not search_done:
+                            raise queue.Empty # KI rechnet noch
                         log.info("AI finished. Received move: %s", ai_move.uci() if ai_move else 'None')
 
                         if ai_move:
@@ -619,6 +722,9 @@ def main():
                                 log.info("Executing AI move: %s", ai_move.uci())
                                 # _execute_move modifiziert den Haupt-GameState (gs)
                                 event_handler._execute_move(gs, game_gui_state, ai_move)
+                                # Pondering: Während der Spieler überlegt, die erwartete Antwort weiter durchsuchen
+                                if engine_config.AI_PONDER_ENABLED and not gs.is_game_over():
+                                    ponder_search = start_ponder_search(gs, ai_move, on_finished=_notify_ai_search_finished)
                             else:
                                 log.error("AI returned move %s which is currently NOT legal in main GameState!", ai_move.uci())
                                 status_display.display_message("KI Fehler (illegaler Zug)", 'error')
@@ -646,34 +752,27 @@ def main():
                         game_gui_state['ai_thinking'] = False
 
 
-            # --- Zeichnen im Spielzustand ---
-            if is_animating_move:
-                animations.update_animation(screen, gs, board_display)
-            else:
-                chess_gui.draw_game_state(
-                    screen, gs, board_display,
-                    selected_square_index=event_handler.get_selected_square(),
-                    source_square_index=event_handler.get_source_square(),
-                    last_move=game_gui_state.get('last_move'),
-                    board_flipped=game_gui_state.get('board_flipped', False)
-                )
-
-            timer_logic.draw_game_timer(screen)
-            status_display.draw_status_display(screen)
-
-            if game_gui_state['menu_active']:
-                current_highlight = menu_logic.get_highlighted_index()
-                menu_logic.draw_menu(screen, current_highlight)
-            elif game_gui_state['game_over']: # Zeichne Spielende-Text nur wenn kein Menü aktiv ist
-                 game_over_text = chess_utils.get_game_over_text(gs.board)
-                 if game_over_text:
-                     chess_gui.draw_game_over_text(screen, game_over_text)
+            # --- Zeichnen im Spielzustand (nur geänderte Bereiche, siehe game_renderer) ---
+            game_renderer.draw_game_frame(
+                screen, gs, board_display, game_gui_state,
+                selected=event_handler.get_selected_square(),
+                source=event_handler.get_source_square(),
+                animating=is_animating_move
+            )
 
 
         # --- Allgemeines Update & Framerate ---
-        pygame.display.flip() # Zeigt den neu gezeichneten Frame an
+        if current_app_state != 'GAME': # Der Spielzustand zeigt seine Bereiche selbst an (game_renderer)
+            pygame.display.flip() # Zeigt den neu gezeichneten Frame an
         clock.tick(config.TARGET_FPS) # Wartet, um FPS zu begrenzen
 
+        # --- Leerlauf: bis zum nächsten Ereignis oder zur nächsten fälligen Anzeigeänderung schlafen ---
+        idle_timeout_ms = _get_idle_timeout_ms(app_state, gs, game_gui_state)
+        if idle_timeout_ms > 0:
+            waited_event = pygame.event.wait(idle_timeout_ms)
+            if waited_event.type != pygame.NOEVENT:
+                pending_events.append(waited_event)
+
     # --- Aufräumen vor dem Beenden ---
     log.info("Main loop exited. Initiating shutdown sequence...")
     if config.mixer_initialized:
@@ -682,8 +781,10 @@ def main():
         pygame.mixer.quit()
         log.info("Quit Pygame Mixer.")
 
-    if ai_thread and ai_thread.is_alive():
-         log.warning("AI thread is still alive during final shutdown, but set as daemon.")
+    _cancel_ai_search(ai_search)
+    _cancel_ai_search(ponder_search)
+    parallel_search.shutdown_pool()
+    endgame_tablebase.close()
 
     pygame.quit()
     log.info("Pygame quit successfully.")
@@ -692,6 +793,7 @@ def main():
 
 # --- Startpunkt des Programms ---
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # Nötig für die Arbeitsprozesse der parallelen Suche in der PyInstaller-Exe
     # log.debug("Default save filename from file_io: %s", file_io.DEFAULT_SAVE_FILENAME) # file_io nicht mehr direkt importieren
     main()
 
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul enthält die Zugsortierung für die Alpha-Beta-Suche der KI.
+Je früher der beste Zug untersucht wird, desto mehr Äste schneidet Alpha-Beta ab.
+Reihenfolge: Zug aus der Transpositionstabelle, Schlagzüge nach MVV-LVA
+(wertvollstes Opfer zuerst, billigster Angreifer zuerst), Killerzüge der aktuellen
+Suchebene und zuletzt ruhige Züge nach der History-Heuristik.
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import logger
+import chess
+import engine_config
+from typing import Optional, List
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in move_ordering.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Sortierschlüssel (höher = früher untersucht) ---
+SCORE_TT_MOVE = 10_000_000
+SCORE_CAPTURE = 1_000_000   # + MVV-LVA-Wert
+SCORE_KILLER_1 = 900_000
+SCORE_KILLER_2 = 800_000
+HISTORY_MAX = 700_000       # History-Werte bleiben unterhalb der Killerzüge
+
+MAX_PLY = 128               # Maximale Suchebene für Killerzüge
+KILLERS_PER_PLY = 2
+
+
+def mvv_lva_score(board: chess.Board, move: chess.Move) -> int:
+    """
+    Bewertet einen Schlagzug nach MVV-LVA mit den Figurenwerten aus engine_config.PIECE_VALUES.
+    Der Wert des Opfers dominiert, der Angreifer entscheidet nur bei gleichem Opfer.
+    """
+    if board.is_en_passant(move):
+        victim_value = engine_config.PIECE_VALUES[chess.PAWN]
+    else:
+        victim = board.piece_type_at(move.to_square)
+        victim_value = engine_config.PIECE_VALUES.get(victim, 0) if victim else 0
+    attacker = board.piece_type_at(move.from_square)
+    attacker_value = engine_config.PIECE_VALUES.get(attacker, 0) if attacker else 0
+    return victim_value * 10 - attacker_value // 100
+
+
+class MoveOrderer:
+    """
+    Sortiert Züge für die Suche und merkt sich Killerzüge und History-Werte.
+
+    Attributes:
+        killers (List[List[Optional[chess.Move]]]): Pro Suchebene die letzten ruhigen Züge mit Beta-Cutoff.
+        history (List[List[int]]): History-Werte, indiziert mit [Farbe][von * 64 + nach].
+    """
+    def __init__(self):
+        self.killers: List[List[Optional[chess.Move]]] = [[None] * KILLERS_PER_PLY for _ in range(MAX_PLY)]
+        self.history: List[List[int]] = [[0] * 4096, [0] * 4096]
+        log.debug("MoveOrderer initialized (Max Ply: %d).", MAX_PLY)
+
+    def new_search(self):
+        """
+        Bereitet eine neue Suche vor: Killerzüge werden verworfen, History-Werte halbiert,
+        damit ältere Erfahrungen an Gewicht verlieren, aber nicht ganz verloren gehen.
+        """
+        for ply_killers in self.killers:
+            for i in range(KILLERS_PER_PLY):
+                ply_killers[i] = None
+        for color_table in self.history:
+            for i in range(4096):
+                if color_table[i]:
+                    color_table[i] >>= 1
+
+    def clear(self):
+        """Setzt Killerzüge und History vollständig zurück (z.B. bei einem neuen Spiel)."""
+        self.__init__()
+
+    def score_move(self, board: chess.Board, move: chess.Move,
+                   tt_move: Optional[chess.Move], ply: int) -> int:
+        """Berechnet den Sortierschlüssel eines Zuges (höher = früher untersuchen)."""
+        if move == tt_move:
+            return SCORE_TT_MOVE
+        if board.is_capture(move):
+            return SCORE_CAPTURE + mvv_lva_score(board, move)
+        if move.promotion:
+            return SCORE_CAPTURE + engine_config.PIECE_VALUES.get(move.promotion, 0)
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if move == killers[0]:
+                return SCORE_KILLER_1
+            if move == killers[1]:
+                return SCORE_KILLER_2
+        return self.history[board.turn][move.from_square * 64 + move.to_square]
+
+    def order_moves(self, board: chess.Board, moves: List[chess.Move],
+                    tt_move: Optional[chess.Move] = None, ply: int = 0) -> List[chess.Move]:
+        """
+        Gibt die Züge sortiert zurück (bester Kandidat zuerst).
+
+        Args:
+            board (chess.Board): Die Stellung *vor* den Zügen.
+            moves (List[chess.Move]): Die zu sortierenden (legalen) Züge.
+            tt_move (chess.Move, optional): Bester Zug aus der Transpositionstabelle.
+            ply (int): Aktuelle Suchebene (für Killerzüge).
+        """
+        return sorted(moves, key=lambda m: self.score_move(board, m, tt_move, ply), reverse=True)
+
+    def record_cutoff(self, board: chess.Board, move: chess.Move, depth: int, ply: int):
+        """
+        Merkt sich einen ruhigen Zug, der einen Beta-Cutoff verursacht hat
+        (als Killerzug seiner Ebene und in der History-Tabelle).
+        Schlagzüge und Umwandlungen werden bereits über MVV-LVA vorn einsortiert.
+
+        Args:
+            board (chess.Board): Die Stellung *vor* dem Zug.
+        """
+        if board.is_capture(move) or move.promotion:
+            return
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        color_table = self.history[board.turn]
+        index = move.from_square * 64 + move.to_square
+        color_table[index] = min(HISTORY_MAX, color_table[index] + depth * depth)
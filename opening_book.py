@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul stellt das Eröffnungsbuch (Polyglot-Format, engine_config.POLYGLOT_BOOK_PATH) für die KI bereit.
+Die Buchdatei wird einmal vollständig in den Speicher geladen; Schlüssel, Züge und Gewichte liegen
+in kompakten, nach Schlüssel sortierten Arrays, sodass eine Stellung per Binärsuche (bisect) in
+O(log n) ohne Dateizugriff gefunden wird.
+Der Buchzug wird nach den Gewichten der Einträge ausgewählt. Hat eine Partie das Buch einmal
+verlassen, wird für den Rest dieser Partie nicht mehr nachgeschlagen.
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import struct
+import random
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+import logger
+import chess
+import chess.polyglot
+import engine_config
+from typing import Optional, List, Tuple
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in opening_book.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# Polyglot-Eintrag: Schlüssel (8 Byte), Zug (2), Gewicht (2), Lernwert (4), Big Endian
+_ENTRY_STRUCT = struct.Struct(">QHHI")
+
+# --- Buch-Index (einmal geladen) ---
+_book_path: Optional[str] = None   # Pfad des geladenen Buchs (None = noch nicht geladen)
+_keys = array('Q')                 # Zobrist-Schlüssel, aufsteigend sortiert
+_moves = array('H')                # Rohe Polyglot-Züge, parallel zu _keys
+_weights = array('H')              # Gewichte, parallel zu _keys
+_load_lock = threading.Lock()
+
+# --- Partiezustand ---
+# Zugfolge der Partie, in der das Buch verlassen wurde. Solange die aktuelle Partie mit dieser
+# Zugfolge beginnt, wird nicht mehr nachgeschlagen (neue Partie/Zugrücknahme heben das auf).
+_left_book_line: Optional[List[chess.Move]] = None
+
+
+def load(path: Optional[str] = None) -> bool:
+    """
+    Lädt das Eröffnungsbuch in den Speicher (nur beim ersten Aufruf bzw. bei geändertem Pfad).
+
+    Args:
+        path (str, optional): Pfad zur Polyglot-Datei; Standard: engine_config.POLYGLOT_BOOK_PATH.
+
+    Returns:
+        bool: True, wenn ein Buch geladen ist.
+    """
+    global _book_path, _keys, _moves, _weights
+    path = engine_config.POLYGLOT_BOOK_PATH if path is None else path
+    if not path:
+        return False
+    with _load_lock:
+        if _book_path == path:
+            return len(_keys) > 0
+        keys, moves, weights = array('Q'), array('H'), array('H')
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            log.warning("Opening book file not found at: %s", path)
+            data = b""
+        except OSError as e:
+            log.error("Error reading opening book %s: %s", path, e, exc_info=True)
+            data = b""
+        usable = len(data) - len(data) % _ENTRY_STRUCT.size
+        if usable != len(data):
+            log.warning("Opening book %s has %d trailing bytes, ignoring them.", path, len(data) - usable)
+        for key, raw_move, weight, _learn in _ENTRY_STRUCT.iter_unpack(data[:usable]):
+            keys.append(key); moves.append(raw_move); weights.append(weight)
+        # Polyglot-Dateien sind nach Schlüssel sortiert; fehlerhafte Dateien werden nachsortiert
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            log.warning("Opening book %s is not sorted by key, sorting in memory.", path)
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            keys = array('Q', (keys[i] for i in order))
+            moves = array('H', (moves[i] for i in order))
+            weights = array('H', (weights[i] for i in order))
+        _keys, _moves, _weights = keys, moves, weights
+        _book_path = path
+        log.info("Opening book loaded: %s (%d entries, %d KB).", path, len(keys), len(data) // 1024)
+        return len(keys) > 0
+
+def unload():
+    """Gibt den Buch-Index frei (z.B. wenn engine_config.POLYGLOT_BOOK_PATH geändert wurde)."""
+    global _book_path, _keys, _moves, _weights
+    with _load_lock:
+        _book_path = None
+        _keys, _moves, _weights = array('Q'), array('H'), array('H')
+
+def reset_game():
+    """Hebt die Markierung 'Buch verlassen' auf (z.B. bei einer neuen oder geladenen Partie)."""
+    global _left_book_line
+    _left_book_line = None
+
+
+def _decode_move(board: chess.Board, raw_move: int) -> chess.Move:
+    """Wandelt einen Polyglot-Zug in einen chess.Move um (Rochade ist als König schlägt Turm kodiert)."""
+    to_square = raw_move & 0x3f
+    from_square = (raw_move >> 6) & 0x3f
+    promotion_part = (raw_move >> 12) & 0x7
+    promotion = promotion_part + 1 if promotion_part else None
+    if not board.chess960 and board.piece_type_at(from_square) == chess.KING and \
+       chess.square_file(from_square) == 4 and board.color_at(to_square) == board.turn and \
+       board.piece_type_at(to_square) == chess.ROOK:
+        # e1h1 -> e1g1, e1a1 -> e1c1 (entsprechend für Schwarz)
+        to_square = chess.square(6 if chess.square_file(to_square) == 7 else 2, chess.square_rank(from_square))
+    return chess.Move(from_square, to_square, promotion)
+
+def get_entries(board: chess.Board) -> List[Tuple[chess.Move, int]]:
+    """
+    Gibt alle legalen Buchzüge der Stellung mit ihren Gewichten zurück.
+
+    Returns:
+        List[Tuple[chess.Move, int]]: (Zug, Gewicht); leer, wenn die Stellung nicht im Buch ist.
+    """
+    if not load():
+        return []
+    key = chess.polyglot.zobrist_hash(board)
+    lo = bisect_left(_keys, key)
+    hi = bisect_right(_keys, key, lo)
+    entries = []
+    for i in range(lo, hi):
+        move = _decode_move(board, _moves[i])
+        if board.is_legal(move):
+            entries.append((move, _weights[i]))
+    return entries
+
+def probe(board: chess.Board) -> Optional[chess.Move]:
+    """
+    Wählt einen Buchzug für die Stellung, gewichtet nach den Gewichten der Einträge.
+    Nach dem ersten Fehlschlag einer Partie wird das Buch für deren restliche Züge nicht mehr befragt.
+
+    Returns:
+        chess.Move | None: Der Buchzug oder None (nicht im Buch / Buch bereits verlassen).
+    """
+    global _left_book_line
+    if _left_book_line is not None:
+        if board.move_stack[:len(_left_book_line)] == _left_book_line:
+            log.debug("Opening book: Game already left the book at ply %d, skipping probe.", len(_left_book_line))
+            return None
+        _left_book_line = None # Andere Partie oder Zugrücknahme: wieder nachschlagen
+
+    entries = get_entries(board)
+    if not entries:
+        if _book_path is not None:
+            _left_book_line = list(board.move_stack)
+            log.info("Opening book: Position not in book, leaving book at ply %d.", len(_left_book_line))
+        return None
+
+    moves = [move for move, _ in entries]
+    weights = [weight for _, weight in entries]
+    if sum(weights) > 0:
+        move = random.choices(moves, weights=weights)[0]
+    else:
+        move = random.choice(moves)
+    log.debug("Opening book: %d entries, chose %s (weights: %s).", len(entries), move.uci(), weights)
+    return move
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul verteilt die Suche der Schach-KI auf mehrere Prozesse (Root-Split).
+Der KI-Thread unterliegt dem GIL und nutzt nur einen Prozessorkern; hier werden die
+Züge der Wurzelstellung pro Iterationstiefe als einzelne Aufgaben an einen Pool von
+Arbeitsprozessen verteilt und die Ergebnisse anschließend zusammengeführt.
+Wie die sequentielle Wurzelsuche arbeitet die Verteilung als PVS: Der erste (beste) Zug der
+vorherigen Tiefe wird mit vollem Fenster gesucht, die übrigen Züge danach parallel mit einem
+Nullfenster um dessen Bewertung; nur Züge, die das Nullfenster überschreiten, werden exakt nachgerechnet.
+Der Pool wird einmal angelegt und zwischen den Zügen wiederverwendet; jeder Arbeitsprozess
+behält dabei seine eigene Transpositionstabelle und Zugsortierung.
+Abgebrochen wird über ein gemeinsames multiprocessing.Event, das die Suche der Arbeitsprozesse
+regelmäßig abfragt.
+Die Arbeitsprozesse importieren engine_config mit den Standardwerten der Datei. Jede Aufgabe trägt
+daher die aktuellen Einstellungen des Hauptprozesses (mit Versionsnummer) mit; bei einer neuen Version
+übernimmt der Arbeitsprozess sie (Transpositionstabelle, Endspieldatenbank, Bewertungstabellen).
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import os
+import time
+import random
+import copy
+import multiprocessing
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logger
+import chess
+import engine_config
+import evaluation
+import endgame_tablebase
+import ai_opponent
+from typing import Optional, List, Tuple, Dict, Set, Any
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in parallel_search.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Pool-Zustand (im Hauptprozess) ---
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers: int = 0
+_stop_event = None       # multiprocessing.Event, an alle Arbeitsprozesse vererbt
+_search_id: int = 0      # Zählt die Suchen, damit Arbeitsprozesse eine neue Suche erkennen
+_last_nodes: int = 0     # Knoten aller Arbeitsprozesse in der letzten Suche (für bench.py)
+_settings: Tuple[int, Dict[str, Any]] = (0, {}) # (Version, Kopie von engine_config) der laufenden Suche
+_clear_id: int = 0       # Zählt clear_worker_tables(); Arbeitsprozesse leeren ihre TT bei neuem Wert
+_POLL_INTERVAL_S = 0.05  # Wie oft der Hauptprozess Zeitbudget und Abbruchwunsch prüft
+
+# --- Zustand im Arbeitsprozess ---
+_worker_search_id: Optional[int] = None
+_worker_settings_version: Optional[int] = None
+_worker_clear_id: int = 0
+
+
+def get_worker_count() -> int:
+    """Gibt die konfigurierte Anzahl der Arbeitsprozesse zurück (0 in engine_config = alle Kerne außer einem)."""
+    workers = engine_config.AI_PARALLEL_WORKERS
+    if workers <= 0:
+        workers = max(1, (os.cpu_count() or 1) - 1)
+    return workers
+
+def is_enabled() -> bool:
+    """Gibt zurück, ob die parallele Suche aktiv ist (aktiviert und mehr als ein Arbeitsprozess)."""
+    return engine_config.AI_PARALLEL_ENABLED and get_worker_count() > 1
+
+
+# --- Funktionen im Arbeitsprozess ---
+
+def _init_worker(stop_event, log_queue, log_level: Optional[int]):
+    """Initialisiert einen Arbeitsprozess: übernimmt das gemeinsame Abbruchsignal und loggt über den Hauptprozess."""
+    logger.init_worker(log_queue, log_level)
+    ai_opponent.set_stop_event(stop_event)
+    log.debug("Parallel search worker %d initialized.", os.getpid())
+
+def _warm_up_task() -> int:
+    """Leere Aufgabe, um die Arbeitsprozesse vorab zu starten."""
+    return os.getpid()
+
+def _apply_settings(settings: Tuple[int, Dict[str, Any]]):
+    """
+    Übernimmt die Einstellungen des Hauptprozesses nach engine_config (nur bei neuer Version) und
+    baut davon abhängige Zustände neu auf: Transpositionstabelle (Hash), Endspieldatenbank
+    (SyzygyPath) und Bewertungstabellen (z.B. geänderte Gewichte).
+    """
+    global _worker_settings_version
+    version, values = settings
+    if version == _worker_settings_version:
+        return
+    changed = {name for name, value in values.items() if getattr(engine_config, name, None) != value}
+    for name in changed:
+        setattr(engine_config, name, values[name])
+    if changed & {'TT_ENABLED', 'TT_SIZE_MB', 'TT_REPLACEMENT_POLICY'}:
+        ai_opponent.resize_transposition_table(engine_config.TT_SIZE_MB)
+    if changed & {'SYZYGY_PATH', 'SYZYGY_MAX_PIECES'}:
+        endgame_tablebase.close() # start_new_search() öffnet sie bei Bedarf mit den neuen Einstellungen
+    if changed.intersection(evaluation.EVAL_SETTINGS):
+        evaluation.rebuild_tables()
+    _worker_settings_version = version
+    if changed:
+        log.debug("Parallel search worker %d: Settings version %d applied (%s).", os.getpid(), version,
+                  ", ".join(sorted(changed)))
+
+def _search_move_task(search_id: int, settings: Tuple[int, Dict[str, Any]], clear_id: int, board: chess.Board,
+                      move_uci: str, depth: int, alpha: int, beta: int) -> Optional[Tuple[str, int, List[str], int]]:
+    """
+    Bewertet einen Wurzelzug im Arbeitsprozess im Fenster (alpha, beta).
+
+    Args:
+        settings: (Version, Einstellungen von engine_config) des Hauptprozesses, siehe _apply_settings().
+        clear_id: Stand von clear_worker_tables(); bei neuem Wert wird die TT vor der Suche geleert.
+
+    Returns:
+        Tuple | None: (Zug, Bewertung, Hauptvariante als UCI-Liste, Knoten) oder None bei Abbruch.
+    """
+    global _worker_search_id, _worker_clear_id
+    _apply_settings(settings)
+    if clear_id != _worker_clear_id:
+        _worker_clear_id = clear_id
+        ai_opponent.reset_transposition_table()
+    if _worker_search_id != search_id:
+        # Neue Suche: Generation der TT erhöhen, Killerzüge verwerfen (wie im Einzelprozess)
+        _worker_search_id = search_id
+        ai_opponent.start_new_search()
+    nodes_before = ai_opponent.get_nodes_searched()
+    try:
+        score, pv = ai_opponent.search_root_move(board, chess.Move.from_uci(move_uci), depth, alpha, beta)
+    except ai_opponent.SearchTimeout:
+        return None
+    return move_uci, score, [m.uci() for m in pv], ai_opponent.get_nodes_searched() - nodes_before
+
+
+# --- Pool-Verwaltung (Hauptprozess) ---
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """Gibt den Prozess-Pool zurück und legt ihn beim ersten Aufruf an (wird zwischen Zügen wiederverwendet)."""
+    global _pool, _pool_workers, _stop_event
+    workers = get_worker_count()
+    if _pool is not None and _pool_workers == workers:
+        return _pool
+    shutdown_pool()
+    try:
+        # 'spawn' ist auf allen Plattformen verfügbar und vermeidet fork() in einem Prozess mit GUI-/KI-Threads
+        context = multiprocessing.get_context('spawn')
+        _stop_event = context.Event()
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                    initializer=_init_worker,
+                                    initargs=(_stop_event, logger.get_process_queue(context), logger.get_level()))
+        _pool_workers = workers
+        log.info("Parallel search pool created with %d worker processes.", workers)
+    except Exception as e:
+        log.error("Could not create parallel search pool: %s", e, exc_info=True)
+        _pool = None
+        _stop_event = None
+    return _pool
+
+def warm_up():
+    """Startet die Arbeitsprozesse vorab (z.B. bei Spielbeginn), damit der erste KI-Zug nicht auf sie warten muss."""
+    if not is_enabled():
+        return
+    pool = get_pool()
+    if pool is None:
+        return
+    try:
+        for _ in range(_pool_workers):
+            pool.submit(_warm_up_task)
+        log.debug("Parallel search pool warm-up submitted.")
+    except Exception as e:
+        log.error("Parallel search pool warm-up failed: %s", e, exc_info=True)
+
+def stop():
+    """Fordert den Abbruch der laufenden Suche in allen Arbeitsprozessen an."""
+    if _stop_event is not None:
+        _stop_event.set()
+
+def shutdown_pool():
+    """Beendet den Prozess-Pool (z.B. beim Programmende)."""
+    global _pool, _pool_workers, _stop_event
+    if _pool is None:
+        return
+    log.info("Shutting down parallel search pool.")
+    stop()
+    try:
+        _pool.shutdown(wait=True, cancel_futures=True)
+    except Exception as e:
+        log.error("Error shutting down parallel search pool: %s", e, exc_info=True)
+    _pool = None
+    _pool_workers = 0
+    _stop_event = None
+
+
+def clear_worker_tables():
+    """
+    Lässt die Arbeitsprozesse Transpositionstabelle und Zugsortierung vor ihrer nächsten Aufgabe leeren
+    (neue Partie, z.B. UCI ucinewgame). Ein laufender Pool muss dafür nicht neu gestartet werden.
+    """
+    global _clear_id
+    _clear_id += 1
+
+def _get_settings() -> Tuple[int, Dict[str, Any]]:
+    """
+    Gibt die aktuellen Einstellungen von engine_config mit Versionsnummer zurück. Die Version steigt bei
+    jeder Änderung (z.B. UCI setoption, Turnier-Überschreibungen, Bewertungsgewichte).
+    """
+    global _settings
+    version, values = _settings
+    current = {name: getattr(engine_config, name) for name in engine_config.__all__}
+    if current != values:
+        # Tiefe Kopie: auch spätere Änderungen innerhalb eines Dictionaries (PIECE_VALUES[...]) erkennen
+        _settings = (version + 1, copy.deepcopy(current))
+    return _settings
+
+def get_nodes_searched() -> int:
+    """Gibt die Knotenzahl aller Arbeitsprozesse in der letzten parallelen Suche zurück."""
+    return _last_nodes
+
+def _cancel_and_drain(futures: List[concurrent.futures.Future]):
+    """Bricht die laufenden Aufgaben ab, wartet auf die Arbeitsprozesse und setzt das Abbruchsignal zurück."""
+    for future in futures:
+        future.cancel()
+    _stop_event.set()
+    concurrent.futures.wait(futures)
+    _stop_event.clear()
+
+def _wait_for_results(futures: List[concurrent.futures.Future],
+                      deadline: Optional[float]) -> Optional[Set[concurrent.futures.Future]]:
+    """
+    Wartet, bis mindestens eine Aufgabe fertig ist. In kurzen Abständen werden dabei Zeitbudget und
+    Abbruchwunsch ("Sofort ziehen") geprüft.
+
+    Returns:
+        Set[Future] | None: Die fertigen Aufgaben oder None, wenn die Tiefe abgebrochen werden muss.
+    """
+    while True:
+        if ai_opponent.is_stop_requested() or (deadline is not None and time.monotonic() >= deadline):
+            return None
+        remaining = _POLL_INTERVAL_S if deadline is None else min(_POLL_INTERVAL_S, deadline - time.monotonic())
+        done, _ = concurrent.futures.wait(futures, timeout=max(0.0, remaining),
+                                          return_when=concurrent.futures.FIRST_COMPLETED)
+        if done:
+            return done
+
+def _search_depth(pool: ProcessPoolExecutor, root_board: chess.Board, move_order: List[str], depth: int,
+                  deadline: Optional[float]) -> Optional[Tuple[List[str], int, Dict[str, List[str]], Dict[str, int], int]]:
+    """
+    Sucht eine Iterationstiefe als PVS an der Wurzel: zuerst move_order[0] mit vollem Fenster, dann alle
+    übrigen Züge parallel mit dem Nullfenster (best - 1, best), wie _search_root im Einzelprozess (gleich
+    bewertete Züge liefern so einen exakten Wert für die Zufallsauswahl). Überschreitet ein Zug das
+    Nullfenster, wird er mit (aktuell best - 1, unendlich) nachgerechnet.
+
+    Returns:
+        Tuple | None: (gleich beste Züge, beste Bewertung, Hauptvarianten der besten Züge,
+        Bewertungen bzw. Schranken aller Züge für die Sortierung, Knoten) oder None bei Abbruch.
+    """
+    infinity = ai_opponent.INFINITY_SCORE
+
+    def submit(uci: str, alpha: int, beta: int) -> concurrent.futures.Future:
+        return pool.submit(_search_move_task, _search_id, _settings, _clear_id, root_board, uci, depth, alpha, beta)
+
+    # Aufgabe -> (Zug, Alpha des Fensters, Nullfenster?)
+    pending: Dict[concurrent.futures.Future, Tuple[str, int, bool]] = {
+        submit(move_order[0], -infinity, infinity): (move_order[0], -infinity, False)}
+    best_value: Optional[int] = None
+    best_ucis: List[str] = []
+    pvs: Dict[str, List[str]] = {}
+    scores: Dict[str, int] = {}
+    nodes = 0
+    researches = 0
+    try:
+        while pending:
+            done = _wait_for_results(list(pending), deadline)
+            if done is None:
+                _cancel_and_drain(list(pending))
+                return None
+            for future in done:
+                uci, alpha, null_window = pending.pop(future)
+                result = future.result()
+                if result is None: # Abbruch im Arbeitsprozess
+                    _cancel_and_drain(list(pending))
+                    return None
+                _, score, pv, task_nodes = result
+                nodes += task_nodes
+                if best_value is None:
+                    # Erster Zug (vollständiges Fenster): seine Bewertung begrenzt die übrigen Züge
+                    best_value, best_ucis, pvs[uci], scores[uci] = score, [uci], pv, score
+                    window_alpha = best_value - 1
+                    for other_uci in move_order[1:]:
+                        pending[submit(other_uci, window_alpha, window_alpha + 1)] = (other_uci, window_alpha, True)
+                    continue
+                if score <= alpha:
+                    scores[uci] = score # Obere Schranke: nicht besser als der damals beste Zug
+                    continue
+                if null_window:
+                    # Nullfenster überschritten: mit dem aktuellen besten Wert exakt nachrechnen
+                    research_alpha = best_value - 1
+                    researches += 1
+                    pending[submit(uci, research_alpha, infinity)] = (uci, research_alpha, False)
+                    continue
+                scores[uci] = score
+                if score > best_value:
+                    best_value, best_ucis = score, [uci]
+                    pvs[uci] = pv
+                elif score == best_value:
+                    best_ucis.append(uci)
+                    pvs[uci] = pv
+    except Exception:
+        # z.B. Fehler in einem Arbeitsprozess: noch laufende Aufgaben nicht weiterrechnen lassen
+        if pending and _stop_event is not None:
+            _cancel_and_drain(list(pending))
+        raise
+    log.debug("Parallel search: Depth %d: %d re-search(es) after null-window fail-high.", depth, researches)
+    return best_ucis, best_value, {uci: pvs[uci] for uci in best_ucis}, scores, nodes
+
+def find_best_move_parallel(board: chess.Board, valid_moves: List[chess.Move], time_budget_ms: int,
+                            max_depth: int) -> Optional[Tuple[chess.Move, int, List[chess.Move]]]:
+    """
+    Iterative Vertiefung mit auf Prozesse verteilten Wurzelzügen (PVS an der Wurzel, siehe _search_depth).
+    Die Züge werden nach dem Ergebnis der vorherigen Tiefe sortiert: bester Zug zuerst, danach nach
+    Bewertung bzw. Schranke.
+    Tiefe 1 läuft ohne Zeitlimit, danach bricht das Zeitbudget die laufende Tiefe ab.
+    Ein Abbruchwunsch (ai_opponent.is_stop_requested) beendet die Suche ebenfalls.
+
+    Returns:
+        Tuple | None: (bester Zug, Bewertung aus Sicht der Seite am Zug, Hauptvariante) der letzten
+        vollständig abgeschlossenen Tiefe oder None, wenn der Pool nicht verfügbar ist.
+    """
+    global _search_id, _last_nodes
+    if not valid_moves:
+        return None
+    pool = get_pool()
+    if pool is None:
+        return None
+
+    _search_id += 1
+    _get_settings() # Aktuelle Einstellungen gehen mit jeder Aufgabe an die Arbeitsprozesse
+    _stop_event.clear()
+    start_time = time.monotonic()
+    ai_opponent.start_progress_tracking()
+    budget_s = max(0, time_budget_ms) / 1000.0
+    root_board = board.copy()
+    move_order = [m.uci() for m in valid_moves]
+    result: Optional[Tuple[chess.Move, int, List[chess.Move]]] = None
+    total_nodes = 0
+    _last_nodes = 0
+    log.info("Starting parallel search (Workers: %d, Budget: %d ms, Max Depth: %d).",
+             _pool_workers, time_budget_ms, max_depth)
+
+    try:
+        for depth in range(1, max(1, max_depth) + 1):
+            iteration_start = time.monotonic()
+            ai_opponent.report_progress(depth=depth, nodes=total_nodes)
+            deadline = None if depth == 1 else start_time + budget_s
+            depth_result = _search_depth(pool, root_board, move_order, depth, deadline)
+            if depth_result is None:
+                log.info("Parallel search: Depth %d aborted after %.0f ms (%s).", depth,
+                         (time.monotonic() - start_time) * 1000,
+                         "stop requested" if ai_opponent.is_stop_requested() else "time budget exhausted")
+                break
+
+            best_ucis, best_value, pvs, scores, depth_nodes = depth_result
+            total_nodes += depth_nodes
+            _last_nodes = total_nodes
+            # Gleich bewertete Züge: zufällige Auswahl wie in der Einzelprozess-Suche
+            best_uci = random.choice(best_ucis)
+            result = (chess.Move.from_uci(best_uci), best_value, [chess.Move.from_uci(u) for u in pvs[best_uci]])
+            move_order.sort(key=lambda uci: (uci == best_uci, scores.get(uci, -ai_opponent.INFINITY_SCORE)), reverse=True)
+            ai_opponent.report_progress(score=best_value, nodes=total_nodes,
+                                        pv=root_board.variation_san(result[2]), pv_moves=pvs[best_uci],
+                                        completed_depth=depth)
+            now = time.monotonic()
+            log.info("Parallel search: Depth %d completed in %.0f ms. Best move: %s (Value: %d, Nodes: %d)",
+                     depth, (now - iteration_start) * 1000, best_uci, best_value, total_nodes)
+
+            if abs(best_value) >= ai_opponent.MATE_THRESHOLD:
+                log.debug("Parallel search: Mate score found at depth %d, stopping early.", depth)
+                break
+            if now - start_time > budget_s / 2:
+                log.debug("Parallel search: More than half of the budget used, not starting depth %d.", depth + 1)
+                break
+    except BrokenProcessPool as e:
+        log.error("Parallel search pool is broken: %s. Pool will be recreated on next use.", e)
+        shutdown_pool()
+        return result
+    except Exception as e:
+        log.error("Exception during parallel search: %s", e, exc_info=True)
+        if _stop_event is not None:
+            _stop_event.clear()
+        return result
+
+    log.info("Parallel search finished after %.0f ms. Best move: %s, Nodes: %d",
+             (time.monotonic() - start_time) * 1000, result[0].uci() if result else "None", total_nodes)
+    return result
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Kommandozeilenwerkzeug für Perft (Zählung aller Blattknoten bis zu einer festen Tiefe).
+Perft prüft die Zuggenerierung auf Korrektheit (Vergleich mit den bekannten Referenzwerten der
+Standard-Teststellungen) und misst ihren Durchsatz. Gezählt wird über drei Stellungstypen:
+    board      - chess.Board direkt (push/pop)
+    gamestate  - GameState (get_valid_moves/make_move/undo_move, wie die GUI)
+    search     - search_position.SearchPosition (push/pop mit inkrementeller Bewertung, wie die KI)
+So lassen sich schnellere Zuggeneratoren oder Stellungstypen gegen dieselben Zahlen prüfen.
+
+Aufruf z.B.:
+    python perft.py --depth 4
+    python perft.py --position kiwipete --depth 3 --divide --backend gamestate
+    python perft.py --fen "8/8/8/8/8/8/8/K6k w - - 0 1" --depth 5
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import time
+import argparse
+import logger
+import chess
+from game_state import GameState
+from search_position import SearchPosition
+from typing import Optional, List, Dict, Tuple, Callable
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in perft.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Standardwerte der Kommandozeile ---
+DEFAULT_DEPTH = 3
+DEFAULT_LOG_LEVEL = 'WARNING' # GameState loggt jeden Zug; während der Messung nur Warnungen schreiben
+
+# Standard-Teststellungen mit Referenzwerten (Blattknoten für Tiefe 1, 2, 3, ...)
+PERFT_POSITIONS: Dict[str, Tuple[str, List[int]]] = {
+    'start': (chess.STARTING_FEN,
+              [20, 400, 8902, 197281, 4865609, 119060324]),
+    'kiwipete': ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                 [48, 2039, 97862, 4085603, 193690690]),
+    'position3': ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                  [14, 191, 2812, 43238, 674624, 11030083]),
+    'position4': ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                  [6, 264, 9467, 422333, 15833292]),
+    'position5': ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                  [44, 1486, 62379, 2103487, 89941194]),
+    'position6': ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  [46, 2079, 89890, 3894594, 164075551]),
+}
+BACKENDS = ('board', 'gamestate', 'search')
+
+
+class PerftCounter:
+    """
+    Zählt Blattknoten über eine Stellung mit get_moves/push/pop und erfasst die Anzahl erzeugter Züge.
+
+    Attributes:
+        generated (int): Anzahl aller erzeugten legalen Züge (über alle inneren Knoten).
+    """
+    def __init__(self, get_moves: Callable[[], List[chess.Move]], push: Callable[[chess.Move], object],
+                 pop: Callable[[], object]):
+        self.get_moves = get_moves
+        self.push = push
+        self.pop = pop
+        self.generated = 0
+
+    def perft(self, depth: int) -> int:
+        """Anzahl der Blattknoten bis zur Tiefe depth (auf Tiefe 1 wird nur gezählt, nicht gezogen)."""
+        moves = self.get_moves()
+        self.generated += len(moves)
+        if depth <= 1:
+            return len(moves) if depth == 1 else 1
+        nodes = 0
+        for move in moves:
+            self.push(move)
+            nodes += self.perft(depth - 1)
+            self.pop()
+        return nodes
+
+    def divide(self, depth: int) -> List[Tuple[chess.Move, int]]:
+        """Blattknoten je Wurzelzug (zum Eingrenzen von Fehlern in der Zuggenerierung)."""
+        moves = self.get_moves()
+        self.generated += len(moves)
+        result = []
+        for move in moves:
+            self.push(move)
+            result.append((move, self.perft(depth - 1)))
+            self.pop()
+        return result
+
+
+def make_counter(backend: str, fen: str) -> PerftCounter:
+    """Erzeugt den PerftCounter für den gewünschten Stellungstyp ('board', 'gamestate' oder 'search')."""
+    if backend == 'board':
+        board = chess.Board(fen)
+        return PerftCounter(lambda: list(board.legal_moves), board.push, board.pop)
+    if backend == 'gamestate':
+        gs = GameState(fen=fen)
+        return PerftCounter(gs.get_valid_moves, gs.make_move, gs.undo_move)
+    if backend == 'search':
+        pos = SearchPosition(chess.Board(fen), copy=False)
+        return PerftCounter(pos.legal_moves, pos.push, pos.pop)
+    raise ValueError(f"Unbekannter Stellungstyp: {backend}")
+
+
+def run_perft(backend: str, fen: str, depth: int, divide: bool = False) -> Dict[str, object]:
+    """
+    Führt Perft aus und misst die Laufzeit.
+
+    Returns:
+        Dict[str, object]: Blattknoten, erzeugte Züge, Laufzeit, Durchsatz und ggf. die Divide-Ausgabe.
+    """
+    counter = make_counter(backend, fen)
+    start_time = time.perf_counter()
+    if divide:
+        divided = counter.divide(depth)
+        nodes = sum(count for _, count in divided)
+    else:
+        divided = None
+        nodes = counter.perft(depth)
+    elapsed = time.perf_counter() - start_time
+    log.info("Perft %s depth %d: %d nodes, %d moves generated in %.3f s (FEN: %s)",
+             backend, depth, nodes, counter.generated, elapsed, fen)
+    return {
+        'nodes': nodes,
+        'generated': counter.generated,
+        'seconds': elapsed,
+        'nps': int(nodes / elapsed) if elapsed > 0 else 0,
+        'moves_per_second': int(counter.generated / elapsed) if elapsed > 0 else 0,
+        'divide': divided,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Einstiegspunkt der Kommandozeile. Rückgabe 1, wenn eine Zählung vom Referenzwert abweicht."""
+    parser = argparse.ArgumentParser(description="Perft: prüft und misst die Zuggenerierung.")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help=f"Tiefe (Standard: {DEFAULT_DEPTH})")
+    parser.add_argument("--position", action="append", choices=sorted(PERFT_POSITIONS),
+                        help="Teststellung(en) (Standard: alle)")
+    parser.add_argument("--fen", help="Eigene Stellung statt der Teststellungen (ohne Referenzwert)")
+    parser.add_argument("--backend", choices=BACKENDS + ('all',), default='all',
+                        help="Stellungstyp (Standard: all)")
+    parser.add_argument("--divide", action="store_true", help="Blattknoten je Wurzelzug ausgeben")
+    parser.add_argument("--log-level", default=DEFAULT_LOG_LEVEL,
+                        help=f"Log-Stufe während der Messung (Standard: {DEFAULT_LOG_LEVEL})")
+    args = parser.parse_args(argv)
+
+    if args.depth < 1:
+        parser.error("--depth muss mindestens 1 sein")
+    if args.fen:
+        try:
+            chess.Board(args.fen)
+        except ValueError as e:
+            parser.error(f"Ungültige FEN '{args.fen}': {e}")
+        positions = [('fen', args.fen, [])]
+    else:
+        names = args.position or list(PERFT_POSITIONS)
+        positions = [(name,) + PERFT_POSITIONS[name] for name in names]
+    try:
+        logger.set_level(args.log_level)
+    except ValueError as e:
+        parser.error(str(e))
+    backends = BACKENDS if args.backend == 'all' else (args.backend,)
+
+    failures = 0
+    for name, fen, reference in positions:
+        expected = reference[args.depth - 1] if args.depth <= len(reference) else None
+        print(f"{name} ({fen})")
+        for backend in backends:
+            result = run_perft(backend, fen, args.depth, args.divide)
+            if result['divide'] is not None:
+                for move, count in sorted(result['divide'], key=lambda item: item[0].uci()):
+                    print(f"    {move.uci()}: {count}")
+            if expected is None:
+                status = "kein Referenzwert"
+            elif result['nodes'] == expected:
+                status = "OK"
+            else:
+                status = f"FEHLER (erwartet {expected})"
+                failures += 1
+                log.error("Perft mismatch: %s %s depth %d: %d nodes, expected %d",
+                          backend, name, args.depth, result['nodes'], expected)
+            print(f"  {backend:<9} Tiefe {args.depth}: {result['nodes']} Knoten {status} | "
+                  f"{result['seconds']:.3f} s, {result['nps']} Knoten/s, "
+                  f"{result['moves_per_second']} erzeugte Züge/s")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul definiert die Klasse SearchPosition, die schlanke Stellung der KI-Suche.
+Sie kapselt ein chess.Board zusammen mit der inkrementellen Bewertung (evaluation.IncrementalEvaluator)
+und bietet nur push/pop an. Schlaglisten, Redo-Stack und Logging bleiben dem GameState vorbehalten,
+der ausschließlich der GUI dient; in der Suche entstehen pro Knoten weder Objekte noch Logausgaben.
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import logger
+import chess
+from evaluation import IncrementalEvaluator
+from typing import List
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in search_position.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+
+class SearchPosition:
+    """
+    Stellung für die Suche: Brett plus inkrementell mitgeführte Bewertung.
+    Züge müssen über push()/pop() ausgeführt werden, damit Brett und Bewertung synchron bleiben.
+
+    Attributes:
+        board (chess.Board): Das Brett der Stellung.
+        evaluator (IncrementalEvaluator): Die zum Brett passende Bewertung.
+    """
+    __slots__ = ('board', 'evaluator')
+
+    def __init__(self, board: chess.Board, copy: bool = True):
+        """
+        Args:
+            board (chess.Board): Die Ausgangsstellung (inkl. Zugstapel für Wiederholungen).
+            copy (bool): False = das Brett wird direkt übernommen (der Aufrufer besitzt es exklusiv).
+        """
+        self.board = board.copy() if copy else board
+        self.evaluator = IncrementalEvaluator(self.board)
+
+    @classmethod
+    def from_game_state(cls, gs) -> 'SearchPosition':
+        """Erzeugt die Suchstellung aus einem GameState (kopiert nur das Brett)."""
+        return cls(gs.board)
+
+    def copy(self) -> 'SearchPosition':
+        """Gibt eine unabhängige Kopie der Stellung zurück."""
+        return SearchPosition(self.board)
+
+    @property
+    def turn(self) -> chess.Color:
+        """Die Seite am Zug."""
+        return self.board.turn
+
+    def push(self, move: chess.Move):
+        """Führt den Zug aus und aktualisiert die Bewertung."""
+        self.evaluator.push(self.board, move)
+
+    def pop(self) -> chess.Move:
+        """Nimmt den letzten Zug zurück und stellt die vorherige Bewertung wieder her."""
+        return self.evaluator.pop(self.board)
+
+    def evaluate_relative(self) -> int:
+        """Statische Bewertung (Material + Figur-Feld-Tabellen) aus Sicht der Seite am Zug."""
+        return self.evaluator.evaluate_relative(self.board.turn)
+
+    def legal_moves(self) -> List[chess.Move]:
+        """Gibt die legalen Züge der Stellung als Liste zurück."""
+        return list(self.board.legal_moves)
+
+    def is_game_over(self) -> bool:
+        """Prüft, ob die Partie beendet ist (inkl. Remis-Claims, wie GameState.is_game_over)."""
+        return self.board.is_game_over(claim_draw=True)
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+Kommandozeilenwerkzeug für Engine-Vergleiche: spielt Partien zwischen zwei Konfigurationen der KI
+(Engine A und Engine B), ohne Fenster und ohne Pygame-Anzeige. Jede Konfiguration besteht aus
+Überschreibungen von engine_config (z.B. Suchtiefe, Figurenwerte, TT-Größe, Bedenkzeit).
+
+Jede Eröffnungsstellung wird zweimal mit vertauschten Farben gespielt. Die Partien laufen parallel in
+Arbeitsprozessen; innerhalb eines Prozesses wechseln die Engines Zug für Zug (eigene Transpositionstabelle,
+Zugsortierung und Bewertungstabellen je Engine, siehe ai_opponent.swap_search_state und
+evaluation.rebuild_tables). Gezogen wird über GameState und ai_opponent.find_best_move wie in der GUI.
+Ausgabe: alle Partien als PGN und eine Zusammenfassung mit Elo-Differenz (95-%-Fehlerbereich), LOS und
+SPRT-Log-Likelihood-Ratio (Hypothesen elo0/elo1, Fehlerwahrscheinlichkeiten alpha/beta).
+
+Aufruf z.B.:
+    python tournament.py --games 100 --movetime 200 --engine-b AI_MAX_DEPTH=4
+    python tournament.py --tc 10+0.1 --engine-a "PIECE_VALUES={5: 950}" --sprt -o partien.pgn
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import os
+import ast
+import copy
+import math
+import time
+import random
+import argparse
+import multiprocessing
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+import logger
+import chess
+import chess.pgn
+import engine_config
+import ai_opponent
+import evaluation
+import opening_book
+from uci import compute_time_budget
+from game_state import GameState
+from search_position import SearchPosition
+from typing import Optional, List, Dict, Tuple, Any
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in tournament.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Standardwerte der Kommandozeile ---
+DEFAULT_MOVETIME_MS = 200   # Bedenkzeit pro Zug ohne --tc (überschreibt engine_config.AI_TIME_BUDGET_MS)
+DEFAULT_MAX_PLIES = 300     # Danach wird die Partie als Remis gewertet
+DEFAULT_PGN_PATH = 'tournament.pgn'
+DEFAULT_SPRT = (0.0, 10.0, 0.05, 0.05) # elo0, elo1, alpha, beta
+DEFAULT_LOG_LEVEL = 'WARNING' # GameState und Suche loggen jeden Zug; während der Partien nur Warnungen schreiben
+
+# Ausgeglichene Eröffnungsstellungen (jeweils einige Züge einer Hauptvariante)
+TOURNAMENT_OPENINGS: List[str] = [
+    "r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4", # Spanisch
+    "rnbqkb1r/pp2pppp/3p1n2/8/3NP3/2N5/PPP2PPP/R1BQKB1R b KQkq - 2 5", # Sizilianisch
+    "rnbqkb1r/ppp2ppp/4pn2/3p4/2PP4/2N5/PP2PPPP/R1BQKBNR w KQkq - 2 4", # Damengambit
+    "rnbqk2r/ppp1ppbp/3p1np1/8/2PPP3/2N5/PP3PPP/R1BQKBNR w KQkq - 0 5", # Königsindisch
+    "rnbqkb1r/ppp2ppp/4pn2/3p4/3PP3/2N5/PPP2PPP/R1BQKBNR w KQkq - 2 4", # Französisch
+    "rn1qkbnr/pp2pppp/2p5/3pPb2/3P4/8/PPP2PPP/RNBQKBNR w KQkq - 1 4", # Caro-Kann, Vorstoß
+    "rnbqkb1r/pppp1ppp/5n2/4p3/2P5/2N3P1/PP1PPP1P/R1BQKBNR b KQkq - 0 3", # Englisch
+    "rnbqkb1r/pp2pppp/2p2n2/3p4/8/5NP1/PPPPPPBP/RNBQ1RK1 b kq - 1 4", # Réti
+    "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/2P2N2/PP1P1PPP/RNBQK2R w KQkq - 1 5", # Italienisch
+    "rnbqkb1r/pp2pppp/5n2/2pp4/3P1B2/4P3/PPP2PPP/RN1QKBNR w KQkq - 0 4", # Londoner System
+]
+
+# Einstellungen, die für alle Engines im Turnier gelten (Eröffnungen kommen aus den Startstellungen,
+# Parallelität entsteht über die Partien statt über die Suche)
+TOURNAMENT_SETTINGS: Dict[str, Any] = {
+    'POLYGLOT_BOOK_PATH': "",
+    'AI_PARALLEL_ENABLED': False,
+}
+
+Engine = Tuple[str, Dict[str, Any]] # (Name, Überschreibungen von engine_config)
+
+
+# --- Engine-Konfiguration ---
+
+def parse_override(text: str) -> Tuple[str, Any]:
+    """
+    Zerlegt "NAME=WERT" in Name und Python-Wert (z.B. "AI_MAX_DEPTH=4", "PIECE_VALUES={5: 950}").
+    Werte, die kein Python-Literal sind, werden als Zeichenkette übernommen (z.B. Pfade).
+
+    Raises:
+        ValueError: Kein "=" oder unbekannte Einstellung.
+    """
+    name, sep, raw_value = text.partition('=')
+    name = name.strip()
+    if not sep or not name:
+        raise ValueError(f"Erwartet NAME=WERT: {text}")
+    if name not in engine_config.__all__:
+        raise ValueError(f"Unbekannte Einstellung in engine_config: {name}")
+    try:
+        value = ast.literal_eval(raw_value.strip())
+    except (ValueError, SyntaxError):
+        value = raw_value.strip()
+    return name, value
+
+def _effective_settings(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Standardwerte + Turniereinstellungen + Überschreibungen; Dictionaries werden ergänzt statt ersetzt."""
+    settings = dict(defaults)
+    settings.update(TOURNAMENT_SETTINGS)
+    for name, value in overrides.items():
+        if isinstance(value, dict) and isinstance(settings.get(name), dict):
+            value = {**settings[name], **value} # z.B. PIECE_VALUES={5: 950} ändert nur die Dame
+        settings[name] = value
+    return settings
+
+
+# --- Funktionen im Arbeitsprozess ---
+
+_defaults: Dict[str, Any] = {}
+
+def _init_worker(log_level: str, log_queue):
+    """Initialisiert einen Arbeitsprozess: Logging über den Hauptprozess, Standardwerte von engine_config merken."""
+    global _defaults
+    logger.init_worker(log_queue, log_level)
+    _defaults = {name: copy.deepcopy(getattr(engine_config, name)) for name in engine_config.__all__}
+
+def _apply_settings(settings: Dict[str, Any]):
+    """Überträgt die Einstellungen einer Engine nach engine_config (Bewertungstabellen nur bei Änderung)."""
+    rebuild = any(getattr(engine_config, name) != settings[name] for name in evaluation.EVAL_SETTINGS)
+    for name, value in settings.items():
+        setattr(engine_config, name, value)
+    if rebuild:
+        evaluation.rebuild_tables()
+
+def _play_game(index: int, fen: str, white: Engine, black: Engine, tc: Optional[Tuple[int, int]],
+               max_plies: int, seed: int) -> Dict[str, Any]:
+    """
+    Spielt eine Partie zwischen zwei Engines (läuft im Arbeitsprozess).
+
+    Args:
+        tc: (Grundzeit, Inkrement) in Millisekunden oder None (feste Bedenkzeit pro Zug).
+
+    Returns:
+        Dict[str, Any]: Ergebnis, Abbruchgrund, Anzahl Halbzüge und die Partie als PGN-Text.
+    """
+    random.seed(seed) # Zufall entscheidet nur zwischen gleich bewerteten Zügen
+    engines = {chess.WHITE: white, chess.BLACK: black}
+    settings = {color: _effective_settings(_defaults, overrides) for color, (_, overrides) in engines.items()}
+    states: Dict[chess.Color, Any] = {}
+    active: Optional[chess.Color] = None
+    clocks = {chess.WHITE: tc[0], chess.BLACK: tc[0]} if tc else None
+    opening_book.reset_game()
+
+    gs = GameState(fen=fen)
+    result: Optional[str] = None
+    termination = "normal"
+    plies = 0
+    while not gs.is_game_over():
+        if plies >= max_plies:
+            result, termination = "1/2-1/2", "adjudication"
+            break
+        color = gs.board.turn
+        _apply_settings(settings[color])
+        if active != color:
+            # Jede Engine behält ihre eigene TT und Zugsortierung über die ganze Partie
+            previous = ai_opponent.swap_search_state(states.get(color))
+            if active is not None:
+                states[active] = previous
+            active = color
+
+        budget_ms = None
+        if clocks:
+            budget_ms = compute_time_budget({'wtime': clocks[chess.WHITE], 'btime': clocks[chess.BLACK],
+                                             'winc': tc[1], 'binc': tc[1]}, color)
+        start_time = time.monotonic()
+        move = ai_opponent.find_best_move(SearchPosition.from_game_state(gs), gs.get_valid_moves(),
+                                          time_budget_ms=budget_ms)
+        elapsed_ms = int((time.monotonic() - start_time) * 1000)
+        if move is None or not gs.make_move(move):
+            log.error("Game %d: engine '%s' returned no legal move (FEN: %s).", index, engines[color][0], gs.get_fen())
+            result, termination = ("0-1" if color == chess.WHITE else "1-0"), "rules infraction"
+            break
+        plies += 1
+        if clocks:
+            clocks[color] -= elapsed_ms
+            if clocks[color] < 0:
+                # Zeitüberschreitung; ohne Mattmaterial des Gegners ist die Partie remis
+                if gs.board.has_insufficient_material(not color):
+                    result = "1/2-1/2"
+                else:
+                    result = "0-1" if color == chess.WHITE else "1-0"
+                termination = "time forfeit"
+                break
+            clocks[color] += tc[1]
+    if result is None:
+        result = gs.get_game_result() or "1/2-1/2"
+
+    game = chess.pgn.Game.from_board(gs.board)
+    game.headers["Event"] = "PyChess Tournament"
+    game.headers["Site"] = "PyChess"
+    game.headers["Date"] = time.strftime('%Y.%m.%d')
+    game.headers["Round"] = str(index + 1)
+    game.headers["White"] = white[0]
+    game.headers["Black"] = black[0]
+    game.headers["Result"] = result
+    game.headers["Termination"] = termination
+    game.headers["TimeControl"] = f"{tc[0] / 1000:g}+{tc[1] / 1000:g}" if tc else "-"
+    log.info("Game %d finished: %s - %s %s (%s, %d plies).", index + 1, white[0], black[0], result, termination, plies)
+    return {
+        'index': index,
+        'white': white[0],
+        'black': black[0],
+        'result': result,
+        'termination': termination,
+        'plies': plies,
+        'pgn': str(game),
+    }
+
+
+# --- Statistik ---
+
+def elo_from_score(score: float) -> float:
+    """Elo-Differenz zu einem Punkteanteil (0 < score < 1) nach dem logistischen Modell."""
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+def score_from_elo(elo: float) -> float:
+    """Erwarteter Punkteanteil bei einer Elo-Differenz."""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+def _score_and_variance(wins: int, draws: int, losses: int) -> Tuple[float, float]:
+    """Mittlerer Punkteanteil und Varianz pro Partie (Gewinn = 1, Remis = 0.5, Niederlage = 0)."""
+    games = wins + draws + losses
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1.0 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    return score, variance
+
+def elo_estimate(wins: int, draws: int, losses: int) -> Tuple[float, float]:
+    """
+    Schätzt die Elo-Differenz mit 95-%-Fehlerbereich.
+
+    Returns:
+        Tuple[float, float]: (Elo, ± Fehlerbereich); bei nur Siegen bzw. Niederlagen ±inf.
+    """
+    if wins + draws + losses == 0:
+        return 0.0, math.inf
+    score, variance = _score_and_variance(wins, draws, losses)
+    if score <= 0.0 or score >= 1.0:
+        return (math.inf if score >= 1.0 else -math.inf), math.inf
+    deviation = 1.96 * math.sqrt(variance / (wins + draws + losses))
+    low, high = max(score - deviation, 1e-6), min(score + deviation, 1.0 - 1e-6)
+    return elo_from_score(score), (elo_from_score(high) - elo_from_score(low)) / 2.0
+
+def likelihood_of_superiority(wins: int, losses: int) -> float:
+    """Wahrscheinlichkeit, dass Engine A stärker ist (Remis bleiben unberücksichtigt)."""
+    if wins + losses == 0:
+        return 0.5
+    return 0.5 * (1.0 + math.erf((wins - losses) / math.sqrt(2.0 * (wins + losses))))
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """Log-Likelihood-Ratio des SPRT für H1 (elo1) gegen H0 (elo0), Normalnäherung des Punkteanteils."""
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0
+    score, variance = _score_and_variance(wins, draws, losses)
+    if variance == 0.0:
+        return 0.0
+    s0, s1 = score_from_elo(elo0), score_from_elo(elo1)
+    return games * (s1 - s0) * (2.0 * score - s0 - s1) / (2.0 * variance)
+
+def sprt_bounds(alpha: float, beta: float) -> Tuple[float, float]:
+    """Untere und obere Grenze der LLR (Annahme von H0 bzw. H1)."""
+    return math.log(beta / (1.0 - alpha)), math.log((1.0 - beta) / alpha)
+
+def summarize(wins: int, draws: int, losses: int, sprt: Tuple[float, float, float, float]) -> Dict[str, Any]:
+    """Fasst den Stand aus Sicht von Engine A zusammen (Elo, LOS, SPRT-Entscheidung)."""
+    elo0, elo1, alpha, beta = sprt
+    elo, margin = elo_estimate(wins, draws, losses)
+    llr = sprt_llr(wins, draws, losses, elo0, elo1)
+    lower, upper = sprt_bounds(alpha, beta)
+    decision = "H1" if llr >= upper else ("H0" if llr <= lower else None)
+    return {'games': wins + draws + losses, 'wins': wins, 'draws': draws, 'losses': losses,
+            'elo': elo, 'elo_margin': margin, 'los': likelihood_of_superiority(wins, losses),
+            'llr': llr, 'llr_bounds': (lower, upper), 'sprt_decision': decision}
+
+
+# --- Turnier ---
+
+def build_schedule(openings: List[str], games: int, engine_a: Engine, engine_b: Engine) -> List[Tuple[int, str, Engine, Engine]]:
+    """Paarungen: jede Eröffnung zweimal mit vertauschten Farben (Engine A beginnt mit Weiß)."""
+    schedule = []
+    for index in range(games):
+        fen = openings[(index // 2) % len(openings)]
+        white, black = (engine_a, engine_b) if index % 2 == 0 else (engine_b, engine_a)
+        schedule.append((index, fen, white, black))
+    return schedule
+
+def run_tournament(engine_a: Engine, engine_b: Engine, openings: List[str], games: int, pgn_path: str,
+                   workers: int = 0, tc: Optional[Tuple[int, int]] = None, max_plies: int = DEFAULT_MAX_PLIES,
+                   sprt: Tuple[float, float, float, float] = DEFAULT_SPRT, sprt_stop: bool = False,
+                   seed: int = 0, log_level: str = DEFAULT_LOG_LEVEL) -> Dict[str, Any]:
+    """
+    Spielt das Turnier in einem Pool von Arbeitsprozessen und schreibt jede beendete Partie sofort ins PGN.
+
+    Args:
+        engine_a, engine_b: (Name, Überschreibungen von engine_config).
+        workers (int): Anzahl der Arbeitsprozesse (0 = alle Kerne).
+        tc: (Grundzeit, Inkrement) in Millisekunden oder None (feste Bedenkzeit pro Zug).
+        sprt_stop (bool): Turnier beenden, sobald der SPRT eine Hypothese annimmt.
+
+    Returns:
+        Dict[str, Any]: Zusammenfassung aus Sicht von Engine A (siehe summarize()).
+    """
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    schedule = build_schedule(openings, games, engine_a, engine_b)
+    score = {'1-0': 0, '0-1': 0, '1/2-1/2': 0}
+    wins = draws = losses = 0
+    summary = summarize(0, 0, 0, sprt)
+    start_time = time.monotonic()
+    log.info("Tournament: %s vs %s, %d game(s), %d opening(s), %d worker(s), TC: %s",
+             engine_a[0], engine_b[0], games, len(openings), workers, tc)
+
+    context = multiprocessing.get_context('spawn')
+    with open(pgn_path, 'w', encoding='utf-8') as pgn_file, \
+         ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(log_level, logger.get_process_queue(context))) as pool:
+        futures = [pool.submit(_play_game, index, fen, white, black, tc, max_plies, seed + index)
+                   for index, fen, white, black in schedule]
+        for future in concurrent.futures.as_completed(futures):
+            game = future.result()
+            pgn_file.write(game['pgn'] + "\n\n")
+            pgn_file.flush()
+            score[game['result']] += 1
+            a_is_white = game['white'] == engine_a[0]
+            if game['result'] == '1/2-1/2':
+                draws += 1
+            elif (game['result'] == '1-0') == a_is_white:
+                wins += 1
+            else:
+                losses += 1
+            summary = summarize(wins, draws, losses, sprt)
+            print(f"[{summary['games']}/{games}] Partie {game['index'] + 1}: {game['white']} - {game['black']} "
+                  f"{game['result']} ({game['termination']}, {game['plies']} Halbzüge) | "
+                  f"+{wins} ={draws} -{losses}, LLR {summary['llr']:.2f}", file=sys.stderr)
+            if sprt_stop and summary['sprt_decision']:
+                log.info("Tournament: SPRT accepted %s after %d game(s).", summary['sprt_decision'], summary['games'])
+                pool.shutdown(wait=False, cancel_futures=True)
+                break
+
+    summary['white_black_draw'] = score
+    summary['seconds'] = time.monotonic() - start_time
+    log.info("Tournament finished: %s", summary)
+    return summary
+
+def format_summary(summary: Dict[str, Any], engine_a: str, engine_b: str,
+                   sprt: Tuple[float, float, float, float]) -> str:
+    """Gibt die Zusammenfassung als lesbaren Text zurück."""
+    elo0, elo1, alpha, beta = sprt
+    lower, upper = summary['llr_bounds']
+    decision = {'H1': f"H1 angenommen ({engine_a} ist mindestens {elo1:g} Elo stärker)",
+                'H0': f"H0 angenommen ({engine_a} ist höchstens {elo0:g} Elo stärker)",
+                None: "noch keine Entscheidung"}[summary['sprt_decision']]
+    results = summary['white_black_draw']
+    return "\n".join([
+        f"{engine_a} vs {engine_b}: {summary['games']} Partien in {summary['seconds']:.1f} s",
+        f"Ergebnis {engine_a}: +{summary['wins']} ={summary['draws']} -{summary['losses']} "
+        f"(Weiß {results['1-0']}, Schwarz {results['0-1']}, Remis {results['1/2-1/2']})",
+        f"Elo: {summary['elo']:+.1f} ± {summary['elo_margin']:.1f} (95 %), LOS: {summary['los'] * 100:.1f} %",
+        f"SPRT [{elo0:g}, {elo1:g}] (alpha {alpha:g}, beta {beta:g}): LLR {summary['llr']:.2f} "
+        f"({lower:.2f}, {upper:.2f}) -> {decision}",
+    ])
+
+
+def _parse_tc(text: str) -> Tuple[int, int]:
+    """Wandelt "Grundzeit+Inkrement" in Sekunden (z.B. "10+0.1") in Millisekunden um."""
+    base, _, increment = text.partition('+')
+    try:
+        return int(float(base) * 1000), int(float(increment or 0) * 1000)
+    except ValueError:
+        raise ValueError(f"Ungültige Bedenkzeit '{text}' (erwartet z.B. 10+0.1)")
+
+def _read_openings(path: str) -> List[str]:
+    """Liest Eröffnungsstellungen (eine FEN bzw. EPD pro Zeile, # = Kommentar)."""
+    openings = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                try:
+                    board = chess.Board(line)
+                except ValueError:
+                    board, _ = chess.Board.from_epd(line) # EPD mit Operationen (z.B. "bm e4;")
+                openings.append(board.fen())
+    return openings
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Einstiegspunkt der Kommandozeile."""
+    parser = argparse.ArgumentParser(description="Spielt Partien zwischen zwei KI-Konfigurationen (PGN + Elo/SPRT).")
+    parser.add_argument("--engine-a", action="append", default=[], metavar="NAME=WERT",
+                        help="Überschreibung von engine_config für Engine A (mehrfach möglich)")
+    parser.add_argument("--engine-b", action="append", default=[], metavar="NAME=WERT",
+                        help="Überschreibung von engine_config für Engine B (mehrfach möglich)")
+    parser.add_argument("--name-a", default="A", help="Name von Engine A im PGN (Standard: A)")
+    parser.add_argument("--name-b", default="B", help="Name von Engine B im PGN (Standard: B)")
+    parser.add_argument("--games", type=int, help="Anzahl Partien (Standard: jede Eröffnung mit beiden Farben)")
+    parser.add_argument("--openings", help="Datei mit Eröffnungsstellungen (FEN/EPD, eine pro Zeile)")
+    parser.add_argument("--movetime", type=int, default=DEFAULT_MOVETIME_MS,
+                        help=f"Bedenkzeit pro Zug in ms ohne --tc (Standard: {DEFAULT_MOVETIME_MS})")
+    parser.add_argument("--tc", help="Bedenkzeit mit Uhr: Grundzeit+Inkrement in Sekunden, z.B. 10+0.1")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES,
+                        help=f"Remis nach so vielen Halbzügen (Standard: {DEFAULT_MAX_PLIES})")
+    parser.add_argument("--workers", type=int, default=0, help="Anzahl Arbeitsprozesse (Standard: alle Kerne)")
+    parser.add_argument("-o", "--output", default=DEFAULT_PGN_PATH, help=f"PGN-Datei (Standard: {DEFAULT_PGN_PATH})")
+    parser.add_argument("--sprt-bounds", type=float, nargs=4, default=list(DEFAULT_SPRT),
+                        metavar=("ELO0", "ELO1", "ALPHA", "BETA"), help="SPRT-Hypothesen und Fehlerwahrscheinlichkeiten "
+                        f"(Standard: {' '.join(f'{v:g}' for v in DEFAULT_SPRT)})")
+    parser.add_argument("--sprt", action="store_true", help="Turnier beenden, sobald der SPRT entschieden ist")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert des Zufalls (Standard: 0)")
+    parser.add_argument("--log-level", default=DEFAULT_LOG_LEVEL,
+                        help=f"Log-Stufe während der Partien (Standard: {DEFAULT_LOG_LEVEL})")
+    args = parser.parse_args(argv)
+
+    try:
+        overrides_a = dict(parse_override(text) for text in args.engine_a)
+        overrides_b = dict(parse_override(text) for text in args.engine_b)
+        tc = _parse_tc(args.tc) if args.tc else None
+        logger.set_level(args.log_level)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.name_a == args.name_b:
+        parser.error("--name-a und --name-b müssen sich unterscheiden")
+    if tc is None:
+        if args.movetime < 1:
+            parser.error("--movetime muss mindestens 1 sein")
+        # Feste Bedenkzeit pro Zug, sofern die Engine keine eigene setzt
+        overrides_a.setdefault('AI_TIME_BUDGET_MS', args.movetime)
+        overrides_b.setdefault('AI_TIME_BUDGET_MS', args.movetime)
+    if args.openings:
+        try:
+            openings = _read_openings(args.openings)
+        except (OSError, ValueError) as e:
+            parser.error(f"Eröffnungen konnten nicht gelesen werden: {e}")
+        if not openings:
+            parser.error(f"Keine Eröffnungsstellungen in {args.openings}")
+    else:
+        openings = TOURNAMENT_OPENINGS
+    games = args.games if args.games is not None else 2 * len(openings)
+    if games < 1:
+        parser.error("--games muss mindestens 1 sein")
+    sprt = tuple(args.sprt_bounds)
+    if not (0 < sprt[2] < 1 and 0 < sprt[3] < 1) or sprt[0] >= sprt[1]:
+        parser.error("--sprt-bounds: ELO0 < ELO1 und 0 < ALPHA, BETA < 1 erforderlich")
+
+    engine_a, engine_b = (args.name_a, overrides_a), (args.name_b, overrides_b)
+    summary = run_tournament(engine_a, engine_b, openings, games, args.output, workers=args.workers, tc=tc,
+                             max_plies=args.max_plies, sprt=sprt, sprt_stop=args.sprt, seed=args.seed,
+                             log_level=args.log_level)
+    print(format_summary(summary, args.name_a, args.name_b, sprt))
+    print(f"PGN: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Dieses Modul definiert die Transpositionstabelle (TT) der Schach-KI.
+Sie speichert bereits durchsuchte Stellungen (Tiefe, Schrankentyp, Bewertung, bester Zug),
+damit über verschiedene Zugfolgen erreichte (transponierte) Stellungen nicht erneut
+durchsucht werden müssen. Die Tabelle hat eine feste Größe, die aus einer Speicherobergrenze
+berechnet wird, und bleibt zwischen den Zügen einer Partie erhalten.
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import logger
+import chess
+from typing import Optional, List, NamedTuple, Dict, Any
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in transposition_table.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+# --- Schrankentypen ---
+TT_EXACT = 0 # Exakte Bewertung (lag innerhalb des Alpha-Beta-Fensters)
+TT_LOWER = 1 # Untere Schranke (Beta-Cutoff, tatsächlicher Wert >= score)
+TT_UPPER = 2 # Obere Schranke (kein Zug erreichte Alpha, tatsächlicher Wert <= score)
+
+# --- Ersetzungsstrategien ---
+REPLACE_ALWAYS = 'always' # Neuer Eintrag ersetzt immer den alten
+REPLACE_DEPTH = 'depth'   # Tiefere Einträge werden bevorzugt, Einträge früherer Suchen sind immer ersetzbar
+REPLACEMENT_POLICIES = (REPLACE_ALWAYS, REPLACE_DEPTH)
+
+# Geschätzter Speicherbedarf eines belegten Slots in Bytes
+# (Slot-Zeiger + Tupel + Zobrist-Schlüssel + Zugobjekt, python-interner Overhead eingerechnet)
+ENTRY_SIZE_BYTES = 200
+
+
+class TTEntry(NamedTuple):
+    """Ein Eintrag der Transpositionstabelle."""
+    key: int                    # Vollständiger Zobrist-Schlüssel (zur Erkennung von Index-Kollisionen)
+    depth: int                  # Restsuchtiefe, mit der die Bewertung ermittelt wurde
+    flag: int                   # TT_EXACT, TT_LOWER oder TT_UPPER
+    score: int                  # Bewertung der Stellung
+    move: Optional[chess.Move]  # Bester (oder widerlegender) Zug, falls bekannt
+    generation: int             # Suchgeneration, in der der Eintrag geschrieben wurde
+
+
+class TranspositionTable:
+    """
+    Hashtabelle fester Größe für Suchergebnisse, adressiert über den Zobrist-Schlüssel.
+
+    Attributes:
+        num_slots (int): Anzahl der Slots (aus der Speicherobergrenze berechnet).
+        replacement_policy (str): REPLACE_ALWAYS oder REPLACE_DEPTH.
+        generation (int): Zähler der Suchen; wird von new_search() erhöht.
+    """
+    def __init__(self, size_mb: float, replacement_policy: str = REPLACE_DEPTH):
+        """
+        Initialisiert die Tabelle.
+
+        Args:
+            size_mb (float): Speicherobergrenze in Megabyte.
+            replacement_policy (str): Ersetzungsstrategie (siehe REPLACEMENT_POLICIES).
+        """
+        if replacement_policy not in REPLACEMENT_POLICIES:
+            log.warning("Unknown TT replacement policy '%s'. Using '%s'.", replacement_policy, REPLACE_DEPTH)
+            replacement_policy = REPLACE_DEPTH
+        self.num_slots = max(1, int(size_mb * 1024 * 1024) // ENTRY_SIZE_BYTES)
+        self.replacement_policy = replacement_policy
+        self.generation = 0
+        self._slots: List[Optional[TTEntry]] = [None] * self.num_slots
+        self._used_slots = 0
+        self._reset_counters()
+        log.info("TranspositionTable initialized (Size: %.1f MB, Slots: %d, Policy: %s)",
+                 size_mb, self.num_slots, self.replacement_policy)
+
+    def _reset_counters(self):
+        """Setzt die Statistikzähler zurück."""
+        self.probes = 0
+        self.hits = 0
+        self.collisions = 0 # Slot belegt, aber von einer anderen Stellung
+        self.stores = 0
+
+    def new_search(self):
+        """Markiert den Beginn einer neuen Suche: erhöht die Generation und setzt die Statistik zurück."""
+        self.generation += 1
+        self._reset_counters()
+
+    def clear(self):
+        """Leert die Tabelle vollständig (z.B. bei einem neuen Spiel)."""
+        self._slots = [None] * self.num_slots
+        self._used_slots = 0
+        self.generation = 0
+        self._reset_counters()
+        log.info("TranspositionTable cleared (%d slots).", self.num_slots)
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """
+        Sucht den Eintrag zur Stellung mit dem gegebenen Zobrist-Schlüssel.
+
+        Returns:
+            TTEntry | None: Der Eintrag oder None, wenn die Stellung nicht gespeichert ist.
+        """
+        self.probes += 1
+        entry = self._slots[key % self.num_slots]
+        if entry is None:
+            return None
+        if entry.key != key:
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key: int, depth: int, flag: int, score: int, move: Optional[chess.Move]):
+        """
+        Speichert ein Suchergebnis gemäß der Ersetzungsstrategie.
+        """
+        index = key % self.num_slots
+        old = self._slots[index]
+        if old is None:
+            self._used_slots += 1
+        elif self.replacement_policy == REPLACE_DEPTH and old.generation == self.generation:
+            if old.key == key:
+                # Gleiche Stellung: flachere Ergebnisse überschreiben keine tieferen,
+                # den besten Zug aber beibehalten, falls der neue Eintrag keinen hat
+                if depth < old.depth:
+                    return
+                if move is None:
+                    move = old.move
+            elif depth < old.depth:
+                return # Tieferer Eintrag einer anderen Stellung aus derselben Suche bleibt
+        self._slots[index] = TTEntry(key, depth, flag, score, move, self.generation)
+        self.stores += 1
+
+    def fill_ratio(self) -> float:
+        """Gibt den Anteil belegter Slots (0.0 - 1.0) zurück."""
+        return self._used_slots / self.num_slots
+
+    def hit_rate(self) -> float:
+        """Gibt die Trefferquote der Abfragen seit Beginn der aktuellen Suche zurück."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt die Statistik der aktuellen Suche als Dictionary zurück."""
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate(),
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "fill_ratio": self.fill_ratio(),
+        }
+
+    def log_stats(self):
+        """Schreibt die Statistik der aktuellen Suche ins Log."""
+        log.info("TT stats: Probes=%d, Hits=%d (%.1f%%), Collisions=%d, Stores=%d, Fill=%.1f%% of %d slots",
+                 self.probes, self.hits, self.hit_rate() * 100, self.collisions, self.stores,
+                 self.fill_ratio() * 100, self.num_slots)
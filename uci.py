@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+UCI-Schnittstelle (Universal Chess Interface) der PyChess-KI.
+Startet die Engine ohne Fenster: Es werden weder pygame noch config.py (Schriftarten, Bilder, Sounds)
+oder Tolk geladen, nur engine_config.py und die Suchmodule. So lässt sich die KI in Schach-GUIs
+(Arena, Cute Chess, ...) und Turnierverwaltungen einbinden oder ohne Anzeige unter Last testen.
+
+Unterstützte Befehle: uci, isready, setoption, ucinewgame, position, go (depth, movetime, wtime/btime,
+winc/binc, movestogo, infinite, ponder), stop, ponderhit, quit. Während der Suche werden info-Zeilen
+(Tiefe, Bewertung, Knoten, Knoten/s, Zeit, Hauptvariante) ausgegeben.
+
+Aufruf:
+    python uci.py
+"""
+# Standardbibliothek-Imports zuerst
+import logging
+import sys # Für kritische Fehler
+import os
+import threading
+import multiprocessing
+import logger
+import chess
+import engine_config
+import ai_opponent
+import parallel_search
+import opening_book
+import endgame_tablebase
+from ai_search import AISearch
+from search_position import SearchPosition
+from typing import Optional, List, Dict, Any, TextIO
+
+# --- Logger Konfiguration ---
+if logger is None:
+     print("FEHLER in uci.py: Logger-Modul ist None nach Importversuch.", file=sys.stderr)
+     sys.exit("Logger konnte nicht initialisiert werden.")
+log = logger.setup_logger(
+    name=__name__,
+    log_file='logs/PyChess.txt',
+    level=logging.DEBUG,
+    console=False,
+)
+log.info("<--- ==================== Starte Modul '%s' ==================== --->", __name__)
+
+ENGINE_NAME = "PyChess"
+ENGINE_AUTHOR = "PyChess"
+# Die Suche loggt pro Tiefe; im Turnierbetrieb nur Warnungen schreiben (PYCHESS_LOG_LEVEL überschreibt)
+DEFAULT_LOG_LEVEL = 'WARNING'
+
+# --- Zeiteinteilung ---
+MOVE_OVERHEAD_MS = 50         # Reserve pro Zug für Kommunikation und Prozessstart
+DEFAULT_MOVES_TO_GO = 30      # Angenommene Restzüge, wenn die GUI movestogo nicht sendet
+MIN_BUDGET_MS = 10
+INFINITE_BUDGET_MS = 10 ** 9  # "go infinite" und "go depth": praktisch kein Zeitlimit
+INFO_INTERVAL_S = 0.1         # Wie oft der Fortschritt der Suche als info-Zeile ausgegeben wird
+
+
+def compute_time_budget(params: Dict[str, int], turn: chess.Color) -> Optional[int]:
+    """
+    Bestimmt die Bedenkzeit in Millisekunden aus den Parametern von "go".
+
+    Returns:
+        int | None: Bedenkzeit oder None, wenn weder movetime noch eine Restzeit angegeben ist.
+    """
+    if 'movetime' in params:
+        return max(MIN_BUDGET_MS, params['movetime'] - MOVE_OVERHEAD_MS)
+    time_left = params.get('wtime' if turn == chess.WHITE else 'btime')
+    if time_left is None:
+        return None
+    increment = params.get('winc' if turn == chess.WHITE else 'binc', 0)
+    moves_to_go = params.get('movestogo') or DEFAULT_MOVES_TO_GO
+    budget = time_left // moves_to_go + increment * 3 // 4
+    # Nie mehr als die Restzeit abzüglich Reserve verbrauchen
+    budget = min(budget, time_left - MOVE_OVERHEAD_MS)
+    return max(MIN_BUDGET_MS, budget)
+
+
+def format_score(score: int) -> str:
+    """Wandelt eine Bewertung (Zentibauern, Sicht der Seite am Zug) in "cp X" bzw. "mate N" um."""
+    if abs(score) >= ai_opponent.MATE_THRESHOLD:
+        mate_in = (engine_config.CHECKMATE - abs(score) + 1) // 2 # Halbzüge bis zum Matt -> Züge
+        return f"mate {mate_in if score > 0 else -mate_in}"
+    return f"cp {score}"
+
+
+class UCIEngine:
+    """
+    Verarbeitet UCI-Befehle und verwaltet die laufende Suche.
+
+    Attributes:
+        board (chess.Board): Die mit "position" gesetzte Stellung (inkl. Zugfolge).
+        search (AISearch | None): Die laufende Suche.
+    """
+    def __init__(self, output: TextIO = sys.stdout):
+        self.output = output
+        self.board = chess.Board()
+        self.search: Optional[AISearch] = None
+        self._output_lock = threading.Lock()
+        self._reporter: Optional[threading.Thread] = None
+        self._release = threading.Event() # Gesetzt = bestmove darf gesendet werden (infinite/ponder)
+        self._book_path = engine_config.POLYGLOT_BOOK_PATH
+
+    def send(self, line: str):
+        """Schreibt eine Zeile an die GUI."""
+        with self._output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+        log.debug("UCI >> %s", line)
+
+    # --- Befehle ---
+
+    def handle(self, line: str) -> bool:
+        """
+        Verarbeitet eine Befehlszeile.
+
+        Returns:
+            bool: False, wenn die Engine beendet werden soll ("quit").
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        log.debug("UCI << %s", line)
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {engine_config.TT_SIZE_MB} min 1 max 4096")
+            self.send(f"option name Threads type spin default {self._threads()} min 1 max 64")
+            self.send(f"option name OwnBook type check default {'true' if engine_config.POLYGLOT_BOOK_PATH else 'false'}")
+            self.send(f"option name BookFile type string default {self._book_path or '<empty>'}")
+            self.send(f"option name SyzygyPath type string default {engine_config.SYZYGY_PATH or '<empty>'}")
+            self.send(f"option name Ponder type check default {'true' if engine_config.AI_PONDER_ENABLED else 'false'}")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "ucinewgame":
+            self.stop_search(wait=True)
+            ai_opponent.reset_transposition_table() # Auch die TTs der Arbeitsprozesse (Threads > 1)
+            opening_book.reset_game()
+        elif command == "position":
+            self.stop_search(wait=True)
+            self.set_position(args)
+        elif command == "go":
+            self.go(args)
+        elif command == "stop":
+            self.stop_search(wait=True)
+        elif command == "ponderhit":
+            if self.search is not None:
+                self.search.ponder_hit()
+                self._release.set()
+        elif command == "quit":
+            self.stop_search(wait=True)
+            return False
+        elif command == "debug":
+            pass
+        else:
+            log.warning("UCI: Unknown command: %s", line)
+        return True
+
+    def _threads(self) -> int:
+        """Anzahl der Suchprozesse laut engine_config (1 = Suche nur im eigenen Thread)."""
+        return parallel_search.get_worker_count() if engine_config.AI_PARALLEL_ENABLED else 1
+
+    def set_option(self, args: List[str]):
+        """Verarbeitet "setoption name <Name> [value <Wert>]"."""
+        if "name" not in args:
+            return
+        name_end = args.index("value") if "value" in args else len(args)
+        name = " ".join(args[args.index("name") + 1:name_end]).lower()
+        value = " ".join(args[name_end + 1:])
+        try:
+            if name == "hash":
+                # Setzt engine_config.TT_SIZE_MB; Arbeitsprozesse (Threads > 1) übernehmen es mit der nächsten Aufgabe
+                ai_opponent.resize_transposition_table(max(1, int(value)))
+            elif name == "threads":
+                threads = max(1, int(value))
+                engine_config.AI_PARALLEL_ENABLED = threads > 1
+                engine_config.AI_PARALLEL_WORKERS = threads
+                parallel_search.shutdown_pool() # Pool mit neuer Größe beim nächsten Zug
+            elif name == "ownbook":
+                engine_config.POLYGLOT_BOOK_PATH = self._book_path if value.lower() == "true" else ""
+            elif name == "bookfile":
+                self._book_path = "" if value in ("", "<empty>") else value
+                if engine_config.POLYGLOT_BOOK_PATH:
+                    engine_config.POLYGLOT_BOOK_PATH = self._book_path
+            elif name == "syzygypath":
+                engine_config.SYZYGY_PATH = "" if value in ("", "<empty>") else value
+                endgame_tablebase.close() # Arbeitsprozesse öffnen den neuen Pfad bei ihrer nächsten Aufgabe
+            elif name == "ponder":
+                engine_config.AI_PONDER_ENABLED = value.lower() == "true"
+            else:
+                log.warning("UCI: Unknown option: %s", name)
+                return
+            log.info("UCI: Option '%s' set to '%s'.", name, value)
+        except ValueError:
+            log.warning("UCI: Invalid value '%s' for option '%s'.", value, name)
+
+    def set_position(self, args: List[str]):
+        """Verarbeitet "position startpos|fen <FEN> [moves <Zug> ...]"."""
+        moves_index = args.index("moves") if "moves" in args else len(args)
+        try:
+            if args and args[0] == "startpos":
+                board = chess.Board()
+            elif args and args[0] == "fen":
+                board = chess.Board(" ".join(args[1:moves_index]))
+            else:
+                log.warning("UCI: Invalid position command: %s", args)
+                return
+            for uci in args[moves_index + 1:]:
+                board.push_uci(uci)
+        except ValueError as e:
+            log.error("UCI: Invalid position %s: %s", args, e)
+            return
+        self.board = board
+
+    def go(self, args: List[str]):
+        """Verarbeitet "go ..." und startet die Suche im Hintergrund."""
+        self.stop_search(wait=True)
+        params: Dict[str, int] = {}
+        flags = set()
+        i = 0
+        while i < len(args):
+            token = args[i]
+            if token in ("infinite", "ponder"):
+                flags.add(token)
+            elif token in ("depth", "movetime", "wtime", "btime", "winc", "binc", "movestogo", "nodes", "mate") \
+                 and i + 1 < len(args):
+                try:
+                    params[token] = int(args[i + 1])
+                except ValueError:
+                    log.warning("UCI: Invalid value for '%s': %s", token, args[i + 1])
+                i += 1
+            i += 1
+
+        position = SearchPosition(self.board)
+        valid_moves = position.legal_moves()
+        if not valid_moves:
+            self.send("bestmove 0000")
+            return
+        budget_ms = compute_time_budget(params, self.board.turn)
+        max_depth = params.get('depth')
+        if "infinite" in flags or (budget_ms is None and max_depth is not None):
+            budget_ms = INFINITE_BUDGET_MS
+            max_depth = max_depth or ai_opponent.MAX_SEARCH_PLY
+        elif max_depth is None:
+            max_depth = ai_opponent.MAX_SEARCH_PLY if budget_ms is not None else None
+        log.info("UCI go: %s (Budget: %s ms, Max Depth: %s)", " ".join(args), budget_ms, max_depth)
+
+        # Bei infinite/ponder darf bestmove erst nach stop bzw. ponderhit gesendet werden
+        self._release = threading.Event()
+        if not flags:
+            self._release.set()
+        self.search = AISearch(position, valid_moves, budget_ms, ponder="ponder" in flags, max_depth=max_depth)
+        self.search.start()
+        self._reporter = threading.Thread(target=self._report, args=(self.search, self._release),
+                                          daemon=True, name="UCI_Reporter")
+        self._reporter.start()
+
+    def stop_search(self, wait: bool = False):
+        """Beendet die laufende Suche; bestmove wird trotzdem gesendet (wie von UCI verlangt)."""
+        search, reporter = self.search, self._reporter
+        if search is None:
+            return
+        search.move_now()
+        self._release.set()
+        if wait and reporter is not None:
+            reporter.join()
+        self.search = None
+        self._reporter = None
+
+    # --- Ausgabe während der Suche ---
+
+    def _report(self, search: AISearch, release: threading.Event):
+        """Gibt den Fortschritt als info-Zeilen aus und sendet am Ende bestmove (läuft im eigenen Thread)."""
+        last_completed = 0
+        while True:
+            search.join(INFO_INTERVAL_S)
+            for progress in search.drain_progress():
+                last_completed = self._send_info(progress, last_completed)
+            if not search.is_running():
+                break
+        done, best_move = search.poll_result()
+        release.wait()
+        if not done or best_move is None:
+            self.send("bestmove 0000")
+            return
+        line = f"bestmove {best_move.uci()}"
+        pv = ai_opponent.get_principal_variation()
+        if len(pv) >= 2 and pv[0] == best_move:
+            line += f" ponder {pv[1].uci()}"
+        self.send(line)
+
+    def _send_info(self, progress: Dict[str, Any], last_completed: int) -> int:
+        """Sendet eine info-Zeile; nach einer abgeschlossenen Tiefe mit Bewertung und Hauptvariante."""
+        common = f"nodes {progress.get('nodes', 0)} nps {progress.get('nps', 0)} time {progress.get('elapsed_ms', 0)}"
+        completed = progress.get('completed_depth', 0)
+        if completed > last_completed and progress.get('score') is not None:
+            line = f"info depth {completed} score {format_score(progress['score'])} {common}"
+            if progress.get('pv_moves'):
+                line += " pv " + " ".join(progress['pv_moves'])
+            self.send(line)
+            return completed
+        self.send(f"info depth {progress.get('depth', 0)} {common}")
+        return last_completed
+
+
+def main(input_stream: TextIO = sys.stdin) -> int:
+    """Einstiegspunkt: liest UCI-Befehle zeilenweise von der Standardeingabe."""
+    try:
+        logger.set_level(os.environ.get('PYCHESS_LOG_LEVEL', DEFAULT_LOG_LEVEL))
+    except ValueError as e:
+        log.error("Invalid PYCHESS_LOG_LEVEL: %s", e)
+    engine = UCIEngine()
+    log.info("UCI engine started.")
+    try:
+        for line in input_stream:
+            if not engine.handle(line.strip()):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop_search(wait=True)
+        parallel_search.shutdown_pool()
+        endgame_tablebase.close()
+        log.info("UCI engine stopped.")
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())